@@ -1,4 +1,5 @@
-import io
+import os
+import uuid
 import numpy as np
 import pandas as pd
 import streamlit as st
@@ -6,6 +7,30 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 
+from mes import EXPECTED_COLS, build_system, fit_3sls, missing_columns
+from mes.ardl import ARDL_REGRESSORS, fit_ardl, format_order
+from mes.bootstrap import (CI_HIGH, CI_LOW, METHODS as BOOT_METHODS, BootstrapConfig, attach_summary,
+                           bootstrap_ardl, bootstrap_system, long_run_summary, summarize_draws, system_summaries)
+from mes.cache import fingerprint
+from mes.datastore import dataset_version, load_dataset
+from mes.diagnostics import diagnostic_pvalues, diagnostics_verdict
+from mes.downsample import MAX_POINTS, downsample
+from mes.export import FORMATS as EXPORT_FORMATS, available_formats, cached_export
+from mes.forecast import DEFAULT_PATHS, FAN_LEVELS, ecm_forecast
+from mes.granger import GRANGER_VARIABLES, granger_matrix, granger_target
+from mes.multipliers import bootstrap_multipliers, multiplier_table
+from mes.panel import ENTITY, entities, entity_frame, iter_panel, panel_table
+from mes.pipeline import SYSTEM_SHEETS, PipelineConfig, ResultBundle, bundle_exists, ensure_bundle
+from mes.profiling import (Profiler, env_enabled, memory_enabled, profile_table, profiled, section, set_provider,
+                           trace_path)
+from mes.recursive import cusum, cusumsq, recursive_ls, rolling_ls, stability_summary
+from mes.scenarios import ESTIMATE_QUANTILE, build_engine, scenario_frame, scenario_summary
+from mes.store import result_store
+from mes.streaming import RunningMoments, running_moments
+from mes.styling import page_count, page_slice, results_table_css, style_results_table
+from mes.transforms import entity_column
+from mes.unitroot import integration_table
+
 st.set_page_config(
     page_title="Projet de Modèles à Equations Simultanées et à Correction d'Erreurs – Tchad (1995–2022)",
     layout="wide",
@@ -77,12 +102,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ==================== HELPER FUNCTIONS ====================
+# ==================== PROFILING ====================
+# Opt-in (MES_PROFILE=1 or the sidebar toggle): decorated helpers and tabs are timed, traced to a JSONL file
+
+set_provider(lambda: st.session_state.get("_profiler"))
+if st.session_state.get("profiling", env_enabled()):
+    st.session_state.setdefault("_profiler", Profiler(session=uuid.uuid4().hex[:8], memory=memory_enabled())).start()
+elif "_profiler" in st.session_state:
+    # Memory tracing stops only once no other session is profiled
+    st.session_state.pop("_profiler").close()
 
-def safe_log(s: pd.Series):
-    s = pd.to_numeric(s, errors="coerce")
-    s = s.where(s > 0)
-    return np.log(s)
+
+def stop():
+    """``st.stop()`` that still closes the profiled run, so later fragment timings do not nest under it."""
+    # Read first: once the stop is requested, session state access raises StopException itself
+    profiler = st.session_state.get("_profiler")
+    try:
+        st.stop()
+    finally:
+        if profiler is not None:
+            profiler.close_run()
+
+# ==================== HELPER FUNCTIONS ====================
 
 def format_sig(p):
     if pd.isna(p):
@@ -95,13 +136,28 @@ def format_sig(p):
         return "*"
     return ""
 
-def to_excel_bytes(sheets: dict[str, pd.DataFrame]) -> bytes:
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        for name, df_ in sheets.items():
-            df_.to_excel(writer, sheet_name=name[:31], index=False)
-    return output.getvalue()
+def significance_label(p):
+    if p < 0.01:
+        return "très sig."
+    if p < 0.05:
+        return "sig."
+    if p < 0.1:
+        return "sig. à 10 %"
+    return "non sig."
+
+def coefficient_note(table: pd.DataFrame, variable: str, if_positive: str, if_negative: str) -> str:
+    """Reading of one estimated coefficient: its sign and significance come from ``table``."""
+    row = table.loc[table["Variable"] == variable].iloc[0]
+    estimate, p = row["Estimate"], row["Pr(>|t|)"]
+    verdict = "pas d'effet significatif à 10 %" if p >= 0.1 else (if_positive if estimate > 0 else if_negative)
+    return f"💡 **{variable} {'>' if estimate > 0 else '<'} 0 ({significance_label(p)}, p = {p:.3f})** → {verdict}"
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def results_css(df: pd.DataFrame) -> pd.DataFrame:
+    # Keyed by table content: identical tables are not restyled on reruns
+    return results_table_css(df)
 
+@profiled()
 def format_results_table(df, title=""):
     """Format a results table with professional styling"""
     st.markdown(f'<div class="table-title">{title}</div>', unsafe_allow_html=True)
@@ -110,47 +166,20 @@ def format_results_table(df, title=""):
     if hasattr(df, 'data'):
         df = df.data
     
-    styled_df = df.style
-    
-    # Color coefficients
-    coef_cols = [c for c in df.columns if 'Coefficient' in c or 'Estimate' in c]
-    if coef_cols:
-        def color_coef(val):
-            try:
-                v = float(val)
-                max_val = max(abs(df[coef_cols[0]]).max(), 1)
-                intensity = min(abs(v)/max_val, 0.4)
-                if v > 0:
-                    return f'background-color: rgba(44, 160, 44, {intensity})'
-                else:
-                    return f'background-color: rgba(214, 39, 40, {intensity})'
-            except:
-                return ''
-        styled_df = styled_df.applymap(color_coef, subset=coef_cols)
-    
-    # Color p-values
-    pval_cols = [c for c in df.columns if 'p-value' in c or 'Pr(>|t|)' in c]
-    if pval_cols:
-        def color_pval(val):
-            try:
-                v = float(val)
-                if v < 0.01:
-                    return 'background-color: rgba(214, 39, 40, 0.4); color: white; font-weight: bold'
-                elif v < 0.05:
-                    return 'background-color: rgba(214, 39, 40, 0.3); font-weight: bold'
-                elif v < 0.1:
-                    return 'background-color: rgba(255, 127, 14, 0.2)'
-                else:
-                    return 'background-color: rgba(200, 200, 200, 0.1)'
-            except:
-                return ''
-        styled_df = styled_df.applymap(color_pval, subset=pval_cols)
-    
-    styled_df = styled_df.format(precision=4)
-    st.dataframe(styled_df, use_container_width=True)
+    css = results_css(df)
+    pages = page_count(len(df))
+    if pages > 1:
+        # Styling every cell of a long table would stall the rerun: one page at a time, on the full table's scale
+        page = st.number_input(f"Page (sur {pages})", min_value=1, max_value=pages, value=1, step=1,
+                               key=f"page:{title}:{len(df)}")
+        rows = page_slice(page)
+        st.caption(f"Lignes {rows.start + 1}–{min(rows.stop, len(df))} sur {len(df)}")
+        df, css = df.iloc[rows], css.iloc[rows]
+    st.dataframe(style_results_table(df, css), width="stretch")
 
-def create_coefficient_chart(df, title=""):
-    """Create a professional chart showing coefficients"""
+@st.cache_data(show_spinner=False, max_entries=64)
+def coefficient_figure(df: pd.DataFrame, title: str) -> go.Figure | None:
+    """Create a professional chart showing coefficients (memoized by table content)"""
     coef_col = None
     var_col = 'Variable'
     
@@ -158,16 +187,29 @@ def create_coefficient_chart(df, title=""):
         coef_col = 'Coefficient'
     elif 'Estimate' in df.columns:
         coef_col = 'Estimate'
+    elif 'Coefficient (LR)' in df.columns:
+        coef_col = 'Coefficient (LR)'
     else:
-        return
+        return None
     
     # Filter out intercept/constant
     df_plot = df[~df[var_col].str.contains('Intercept|Constant', na=False)].copy()
     if df_plot.empty:
-        return
+        return None
     
     colors = ['#2ca02c' if x > 0 else '#d62728' for x in df_plot[coef_col]]
     
+    # Bootstrap percentile intervals, when present, become asymmetric error bars
+    error_x = None
+    if CI_LOW in df_plot.columns and CI_HIGH in df_plot.columns:
+        error_x = dict(
+            type='data',
+            array=df_plot[CI_HIGH] - df_plot[coef_col],
+            arrayminus=df_plot[coef_col] - df_plot[CI_LOW],
+            color='rgba(0,0,0,0.5)',
+            thickness=1.5
+        )
+    
     fig = go.Figure(data=[
         go.Bar(
             y=df_plot[var_col],
@@ -177,6 +219,7 @@ def create_coefficient_chart(df, title=""):
                 color=colors,
                 line=dict(color='rgba(0,0,0,0.2)', width=1)
             ),
+            error_x=error_x,
             hovertemplate='<b>%{y}</b><br>Coef: %{x:.4f}<extra></extra>'
         )
     ])
@@ -191,113 +234,251 @@ def create_coefficient_chart(df, title=""):
         margin=dict(l=150, r=50, t=50, b=50)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+@profiled()
+def create_coefficient_chart(df, title=""):
+    fig = coefficient_figure(df, title)
+    if fig is not None:
+        st.plotly_chart(fig, width="stretch")
 
 # ==================== DATA LOADING ====================
 
 st.sidebar.title("⚙️ Paramètres")
-default_path = "base.xlsx"
+default_path = os.environ.get("MES_DATA", "base.xlsx")
 
-@st.cache_data(show_spinner=False)
-def load_data_from_excel(file_path: str) -> pd.DataFrame:
-    return pd.read_excel(file_path)
+@profiled()
+@st.cache_resource(show_spinner="Conversion du classeur en cache colonnaire…")
+def load_data_from_excel(file_path: str, version: str) -> pd.DataFrame:
+    # Parsed with openpyxl once per content version, then memory-mapped from the columnar cache
+    return load_dataset(file_path)
 
 # Auto-load data at app startup
 try:
-    df = load_data_from_excel(default_path)
+    with section("dataset_version"):
+        version = dataset_version(default_path)
+    df = load_data_from_excel(default_path, version)
     st.sidebar.success("✅ Données chargées automatiquement.")
 except Exception as e:
     st.sidebar.error(f"❌ Erreur lors du chargement: {str(e)}")
     df = None
 
-expected_cols = ["year","GROWTH","REM","TC","FDI","OPEN","CREDIT","INV","INF","MIGSTOCK","HOSTGDP"]
+expected_cols = EXPECTED_COLS
+
+if df is None:
+    st.error("❌ Aucune donnée chargée.")
+    stop()
+
+missing = missing_columns(df)
+if missing:
+    st.error(f"❌ Colonnes manquantes : {missing}")
+    stop()
+
+# A workbook stacking several countries switches to panel mode: the tabs show one country at a time
+entity_col = entity_column(df)
+panel_mode = entity_col is not None and df[entity_col].nunique() > 1
+if panel_mode:
+    panel_df = df
+    entity_names = entities(panel_df, entity_col)
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("🌍 Panel")
+    entity = st.sidebar.selectbox("Pays", entity_names)
+    df = entity_frame(panel_df, entity_col, entity)
 
 # ==================== RESULTS DATA ====================
 
-res_3sls_eq1 = pd.DataFrame({
-    "Variable": ["(Intercept)", "GROWTH", "MIGSTOCK", "HOSTGDP", "logTC"],
-    "Estimate": [19.867206200, -0.049708380, 0.000853106, -0.450865283, -1.998338922],
-    "Std. Error": [0.337291584, 0.001640530, 0.005728275, 0.012902207, 0.049374055],
-    "t value": [58.90217, -30.30019, 0.14893, -34.94482, -40.47346],
-    "Pr(>|t|)": [0.0, 0.0, 0.88291, 0.0, 0.0],
-})
-res_3sls_eq1["Sig"] = res_3sls_eq1["Pr(>|t|)"].apply(format_sig)
-
-res_3sls_eq2 = pd.DataFrame({
-    "Variable": ["(Intercept)", "logREM", "logINV", "OPEN", "logFDI", "logTC"],
-    "Estimate": [-64.0286419, 6.9329983, 0.3976088, 0.4263826, -0.0071939, 0.6139383],
-    "Std. Error": [130.7465478, 7.8687708, 6.1718758, 0.0879557, 0.0568619, 14.4947751],
-    "t value": [-0.48972, 0.88108, 0.06442, 4.84770, -0.12652, 0.04236],
-    "Pr(>|t|)": [0.62918, 0.38780, 0.94922, 7.6231e-05, 0.90047, 0.96660],
-})
-res_3sls_eq2["Sig"] = res_3sls_eq2["Pr(>|t|)"].apply(format_sig)
-
-res_3sls_eq3 = pd.DataFrame({
-    "Variable": ["(Intercept)", "logREM", "CREDIT", "GROWTH", "INF"],
-    "Estimate": [4.6102489, -0.4648178, 0.1363536, 0.0740374, 0.0168264],
-    "Std. Error": [2.1739193, 0.3688956, 0.0602302, 0.0334644, 0.0167276],
-    "t value": [2.12071, -1.26003, 2.26387, 2.21242, 1.00590],
-    "Pr(>|t|)": [0.044943, 0.220296, 0.033323, 0.037141, 0.324928],
-})
-res_3sls_eq3["Sig"] = res_3sls_eq3["Pr(>|t|)"].apply(format_sig)
-
-res_3sls_eq4 = pd.DataFrame({
-    "Variable": ["(Intercept)", "logREM", "GROWTH", "logINV", "HOSTGDP"],
-    "Estimate": [131.589512, -15.134111, 2.395862, -0.589054, 0.595468],
-    "Std. Error": [123.522193, 15.736289, 0.789872, 13.955603, 7.280021],
-    "t value": [1.06531, -0.96173, 3.03323, -0.04221, 0.08179],
-    "Pr(>|t|)": [0.29779, 0.34619, 0.00591, 0.96670, 0.93552],
-})
-res_3sls_eq4["Sig"] = res_3sls_eq4["Pr(>|t|)"].apply(format_sig)
-
-ardl_general = pd.DataFrame({
-    "Variable": ["L(GROWTH,1)", "logREM","L(logREM,1)","L(logREM,2)", "logINV","L(logINV,1)","L(logINV,2)",
-                 "logOPEN","L(logOPEN,1)", "INF","L(INF,1)","L(INF,2)","L(INF,3)",
-                 "logCREDIT","L(logCREDIT,1)","L(logCREDIT,2)","L(logCREDIT,3)",
-                 "logTC","L(logTC,1)", "logFDI","L(logFDI,1)","L(logFDI,2)","L(logFDI,3)", "Constant"],
-    "Coefficient": [-0.139283, -14.065258, 0.814373, 3.478532, -1.494072, 12.180486, -4.376342,
-                    5.883577, 4.602755, -0.366516, -0.270084, 0.006172, 0.225961,
-                    -5.238680, -13.878765, 15.429603, 5.595321, 9.669343, -40.599514,
-                    -0.045632, 0.586344, -0.029744, -0.443065, 193.713570],
-    "p-value": [0.02416, 0.00307, 0.05571, 0.00583, 0.08327, 0.01421, 0.02008,
-                0.00700, 0.00946, 0.00346, 0.01617, 0.44050, 0.01498,
-                0.01116, 0.00460, 0.00349, 0.00958, 0.00917, 0.00235,
-                0.05533, 0.00313, 0.09182, 0.00331, 0.00425]
-})
-ardl_general["Sig"] = ardl_general["p-value"].apply(format_sig)
-
-ecm_short = pd.DataFrame({
-    "Variable": ["d(logREM)", "d(L(logREM,1))", "d(logINV)", "d(L(logINV,1))", "d(logOPEN)",
-                 "d(INF)","d(L(INF,1))","d(L(INF,2))", "d(logCREDIT)","d(L(logCREDIT,1))","d(L(logCREDIT,2))",
-                 "d(logTC)", "d(logFDI)","d(L(logFDI,1))","d(L(logFDI,2))", "ect", "Constant"],
-    "Coefficient": [-14.065, -3.479, -1.494, 4.376, 5.884, -0.367, -0.232, -0.226,
-                    -5.239, -21.025, -5.595, 9.669, -0.046, 0.473, 0.443, -1.139, 193.714],
-})
-
-long_run = pd.DataFrame({
-    "Variable": ["logREM","logINV","logOPEN","INF","logCREDIT","logTC","logFDI"],
-    "Coefficient (LR)": [-5.0981021, 10.4298151, 27.7491541, -1.3883375, -3.7688735, -36.4546632, 0.7089692]
-})
-
-bounds_test = pd.DataFrame({
-    "Test": ["Pesaran Bounds"],
-    "F-stat": [5.3808],
-    "CV 5% I(0)": [2.73],
-    "CV 5% I(1)": [4.163],
-    "Result": ["✅ Cointégration"]
-})
-
-ardl_diag = pd.DataFrame({
-    "Test": ["Wilcoxon", "t-test", "ARCH LM", "Box-Pierce", "Ljung-Box", "Lilliefors", "Shapiro-Wilk"],
-    "p-value": [0.9368, 1.0, 0.214, 0.4823, 0.3432, 0.8563, 0.6508],
-    "Status": ["✅", "✅", "✅", "✅", "✅", "✅", "✅"]
-})
-
-granger = pd.DataFrame({
-    "Variable": ["logREM","logINV","logOPEN","INF","logCREDIT","logTC","logFDI"],
-    "F": [1.0089, 4.1263, 4.6084, 0.3763, 0.1844, 2.6538, 2.5814],
-    "p-value": [0.4117, 0.02164, 0.01461, 0.7712, 0.9056, 0.07975, 0.0854]
-})
+st.sidebar.markdown("---")
+st.sidebar.subheader("🧩 Sélection ARDL")
+ardl_max_lag = st.sidebar.slider("Retard maximal", 1, 4, 2)
+ardl_criterion = st.sidebar.radio("Critère", ["AIC", "BIC"], horizontal=True)
+
+GRANGER_MAX_LAG = 4
+data_version = df.attrs["version"]
+
+@profiled()
+@st.cache_data(show_spinner="Chargement des résultats précalculés…")
+def load_results_bundle(version: str, config: PipelineConfig, _source) -> ResultBundle:
+    # Bundles are normally written by `python -m mes run`; a missing one is computed here once and saved
+    return ensure_bundle(_source, config, version=version)
+
+@profiled()
+@st.cache_resource(show_spinner=False)
+def load_fits(version: str, order: tuple, _data: pd.DataFrame):
+    # The selected models are cheap to refit; the bootstrap and scenario engine need the fitted objects
+    return fit_ardl(_data, order), fit_3sls(build_system(_data))
+
+def with_sig(table: pd.DataFrame, pval_col: str) -> pd.DataFrame:
+    table = table.copy()
+    table["Sig"] = table[pval_col].apply(format_sig)
+    return table
+
+try:
+    pipeline_config = PipelineConfig(ardl_max_lag=ardl_max_lag, ardl_criterion=ardl_criterion,
+                                     granger_max_lag=GRANGER_MAX_LAG)
+    if not bundle_exists(data_version, pipeline_config):
+        st.sidebar.info("Aucun bundle précalculé pour ces données et ce réglage : les modèles sont estimés "
+                        "(ou relus du cache de résultats) dans cette session. "
+                        "Précalcul : `python -m mes run <classeur>`.")
+    bundle = load_results_bundle(data_version, pipeline_config, df if panel_mode else default_path)
+except ValueError as e:
+    # Too few observations for any specification that keeps enough residual degrees of freedom
+    st.error(f"❌ Estimation ARDL impossible : {e}")
+    stop()
+ardl_fit, sls_fit = load_fits(data_version, bundle.ardl_order, df)
+
+res_3sls = {name: with_sig(bundle.tables[sheet], "Pr(>|t|)") for name, sheet in SYSTEM_SHEETS.items()}
+ardl_ranking = bundle.tables["ARDL_ranking"]
+ardl_general = with_sig(bundle.tables["ARDL_general"], "p-value")
+ecm_short = bundle.tables["ECM_short"]
+long_run = bundle.tables["Long_run"]
+ardl_label = format_order(bundle.ardl_order)
+
+@profiled()
+@st.cache_data(show_spinner="Bootstrap en cours…")
+def load_bootstrap(data: pd.DataFrame, order: tuple, reps: int, method: str, block_length: int,
+                   _sls_fit, _ardl_fit):
+    config = BootstrapConfig(reps=reps, method=method, block_length=block_length)
+    ardl_draws = bootstrap_ardl(_ardl_fit, config)
+    return (system_summaries(_sls_fit, bootstrap_system(_sls_fit, config)),
+            summarize_draws(_ardl_fit.names, ardl_draws), long_run_summary(_ardl_fit, ardl_draws))
+
+st.sidebar.markdown("---")
+st.sidebar.subheader("🔁 Bootstrap")
+boot_on = st.sidebar.checkbox("Intervalles de confiance bootstrap", value=False)
+if boot_on:
+    boot_reps = int(st.sidebar.number_input("Réplications", 200, 20000, 2000, 100))
+    boot_method = st.sidebar.radio("Rééchantillonnage", BOOT_METHODS, horizontal=True,
+                                   format_func=lambda m: "Résidus" if m == "residual" else "Blocs")
+    boot_block = st.sidebar.slider("Longueur des blocs", 2, 8, 4) if boot_method == "block" else 1
+    boot_config = BootstrapConfig(reps=boot_reps, method=boot_method, block_length=boot_block)
+
+    boot_sls, boot_ardl, boot_lr = load_bootstrap(df, ardl_fit.order, boot_reps, boot_method, boot_block,
+                                                  sls_fit, ardl_fit)
+    res_3sls = {name: attach_summary(table, boot_sls[name]) for name, table in res_3sls.items()}
+    ardl_general = attach_summary(ardl_general, boot_ardl)
+    long_run = attach_summary(long_run, boot_lr)
+    st.sidebar.caption(f"IC percentiles {boot_config.level:.0%} · {boot_reps} réplications")
+
+res_3sls_eq1 = res_3sls["logREM"]
+res_3sls_eq2 = res_3sls["GROWTH"]
+res_3sls_eq3 = res_3sls["logINV"]
+res_3sls_eq4 = res_3sls["OPEN"]
+
+@profiled()
+@st.cache_data(show_spinner="Forme réduite du système…")
+def load_scenario_engine(data: pd.DataFrame, _fit):
+    return build_engine(_fit)
+
+scenario_engine = load_scenario_engine(df, sls_fit)
+
+bounds_test = bundle.tables["Bounds_test"]
+bounds_cv_table = bundle.tables["Bounds_CV"]
+bounds_f = float(bounds_test["F-stat"].iloc[0])
+bounds_result = bounds_test["Result"].iloc[0]
+
+ardl_diag = bundle.tables["Diagnostics"]
+
+granger_all = bundle.tables["Granger"]
+unit_root = bundle.tables["Unit_root"]
+integration_orders = integration_table(unit_root)
+
+# ==================== MEMOIZED OUTPUTS ====================
+# Keyed by data version / bundle key; the frames themselves are passed unhashed
+
+# Followed across versions of the same workbook (and country): appended rows update the moments in place
+moments_key = f"{os.path.abspath(default_path)}|{entity if panel_mode else ''}"
+
+@st.cache_data(show_spinner=False)
+def data_moments(version: str, key: str, cols: tuple, _data: pd.DataFrame) -> RunningMoments:
+    # ``key`` names the persisted accumulator, so it is part of the cache key too
+    return running_moments(_data[list(cols)], key)
+
+@st.cache_data(show_spinner=False)
+def summary_statistics(version: str, key: str, cols: tuple, _data: pd.DataFrame) -> pd.DataFrame:
+    # Quantiles do not merge across blocks: they alone are taken from the full columns
+    stats = data_moments(version, key, cols, _data).describe()
+    quantiles = _data[list(cols)].quantile([0.25, 0.5, 0.75]).T
+    quantiles.columns = ["25%", "50%", "75%"]
+    return pd.concat([stats.drop(columns="max"), quantiles, stats[["max"]]], axis=1)
+
+@st.cache_data(show_spinner=False)
+def histogram_figure(version: str, var: str, _data: pd.DataFrame) -> go.Figure:
+    return px.histogram(_data, x=var, nbins=15, color_discrete_sequence=['#1f77b4'])
+
+@st.cache_data(show_spinner=False)
+def correlation_figure(version: str, key: str, cols: tuple, _data: pd.DataFrame) -> go.Figure:
+    corr = data_moments(version, key, tuple(expected_cols), _data).corr().loc[list(cols), list(cols)]
+    return px.imshow(corr, color_continuous_scale="RdBu", zmin=-1, zmax=1)
+
+@st.cache_data(show_spinner=False)
+def series_figure(version: str, var: str, window: tuple | None, _data: pd.DataFrame) -> tuple[go.Figure, int]:
+    """Line of ``var`` over the window, LTTB-reduced to MAX_POINTS; also returns the points in the window."""
+    points = _data[["year", var]].dropna()
+    if window is not None:
+        points = points[points["year"].between(*window)]
+    shown = downsample(points, "year", var, MAX_POINTS)
+    start, end = window if window is not None else (_data["year"].min(), _data["year"].max())
+    fig = px.line(shown, x="year", y=var, markers=len(shown) <= 200, color_discrete_sequence=['#1f77b4'],
+                  title=f"<b>{var}</b> - Évolution {start:.0f}-{end:.0f}")
+    fig.update_layout(hovermode="x unified", height=500)
+    return fig, len(points)
+
+@st.cache_data(show_spinner=False)
+def granger_heatmap(version: str, config_key: str, _results: pd.DataFrame) -> go.Figure:
+    gr_matrix = granger_matrix(_results)
+    fig = px.imshow(gr_matrix, color_continuous_scale="RdYlGn", zmin=0, zmax=0.2, aspect="auto",
+                    labels=dict(x="Retard", y="Cause → Effet", color="p-value"))
+    fig.update_layout(height=max(400, 14 * len(gr_matrix)), template="plotly_white")
+    return fig
+
+@profiled()
+@st.cache_data(show_spinner="Estimation récursive…")
+def stability_results(version: str, order: tuple, window: int | None, _data: pd.DataFrame):
+    fit = fit_ardl(_data, order)
+    years = _data.loc[fit.index, "year"].astype(int).to_numpy()
+    path, w = recursive_ls(fit.X, fit.y, index=years, names=fit.names)
+    if window:
+        path = rolling_ls(fit.X, fit.y, window, index=years, names=fit.names)
+    residual_years = years[len(years) - len(w):]
+    return path, cusum(w, residual_years), cusumsq(w, residual_years)
+
+def specification_orders() -> dict[str, tuple]:
+    """Selected ARDL plus two parsimonious alternatives, for analyses that need residual degrees of freedom."""
+    k = len(ARDL_REGRESSORS)
+    orders = {ardl_label: ardl_fit.order}
+    for q in (0, 1):
+        orders.setdefault(format_order((1,) + (q,) * k), (1,) + (q,) * k)
+    return orders
+
+@profiled()
+@st.cache_data(show_spinner="Simulation des trajectoires…")
+def forecast_bands(version: str, order: tuple, horizon: int, n_paths: int, _data: pd.DataFrame):
+    fit = fit_ardl(_data, order)
+    last_year = int(_data.loc[fit.index[-1], "year"])
+    fc = ecm_forecast(fit, _data, horizon, n_paths, steps=np.arange(last_year + 1, last_year + horizon + 1))
+    return fc.bands(), fc.equilibrium
+
+@profiled()
+@st.cache_data(show_spinner="Multiplicateurs dynamiques…")
+def load_multipliers(version: str, order: tuple, horizon: int, cumulative: bool, boot: BootstrapConfig | None,
+                     _fit) -> pd.DataFrame:
+    draws = bootstrap_multipliers(_fit, horizon, boot, cumulative) if boot else None
+    return multiplier_table(_fit, horizon, draws, cumulative=cumulative)
+
+def band_figure(table: pd.DataFrame, stat: str, title: str) -> go.Figure:
+    fig = go.Figure([
+        go.Scatter(x=table.index, y=table[stat], mode="lines+markers", line=dict(color="#1f77b4", width=2), name=stat),
+        go.Scatter(x=table.index, y=table["Upper"], line=dict(color="#d62728", dash="dash"), name="Borne 5%"),
+        go.Scatter(x=table.index, y=table["Lower"], line=dict(color="#d62728", dash="dash"), showlegend=False),
+    ])
+    fig.update_layout(title=f"<b>{title}</b>", template="plotly_white", height=380, hovermode="x unified")
+    return fig
+
+@profiled()
+@st.cache_data(show_spinner=False)
+def system_diagnostics(version: str, _fit) -> pd.DataFrame:
+    labels = [eq.dependent for eq in _fit.data.equations]
+    return diagnostic_pvalues(_fit.resid.T, labels)
 
 # ==================== PAGE HEADER ====================
 
@@ -318,130 +499,283 @@ tabs = st.tabs([
     "🧠 3SLS",
     "🎛️ Scénarios",
     "⬇️ Export"
-])
+] + (["🌍 Panel"] if panel_mode else []))
 
 # ==================== TAB 0: DONNÉES ====================
 
-with tabs[0]:
+@st.fragment
+@profiled()
+def render_data_tab():
     st.markdown('<div class="section-header"><h2>📊 Gestion des Données</h2></div>', unsafe_allow_html=True)
     
-    if df is None:
-        st.error("❌ Aucune donnée chargée.")
-    else:
-        missing = [c for c in expected_cols if c not in df.columns]
-        if missing:
-            st.error(f"❌ Colonnes manquantes : {missing}")
-        else:
-            df = df.sort_values("year").reset_index(drop=True).copy()
-            df["logREM"] = safe_log(df["REM"])
-            df["logTC"]  = safe_log(df["TC"])
-            df["logFDI"] = safe_log(df["FDI"])
-            df["logOPEN"]= safe_log(df["OPEN"])
-            df["logCREDIT"]= safe_log(df["CREDIT"])
-            df["logINV"] = safe_log(df["INV"])
-
-            col1, col2, col3, col4, col5 = st.columns(5)
-            with col1:
-                st.metric("📅 Période", f"{int(df.year.min())}–{int(df.year.max())}")
-            with col2:
-                st.metric("📊 Obs", df.shape[0])
-            with col3:
-                st.metric("📈 Vars", df.shape[1])
-            with col4:
-                st.metric("🔲 Manquants", int(df.isna().sum().sum()))
-            with col5:
-                completeness = (1 - df.isna().sum().sum()/(df.shape[0]*df.shape[1]))*100
-                st.metric("✅ Complétude", f"{completeness:.1f}%")
-
-            st.markdown("---")
-            data_tabs = st.tabs(["📋 Aperçu", "📊 Stats", "📉 Distribs"])
-            
-            with data_tabs[0]:
-                st.dataframe(df.head(20), use_container_width=True)
-            
-            with data_tabs[1]:
-                st.dataframe(df[expected_cols].describe().T.style.format(precision=3), use_container_width=True)
-            
-            with data_tabs[2]:
-                col1, col2 = st.columns(2)
-                with col1:
-                    var = st.selectbox("Distribution", [c for c in expected_cols if c != 'year'])
-                    fig = px.histogram(df, x=var, nbins=15, color_discrete_sequence=['#1f77b4'])
-                    st.plotly_chart(fig, use_container_width=True)
-                with col2:
-                    corr = df[[c for c in expected_cols if c != 'year']].corr()
-                    fig_corr = px.imshow(corr, color_continuous_scale="RdBu", zmin=-1, zmax=1)
-                    st.plotly_chart(fig_corr, use_container_width=True)
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("📅 Période", f"{int(df.year.min())}–{int(df.year.max())}")
+    with col2:
+        st.metric("📊 Obs", df.shape[0])
+    with col3:
+        st.metric("📈 Vars", df.shape[1])
+    with col4:
+        st.metric("🔲 Manquants", int(df.isna().sum().sum()))
+    with col5:
+        completeness = (1 - df.isna().sum().sum()/(df.shape[0]*df.shape[1]))*100
+        st.metric("✅ Complétude", f"{completeness:.1f}%")
+
+    st.markdown("---")
+    data_tabs = st.tabs(["📋 Aperçu", "📊 Stats", "📉 Distribs", "🧪 Racine unitaire"])
+
+    with data_tabs[0]:
+        st.dataframe(df.head(20), width="stretch")
+
+    with data_tabs[1]:
+        stats_table = summary_statistics(data_version, moments_key, tuple(expected_cols), df)
+        st.dataframe(stats_table.style.format(precision=3), width="stretch")
+
+    with data_tabs[2]:
+        col1, col2 = st.columns(2)
+        with col1:
+            var = st.selectbox("Distribution", [c for c in expected_cols if c != 'year'])
+            st.plotly_chart(histogram_figure(data_version, var, df), width="stretch")
+        with col2:
+            fig_corr = correlation_figure(data_version, moments_key,
+                                          tuple(c for c in expected_cols if c != 'year'), df)
+            st.plotly_chart(fig_corr, width="stretch")
+
+    with data_tabs[3]:
+        st.markdown("<div class='table-title'>Ordre d'intégration (ADF · PP · KPSS, seuil 5%)</div>",
+                    unsafe_allow_html=True)
+        st.dataframe(integration_orders.style.format(precision=4, subset=integration_orders.columns[1:-1])
+                     .apply(lambda col: np.where(col == "I(2)+", "background-color: #f8d7da; font-weight: bold", ""),
+                            subset=["Ordre"]),
+                     width="stretch", hide_index=True)
+        st.caption("Ordre retenu à la majorité des trois tests : ADF et PP rejettent la racine unitaire, "
+                   "KPSS ne rejette pas la stationnarité (p-values KPSS bornées à [0.01, 0.10]).")
+        with st.expander("Statistiques détaillées"):
+            st.dataframe(unit_root.style.format(precision=4), width="stretch", hide_index=True)
+
+with tabs[0]:
+    render_data_tab()
 
 # ==================== TAB 1: SÉRIES & KPIs ====================
 
-with tabs[1]:
+@st.fragment
+@profiled()
+def render_series_tab():
     st.markdown('<div class="section-header"><h2>📈 Séries Temporelles</h2></div>', unsafe_allow_html=True)
     
     if df is not None:
         cols = [c for c in expected_cols if c != "year"]
         var = st.selectbox("Sélectionner une variable", cols)
         
-        fig = px.line(df, x="year", y=var, markers=True, color_discrete_sequence=['#1f77b4'],
-                     title=f"<b>{var}</b> - Évolution 1995-2022")
-        fig.update_layout(hovermode="x unified", height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        window = None
+        if df[var].notna().sum() > MAX_POINTS:
+            # Plotly zoom stays in the browser: the window is chosen here and re-sampled at full resolution
+            lo, hi = float(df["year"].min()), float(df["year"].max())
+            window = st.slider("Fenêtre", lo, hi, (lo, hi), key=f"window:{var}")
+        fig, total = series_figure(data_version, var, window, df)
+        st.plotly_chart(fig, width="stretch")
+        if total > MAX_POINTS:
+            st.caption(f"{MAX_POINTS} points sur {total} affichés (LTTB) : réduire la fenêtre pour la pleine résolution.")
         
-        s = pd.to_numeric(df[var], errors="coerce")
+        s = data_moments(data_version, moments_key, tuple(expected_cols), df).describe().loc[var]
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("📊 Moyenne", f"{s.mean():.3f}")
-        col2.metric("📈 Écart-type", f"{s.std():.3f}")
-        col3.metric("📉 Min", f"{s.min():.3f}")
-        col4.metric("📈 Max", f"{s.max():.3f}")
+        col1.metric("📊 Moyenne", f"{s['mean']:.3f}")
+        col2.metric("📈 Écart-type", f"{s['std']:.3f}")
+        col3.metric("📉 Min", f"{s['min']:.3f}")
+        col4.metric("📈 Max", f"{s['max']:.3f}")
+
+        st.markdown("---")
+        render_forecast()
+
+@profiled()
+def render_forecast():
+    st.markdown(f"#### 🔮 Prévision de {ardl_fit.dependent} (dynamique ECM)")
+    orders = specification_orders()
+    col1, col2, col3 = st.columns(3)
+    label = col1.selectbox("Modèle de prévision", list(orders))
+    horizon = col2.slider("Horizon (années)", 1, 10, 5)
+    n_paths = int(col3.select_slider("Trajectoires simulées", [1000, 5000, 20000, 50000], DEFAULT_PATHS))
+
+    bands, equilibrium = forecast_bands(data_version, orders[label], horizon, n_paths, df)
+    history = df[["year", ardl_fit.dependent]].dropna()
+    fig = go.Figure(go.Scatter(x=history["year"], y=history[ardl_fit.dependent], mode="lines+markers",
+                               line=dict(color="#1f77b4", width=2), name="Observé"))
+    for level, alpha in zip(sorted(FAN_LEVELS, reverse=True), (0.15, 0.25, 0.4)):
+        fig.add_trace(go.Scatter(x=bands["Step"], y=bands[f"High {level:.0%}"], line=dict(width=0),
+                                 showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=bands["Step"], y=bands[f"Low {level:.0%}"], fill="tonexty",
+                                 fillcolor=f"rgba(255,127,14,{alpha})", line=dict(width=0), name=f"IC {level:.0%}"))
+    fig.add_trace(go.Scatter(x=bands["Step"], y=bands["Median"], line=dict(color="#ff7f0e", width=2), name="Médiane"))
+    if np.isfinite(equilibrium):
+        fig.add_hline(y=equilibrium, line_dash="dot", line_color="#2ca02c", annotation_text="Équilibre de long terme")
+    fig.update_layout(template="plotly_white", height=460, hovermode="x unified",
+                      xaxis_title="Année", yaxis_title=ardl_fit.dependent)
+    st.plotly_chart(fig, width="stretch")
+    st.caption(f"{n_paths} trajectoires, chocs tirés dans les résidus ; régresseurs maintenus à leur dernière "
+               "valeur observée, incertitude sur les paramètres non prise en compte.")
+    with st.expander("Tableau des quantiles"):
+        st.dataframe(bands.style.format(precision=3, subset=bands.columns[1:]), width="stretch",
+                     hide_index=True)
+
+with tabs[1]:
+    render_series_tab()
 
 # ==================== TAB 2: ARDL/ECM ====================
 
-with tabs[2]:
+@st.fragment
+@profiled()
+def render_ardl_tab():
     st.markdown('<div class="section-header"><h2>🧩 ARDL/ECM – Résultats Complets</h2></div>', unsafe_allow_html=True)
     
-    ardl_tabs = st.tabs(["📊 Général", "📈 Long Terme", "📉 Court Terme", "🔬 Bounds", "📋 Diagnostics"])
+    ardl_tabs = st.tabs(["📊 Général", "📈 Long Terme", "📉 Court Terme", "🔬 Bounds", "📋 Diagnostics",
+                         "🧭 Stabilité"])
     
     with ardl_tabs[0]:
-        format_results_table(ardl_general, "Modèle ARDL(1,2,2,1,3,3,1,3)")
+        format_results_table(ardl_general, f"Modèle {ardl_label}")
         create_coefficient_chart(ardl_general, "Coefficients ARDL")
         st.info("🟢 Vert = positif  |  🔴 Rouge = négatif  |  Intensité = magnitude")
+        with st.expander(f"🏁 Classement des spécifications ({ardl_criterion}, retard max {ardl_max_lag})"):
+            st.dataframe(ardl_ranking.style.format(precision=3), width="stretch")
     
     with ardl_tabs[1]:
         format_results_table(long_run, "Relation de Long Terme")
         create_coefficient_chart(long_run, "Effets à Long Terme")
         st.markdown("**Équilibre structurel** entre les variables")
+        render_multipliers()
     
     with ardl_tabs[2]:
         st.markdown(f'<div class="table-title">Dynamique Court Terme (ECM)</div>', unsafe_allow_html=True)
         format_results_table(ecm_short, "")
     
     with ardl_tabs[3]:
-        st.dataframe(bounds_test, use_container_width=True)
+        st.dataframe(bounds_test, width="stretch")
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("F-statistic", "5.3808", delta="Pesaran Test")
+            st.metric("F-statistic", f"{bounds_f:.4f}", delta="Pesaran Test")
         with col2:
-            st.success("✅ **F-stat > I(1) 5%** → Cointégration détectée")
+            if bounds_result.startswith("✅"):
+                st.success("✅ **F-stat > I(1) 5%** → Cointégration détectée")
+            elif bounds_result.startswith("❌"):
+                st.error("❌ **F-stat < I(0) 5%** → Pas de cointégration")
+            else:
+                st.warning("⚠️ **I(0) ≤ F-stat ≤ I(1)** → Zone d'indétermination")
+        i2 = integration_orders.loc[integration_orders["Variable"].isin([ardl_fit.dependent, *ardl_fit.regressors])
+                                    & (integration_orders["Ordre"] == "I(2)+"), "Variable"].tolist()
+        if i2:
+            st.warning(f"⚠️ Variables possiblement I(2) : {', '.join(i2)} — les bornes de Pesaran supposent "
+                       "des variables I(0) ou I(1).")
+        st.markdown(f"**Valeurs critiques simulées** (T = {ardl_fit.nobs}, k = {len(ardl_fit.regressors)}, cas III)")
+        st.dataframe(bounds_cv_table.style.format(precision=3), width="stretch")
     
     with ardl_tabs[4]:
         format_results_table(ardl_diag, "Diagnostics des Résidus")
-        st.success("✅ **Tous les diagnostics OK** - Résidus proches du bruit blanc")
+        passed, message = diagnostics_verdict(ardl_diag)
+        (st.success if passed else st.warning)(message)
+    
+    with ardl_tabs[5]:
+        render_stability()
+
+@profiled()
+def render_multipliers():
+    st.markdown("#### ⏱️ Multiplicateurs dynamiques")
+    col1, col2 = st.columns(2)
+    horizon = col1.slider("Horizon", 2, 30, 10)
+    cumulative = col2.radio("Type", ["Cumulés", "Instantanés"], horizontal=True) == "Cumulés"
+    selected = st.multiselect("Régresseurs", list(ardl_fit.regressors), default=list(ardl_fit.regressors[:3]))
+    table = load_multipliers(data_version, ardl_fit.order, horizon, cumulative, boot_config if boot_on else None,
+                             ardl_fit)
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for color, (name, rows) in zip(palette, table[table["Variable"].isin(selected)].groupby("Variable", sort=False)):
+        if "CI low" in rows:
+            fig.add_trace(go.Scatter(x=np.r_[rows["Horizon"], rows["Horizon"][::-1]],
+                                     y=np.r_[rows["CI high"], rows["CI low"][::-1]], fill="toself", opacity=0.2,
+                                     line=dict(width=0), fillcolor=color, showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=rows["Horizon"], y=rows["Multiplier"], mode="lines+markers", name=name,
+                                 line=dict(color=color, width=2)))
+    fig.add_hline(y=0, line_color="gray", line_width=1)
+    fig.update_layout(template="plotly_white", height=440, hovermode="x unified", xaxis_title="Années après le choc",
+                      yaxis_title=f"Effet sur {ardl_fit.dependent}")
+    st.plotly_chart(fig, width="stretch")
+    if boot_on:
+        st.caption(f"Bandes bootstrap {boot_config.level:.0%} · {boot_config.reps} réplications")
+    else:
+        st.caption("Activer le bootstrap dans la barre latérale pour afficher les bandes de confiance.")
+
+@profiled()
+def render_stability():
+    k = len(ARDL_REGRESSORS)
+    orders = specification_orders()
+    # Coefficients and observations of each specification; recursive residuals need nobs > k
+    sizes = {label: (sum(o) + k + 1, len(df) - max(o)) for label, o in orders.items()}
+    usable = [label for label, (n_coef, nobs) in sizes.items() if nobs - n_coef >= 3]
+    col1, col2 = st.columns(2)
+    with col1:
+        label = st.selectbox("Spécification", list(orders), index=list(orders).index(usable[0]) if usable else 0)
+    order = orders[label]
+    n_coef, nobs = sizes[label]
+    if label not in usable:
+        st.warning(f"⚠️ {label} compte {n_coef} coefficients pour {nobs} observations : "
+                   "trop peu de résidus récursifs. Choisir une spécification plus parcimonieuse.")
+        return
+    with col2:
+        mode = st.radio("Échantillon", ["Récursif", "Glissant"], horizontal=True)
+    window = st.slider("Largeur de la fenêtre", n_coef + 2, nobs, min(nobs, n_coef + 8)) if mode == "Glissant" else None
+
+    path, cs, cssq = stability_results(data_version, order, window, df)
+    st.dataframe(stability_summary(cs, cssq), width="stretch", hide_index=True)
+    col1, col2 = st.columns(2)
+    col1.plotly_chart(band_figure(cs, "CUSUM", "CUSUM"), width="stretch")
+    col2.plotly_chart(band_figure(cssq, "CUSUMSQ", "CUSUM des carrés"), width="stretch")
+
+    coefs = st.multiselect("Coefficients", path.names, default=path.names[order[0]:order[0] + 1])
+    coef, se = path.frame("coef"), path.frame("se")
+    fig = go.Figure()
+    for name in coefs:
+        fig.add_trace(go.Scatter(x=coef.index, y=coef[name], mode="lines+markers", name=name,
+                                 error_y=dict(type="data", array=2 * se[name], visible=True, thickness=1)))
+    sample = f"fenêtre de {window} ans" if window else "échantillon croissant"
+    fig.update_layout(title=f"<b>Trajectoire des coefficients</b> ({sample}, ± 2 e.-t.)",
+                      xaxis_title="Fin de l'échantillon", template="plotly_white", height=420, hovermode="x unified")
+    st.plotly_chart(fig, width="stretch")
+
+with tabs[2]:
+    render_ardl_tab()
 
 # ==================== TAB 3: GRANGER ====================
 
-with tabs[3]:
+@st.fragment
+@profiled()
+def render_granger_tab():
     st.markdown('<div class="section-header"><h2>🔁 Causalité de Granger</h2></div>', unsafe_allow_html=True)
     
+    col1, col2 = st.columns(2)
+    with col1:
+        gr_target = st.selectbox("Variable expliquée", list(GRANGER_VARIABLES))
+    with col2:
+        gr_lag = st.selectbox("Ordre (retards)", list(range(1, GRANGER_MAX_LAG + 1)), index=2)
+    
+    granger = granger_target(granger_all, gr_target, gr_lag)
     gr_styled = granger.copy()
     gr_styled['Status'] = gr_styled['p-value'].apply(lambda x: '✅ Causalité' if x < 0.05 else ('⚠️ Marginale' if x < 0.1 else '❌ Non-sig'))
-    format_results_table(gr_styled, "Causalité de Granger")
+    format_results_table(gr_styled, f"Causalité de Granger vers {gr_target} (ordre {gr_lag})")
     
     sig5 = granger[granger['p-value']<=0.05]['Variable'].tolist()
     st.info(f"**Variables causales au seuil 5%**: {', '.join(sig5) if sig5 else 'Aucune'}")
 
+    st.markdown("---")
+    st.markdown('<div class="table-title">Toutes les paires × retards (p-values)</div>', unsafe_allow_html=True)
+    fig_gr = granger_heatmap(data_version, bundle.meta["config_key"], granger_all)
+    st.plotly_chart(fig_gr, width="stretch")
+
+with tabs[3]:
+    render_granger_tab()
+
 # ==================== TAB 4: 3SLS ====================
 
-with tabs[4]:
+@st.fragment
+@profiled()
+def render_3sls_tab():
     st.markdown('<div class="section-header"><h2>🧠 Système 3SLS (4 Équations)</h2></div>', unsafe_allow_html=True)
     
     eq = st.radio("Sélectionner l'équation", ["(1) logREM", "(2) GROWTH", "(3) logINV", "(4) OPEN"], horizontal=True)
@@ -450,37 +784,44 @@ with tabs[4]:
         st.markdown('**Équation 1: Remittances (logREM)** 🔴', unsafe_allow_html=True)
         format_results_table(res_3sls_eq1, "Coefficients 3SLS - Équation 1")
         create_coefficient_chart(res_3sls_eq1, "Effets sur les Remittances")
-        st.markdown("💡 **GROWTH < 0 (très sig.)** → Transferts contracycliques (motif d'assurance)")
+        st.markdown(coefficient_note(res_3sls_eq1, "GROWTH", "Transferts procycliques (motif d'investissement)",
+                                     "Transferts contracycliques (motif d'assurance)"))
 
     elif eq.startswith("(2)"):
         st.markdown('**Équation 2: Croissance (GROWTH)** 🟠', unsafe_allow_html=True)
         format_results_table(res_3sls_eq2, "Coefficients 3SLS - Équation 2")
         create_coefficient_chart(res_3sls_eq2, "Effets sur la Croissance")
-        st.markdown("💡 **OPEN > 0 (très sig.)** → Libéralisation commerciale est crucial!")
+        st.markdown(coefficient_note(res_3sls_eq2, "OPEN", "La libéralisation commerciale stimule la croissance",
+                                     "L'ouverture commerciale freine la croissance"))
 
     elif eq.startswith("(3)"):
         st.markdown('**Équation 3: Investissement (logINV)** 🟢', unsafe_allow_html=True)
         format_results_table(res_3sls_eq3, "Coefficients 3SLS - Équation 3")
         create_coefficient_chart(res_3sls_eq3, "Effets sur l'Investissement")
-        st.markdown("💡 **CREDIT > 0 (sig.)** → Canal financier stimule l'investissement")
+        st.markdown(coefficient_note(res_3sls_eq3, "CREDIT", "Canal financier stimule l'investissement",
+                                     "Le crédit n'alimente pas l'investissement"))
 
     else:
         st.markdown('**Équation 4: Ouverture Commerciale (OPEN)** 🟣', unsafe_allow_html=True)
         format_results_table(res_3sls_eq4, "Coefficients 3SLS - Équation 4")
         create_coefficient_chart(res_3sls_eq4, "Déterminants de l'Ouverture")
-        st.markdown("💡 **GROWTH > 0 (sig.)** → Expansion économique élargit le commerce")
+        st.markdown(coefficient_note(res_3sls_eq4, "GROWTH", "Expansion économique élargit le commerce",
+                                     "La croissance réduit l'ouverture commerciale"))
+
+    with st.expander("📋 Diagnostics des résidus des 4 équations (p-values)"):
+        st.dataframe(system_diagnostics(data_version, sls_fit).style.format(precision=4)
+                     .highlight_between(left=0, right=0.05, color="#f8d7da"), width="stretch")
+
+with tabs[4]:
+    render_3sls_tab()
 
 # ==================== TAB 5: SCÉNARIOS ====================
 
-with tabs[5]:
+@st.fragment
+@profiled()
+def render_scenario_tab():
     st.markdown('<div class="section-header"><h2>🎛️ Simulation de Scénarios</h2></div>', unsafe_allow_html=True)
     
-    b_open = float(res_3sls_eq2.loc[res_3sls_eq2["Variable"]=="OPEN","Estimate"].iloc[0])
-    b_logrem = float(res_3sls_eq2.loc[res_3sls_eq2["Variable"]=="logREM","Estimate"].iloc[0])
-    b_loginv = float(res_3sls_eq2.loc[res_3sls_eq2["Variable"]=="logINV","Estimate"].iloc[0])
-    b_logfdi = float(res_3sls_eq2.loc[res_3sls_eq2["Variable"]=="logFDI","Estimate"].iloc[0])
-    b_logtc = float(res_3sls_eq2.loc[res_3sls_eq2["Variable"]=="logTC","Estimate"].iloc[0])
-
     col1, col2, col3 = st.columns(3)
     with col1:
         d_open = st.slider("OPEN (points)", -30.0, 30.0, 10.0, 1.0)
@@ -499,19 +840,77 @@ with tabs[5]:
     if any(pd.isna(x) for x in [dlog_rem, dlog_inv, dlog_fdi, dlog_tc]):
         st.error("⚠️ Erreur de calcul")
     else:
-        delta_growth = (b_open*d_open) + (b_logrem*dlog_rem) + (b_loginv*dlog_inv) + (b_logfdi*dlog_fdi) + (b_logtc*dlog_tc)
+        shocks = {"OPEN": d_open, "logREM": dlog_rem, "logINV": dlog_inv, "logFDI": dlog_fdi, "logTC": dlog_tc}
+        responses = scenario_engine.simulate(shocks)[0]
+        growth_idx = scenario_engine.endogenous.index("GROWTH")
+        delta_growth = scenario_engine.first_round(shocks)[0, growth_idx]
+        summary = scenario_summary(scenario_engine, responses)
         
         st.markdown("---")
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if delta_growth > 0:
-                st.success(f"📈 **Δ GROWTH = {delta_growth:.3f}%**")
+                st.success(f"📈 **Δ GROWTH = {delta_growth:.3f}%** (effet direct, équation 2)")
             else:
-                st.error(f"📉 **Δ GROWTH = {delta_growth:.3f}%**")
+                st.error(f"📉 **Δ GROWTH = {delta_growth:.3f}%** (effet direct, équation 2)")
+        
+        st.markdown("#### 🔄 Effets totaux via la forme réduite (rétroactions incluses)")
+        n_draws = scenario_engine.n_draws
+        st.caption(f"{n_draws} tirages conservés ({scenario_engine.dropped} écartés, I − B mal conditionnée) ; "
+                   f"rétroaction convergente dans {scenario_engine.stable_share:.0%} des tirages.")
+        if not scenario_engine.stable[0]:
+            st.warning(f"⚠️ Rayon spectral de B = {scenario_engine.radius[0]:.3f} ≥ 1 : la rétroaction n'est pas "
+                       f"convergente à l'estimation ponctuelle (cond(I − B) = {scenario_engine.condition[0]:.0f}).")
+        tail = summary[(summary[ESTIMATE_QUANTILE] < 0.05) | (summary[ESTIMATE_QUANTILE] > 0.95)]
+        if len(tail):
+            st.warning(f"⚠️ L'estimation ponctuelle sort de l'intervalle à 90 % des tirages pour "
+                       f"{', '.join(tail['Variable'])} : I − B est proche de la singularité et les effets "
+                       f"totaux sont très sensibles aux coefficients.")
+        cols = st.columns(len(summary))
+        for col, (_, row) in zip(cols, summary.iterrows()):
+            col.metric(f"{row['Variable']} (estimation)", f"{row['Estimation']:.3f}",
+                       delta=f"médiane {row['Q50%']:.2f}, 90% : [{row['Q5%']:.2f} ; {row['Q95%']:.2f}]",
+                       delta_color="off")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            draws = scenario_frame(scenario_engine, responses).melt(var_name="Variable", value_name="Effet")
+            fig_sc = px.box(draws, x="Variable", y="Effet", color="Variable", points=False,
+                            title=f"Distribution des effets ({n_draws} tirages)")
+            fig_sc.update_layout(showlegend=False, template="plotly_white", height=420)
+            st.plotly_chart(fig_sc, width="stretch")
+        with col2:
+            grid = np.linspace(-30.0, 30.0, 61)
+            fan = scenario_engine.simulate({**shocks, "OPEN": grid})[:, :, growth_idx]
+            q05, q50, q95 = np.quantile(fan[:, 1:], [0.05, 0.5, 0.95], axis=1)
+            fig_fan = go.Figure([
+                go.Scatter(x=grid, y=q95, line=dict(width=0), showlegend=False, hoverinfo="skip"),
+                go.Scatter(x=grid, y=q05, fill="tonexty", fillcolor="rgba(31,119,180,0.2)", line=dict(width=0),
+                           name="90%"),
+                go.Scatter(x=grid, y=q50, line=dict(color="#1f77b4", width=2), name="Médiane"),
+                go.Scatter(x=grid, y=fan[:, 0], line=dict(color="#d62728", width=2, dash="dash"), name="Estimation"),
+            ])
+            fig_fan.update_layout(title="Δ GROWTH selon le choc OPEN (autres curseurs fixés)",
+                                  xaxis_title="Choc OPEN (points)", yaxis_title="Δ GROWTH",
+                                  template="plotly_white", height=420)
+            st.plotly_chart(fig_fan, width="stretch")
+        
+        format_results_table(summary, "Résumé des effets simulés")
+
+with tabs[5]:
+    render_scenario_tab()
 
 # ==================== TAB 6: EXPORT ====================
 
-with tabs[6]:
+@profiled()
+def build_export(key: str, fmt: str, sheets: dict[str, pd.DataFrame]):
+    # Written to the on-disk cache once per key, then read back from there
+    with st.spinner("Préparation de l'export…"):
+        return cached_export(sheets, fmt, key)
+
+@st.fragment
+@profiled()
+def render_export_tab():
     st.markdown('<div class="section-header"><h2>⬇️ Exporter les Résultats</h2></div>', unsafe_allow_html=True)
     
     sheets = {
@@ -524,15 +923,124 @@ with tabs[6]:
         "Long_run": long_run,
         "Bounds_test": bounds_test,
         "Diagnostics": ardl_diag,
-        "Granger": granger
+        "Granger": granger_all,
+        "Unit_root": unit_root
     }
 
-    st.download_button(
-        "⬇️ Excel - Tous les résultats",
-        to_excel_bytes(sheets),
-        f"ARDL_3SLS_Resultats_{datetime.now().strftime('%Y%m%d')}.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    fmt = st.radio("Format", available_formats(), horizontal=True,
+                   format_func=lambda f: {"xlsx": "Excel", "csv": "CSV (zip)", "parquet": "Parquet (zip)"}[f])
+    # The file is only written on request, then served from the disk cache for identical tables
+    key = fingerprint(fmt, *(part for item in sheets.items() for part in item))
+    if st.session_state.get("export_key") != key:
+        if not st.button("📦 Préparer l'export"):
+            st.caption(f"{len(sheets)} tableaux, {sum(len(t) for t in sheets.values())} lignes au total.")
+            return
+        st.session_state["export_key"] = key
+
+    extension, mime = EXPORT_FORMATS[fmt]
+    with open(build_export(key, fmt, sheets), "rb") as export:
+        st.download_button(
+            f"⬇️ {extension.upper()} - Tous les résultats",
+            export,
+            f"ARDL_3SLS_Resultats_{datetime.now().strftime('%Y%m%d')}.{extension}",
+            mime
+        )
+
+@st.fragment
+@profiled()
+def render_store_history():
+    store = result_store()
+    if store is None:
+        return
+    with st.expander("🗄️ Historique des calculs"):
+        st.caption(f"Estimations, tirages bootstrap et trajectoires simulées conservés dans `{store.path}` "
+                   f"(éviction des moins récemment utilisés au-delà de {store.max_bytes / 2 ** 20:.0f} Mo).")
+        runs = store.runs()
+        if runs.empty:
+            st.info("Aucun calcul enregistré.")
+            return
+        st.dataframe(runs, width="stretch", hide_index=True)
+        bundles = runs.loc[runs["Kind"] == "bundle", "Key"].tolist()
+        if len(bundles) < 2:
+            return
+        labels = dict(zip(runs["Key"], runs["Data"] + " · " + runs["Spec"]))
+        col1, col2 = st.columns(2)
+        with col1:
+            key_a = st.selectbox("Run A", bundles, format_func=labels.get)
+        with col2:
+            key_b = st.selectbox("Run B", bundles, index=1, format_func=labels.get)
+        st.dataframe(store.diff(key_a, key_b), width="stretch", hide_index=True)
+
+with tabs[6]:
+    render_export_tab()
+    render_store_history()
+
+# ==================== TAB 7: PANEL ====================
+
+@st.fragment
+@profiled()
+def render_panel_tab():
+    st.markdown('<div class="section-header"><h2>🌍 Comparaison entre pays</h2></div>', unsafe_allow_html=True)
+
+    config = PipelineConfig(ardl_max_lag=ardl_max_lag, ardl_criterion=ardl_criterion, granger_max_lag=GRANGER_MAX_LAG)
+    store = st.session_state.setdefault("panel_results", {})
+    key = (panel_df.attrs.get("version"), config.key())
+    if key not in store:
+        st.info(f"{len(entity_names)} pays dans le classeur. Chaque pays est estimé dans un processus séparé "
+                "et s'affiche dès qu'il est terminé ; les pays déjà calculés sont relus depuis leur bundle.")
+        if not st.button(f"▶️ Estimer les {len(entity_names)} pays"):
+            return
+        progress, live = st.progress(0.0), st.empty()
+        results = []
+        for i, result in enumerate(iter_panel(default_path, entity_col, config), start=1):
+            results.append(result)
+            progress.progress(i / len(entity_names), text=f"{result.entity} terminé ({i}/{len(entity_names)})")
+            live.dataframe(panel_table(results), width="stretch", hide_index=True)
+        progress.empty()
+        live.empty()
+        store[key] = results
+
+    results = store[key]
+    for failed in (r for r in results if not r.ok):
+        st.error(f"❌ {failed.entity} : {failed.error}")
+    table = panel_table(results)
+    if table.empty:
+        return
+    st.dataframe(table.style.format(precision=3), width="stretch", hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = go.Figure([
+            go.Bar(x=table[ENTITY], y=table["F-stat"], name="F-stat", marker_color="#1f77b4"),
+            go.Scatter(x=table[ENTITY], y=table["CV 5% I(1)"], mode="markers", name="CV 5% I(1)",
+                       marker=dict(color="#d62728", symbol="line-ew-open", size=30, line=dict(width=3))),
+        ])
+        fig.update_layout(title="<b>Pesaran Bounds : F-stat par pays</b>", template="plotly_white", height=420,
+                          yaxis_type="log")
+        st.plotly_chart(fig, width="stretch")
+    with col2:
+        coef = st.selectbox("Coefficient", [c for c in table.columns if c == "ECT" or c.startswith("LR ")])
+        fig = px.bar(table, x=ENTITY, y=coef, color=coef, color_continuous_scale="RdYlGn",
+                     color_continuous_midpoint=0)
+        fig.update_layout(title=f"<b>{coef} par pays</b>", template="plotly_white", height=420)
+        st.plotly_chart(fig, width="stretch")
+
+if panel_mode:
+    with tabs[7]:
+        render_panel_tab()
+
+# ==================== PROFILE OF THIS RUN ====================
 
 st.sidebar.markdown("---")
+profiler = st.session_state.get("_profiler")
+if profiler is not None:
+    record = profiler.finish()
+    with st.sidebar.expander("⏱️ Profil du rerun", expanded=True):
+        st.caption(f"**{record['seconds'] * 1e3:.0f} ms** · pic mémoire {record['peak_mb']:.1f} Mo · "
+                   f"rerun n° {record['run']} · trace `{trace_path()}`")
+        st.dataframe(profile_table(record).style.format(precision=1).bar(subset=["% run"], color="#9ecae1", vmin=0, vmax=100),
+                     width="stretch", hide_index=True)
+        st.caption("Les reruns d'un seul onglet (fragments) sont tracés dans le fichier, pas ici.")
+st.sidebar.checkbox("⏱️ Profilage (temps et mémoire)", value=env_enabled(), key="profiling",
+                    help="Chronomètre chaque onglet et fonction d'affichage ; active aussi MES_PROFILE=1")
 st.sidebar.caption("✨ Dashboard Professional v3.0 | ARDL/ECM + Granger + 3SLS | Couleurs & Visualisations enrichies")
@@ -0,0 +1,5 @@
+"""Benchmark suite: dashboard rerun latency and estimator scaling.
+
+``python -m benchmarks --save baseline.json`` records timings, and
+``python -m benchmarks --compare baseline.json`` fails on a slowdown.
+"""
@@ -0,0 +1,74 @@
+"""``python -m benchmarks [--suite micro dashboard fragments] [--preset quick|full] [-k REGEX] [--save F] [--compare F]``
+
+The ``fragments`` suite is a report, not timed cases: the p95 of each tab
+fragment over scripted interactions, against the 50 ms target.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+from .harness import PRESETS, compare, load_baseline, measure, save_baseline
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--suite", nargs="+", choices=["micro", "dashboard", "fragments"],
+                        default=["micro", "dashboard"])
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick",
+                        help="quick: up to 10k observations and 4 entities; full: 100k observations, 500 entities")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose id matches this regular expression")
+    parser.add_argument("--save", help="write the timings to this JSON baseline")
+    parser.add_argument("--compare", help="compare with this JSON baseline; exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown ratio counted as a regression")
+    parser.add_argument("--interactions", type=int, default=20,
+                        help="widget changes per tab for the fragments suite")
+    parser.add_argument("--floor", type=float, default=0.005,
+                        help="ignore slowdowns smaller than this many seconds (timer noise)")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    preset = PRESETS[args.preset]
+    baseline = load_baseline(args.compare) if args.compare else None
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="mes-bench-") as workdir:
+        # Keep the on-disk caches and bundles of the runs out of the working tree
+        os.environ["MES_CACHE_DIR"] = os.path.join(workdir, "cache")
+        os.environ["MES_BUNDLE_DIR"] = os.path.join(workdir, "bundles")
+        cases = []
+        if "micro" in args.suite:
+            from .micro import micro_cases
+            cases += micro_cases(preset, workdir)
+        if "dashboard" in args.suite:
+            from .dashboard import dashboard_cases
+            cases += dashboard_cases(preset, workdir)
+        if args.pattern:
+            cases = [case for case in cases if re.search(args.pattern, case.id)]
+        for case in cases:
+            r = results[case.id] = measure(case, preset.repeat, preset.budget)
+            print(f"{case.id:<48} best {r['min'] * 1e3:10.2f} ms   median {r['median'] * 1e3:10.2f} ms"
+                  f"   x{r['repeats']}", flush=True)
+        if "fragments" in args.suite:
+            from .dashboard import fragment_latency
+            for n in preset.dashboard_sizes:
+                table = fragment_latency(n, workdir, args.interactions)
+                print(table.to_string(index=False, float_format=lambda x: f"{x:.2f}"), flush=True)
+
+    if args.save:
+        save_baseline(results, args.save, args.preset)
+        print(f"baseline written to {args.save}")
+    if baseline is None:
+        return 0
+    if baseline["preset"] != args.preset:
+        print(f"warning: baseline preset {baseline['preset']!r}, current {args.preset!r}", file=sys.stderr)
+    expected = {k: v for k, v in baseline["results"].items() if k in results or not args.pattern}
+    table = compare(expected, results, args.tolerance, args.floor)
+    print(table.to_string(index=False))
+    return 1 if (table["Status"] == "REGRESSION").any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Headless reruns of ``app.py`` through Streamlit's AppTest.
+
+A cold start runs on empty caches (Streamlit's, the columnar data cache,
+the bundles and the result store, all in a scratch directory); a restart
+keeps the disk caches and clears Streamlit's, as after a server restart; a
+rerun repeats the script with nothing changed. Each tab is timed by
+changing one of its widgets, alternating between two values, which is the
+latency a user sees after an interaction once both values are cached.
+
+AppTest always reruns the whole script, while in the browser an
+interaction with a tab's widget reruns only that tab's fragment.
+:func:`fragment_latency` therefore reads the fragment's own time from the
+profiler trace (the ``render_*_tab`` sections) over scripted interactions
+and reports its percentiles against :data:`FRAGMENT_TARGET_MS`. Streamlit's
+own overhead for a fragment rerun (serialization, websocket) is not included.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from mes.profiling import read_trace
+
+from .harness import Case, Preset
+from .micro import reset_caches
+from .synthetic import synthetic_data, write_workbook
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+TIMEOUT = 600
+
+# tab -> (widget type, label, two values; None alternates the first two options of a selectbox)
+TAB_ACTIONS = {
+    "donnees": ("selectbox", "Distribution", None),
+    "series": ("selectbox", "Sélectionner une variable", None),
+    "ardl": ("slider", "Horizon", (10, 12)),
+    "granger": ("selectbox", "Variable expliquée", None),
+    "3sls": ("radio", "Sélectionner l'équation", ("(1) logREM", "(2) GROWTH")),
+    "scenarios": ("slider", "REM (%)", (10.0, 20.0)),
+    "export": ("radio", "Format", ("xlsx", "csv")),
+}
+# tab -> profiled fragment holding its widget
+TAB_FRAGMENTS = {
+    "donnees": "render_data_tab",
+    "series": "render_series_tab",
+    "ardl": "render_ardl_tab",
+    "granger": "render_granger_tab",
+    "3sls": "render_3sls_tab",
+    "scenarios": "render_scenario_tab",
+    "export": "render_export_tab",
+}
+FRAGMENT_TARGET_MS = 50.0
+
+
+class DashboardSession:
+    """One workbook, its scratch caches and the AppTest driving the script."""
+
+    def __init__(self, nobs: int, workdir: str):
+        self.root = Path(workdir) / f"dashboard{nobs}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.workbook = write_workbook(synthetic_data(nobs), self.root / "data.xlsx")
+        self.at = None
+
+    def _environment(self) -> None:
+        os.environ.update(MES_DATA=self.workbook, MES_CACHE_DIR=str(self.root / "cache"),
+                          MES_BUNDLE_DIR=str(self.root / "bundles"))
+        os.environ.pop("MES_STORE", None)
+
+    def _forget(self, disk: bool) -> None:
+        reset_caches()
+        self._environment()
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        if disk:
+            shutil.rmtree(self.root / "cache", ignore_errors=True)
+            shutil.rmtree(self.root / "bundles", ignore_errors=True)
+        self.at = None
+
+    def _check(self) -> None:
+        if self.at.exception:
+            raise RuntimeError(f"app.py raised: {self.at.exception[0].value}")
+
+    def start(self) -> None:
+        self.at = AppTest.from_file(str(APP), default_timeout=TIMEOUT).run()
+        self._check()
+
+    def cold(self) -> None:
+        self._forget(disk=True)
+
+    def restart(self) -> None:
+        if self.at is None:
+            self.cold()
+            self.start()
+        self._forget(disk=False)
+
+    def ensure(self) -> None:
+        if self.at is None:
+            self._forget(disk=False)
+            self.start()
+        self._environment()
+
+    def profile(self, trace: Path) -> None:
+        """Restart the session with the profiler tracing to ``trace``."""
+        trace.unlink(missing_ok=True)
+        # Timings only: tracemalloc would inflate them severalfold
+        os.environ.update(MES_PROFILE="1", MES_PROFILE_FILE=str(trace), MES_PROFILE_MEMORY="0")
+        self.at = None
+        self.ensure()
+
+    def rerun(self) -> None:
+        self.at.run()
+        self._check()
+
+    def interact(self, kind: str, label: str, values) -> None:
+        widget = next(w for w in getattr(self.at, kind) if w.label == label)
+        if values is None:
+            widget.select_index(1 if widget.index == 0 else 0)
+        else:
+            widget.set_value(values[1] if widget.value == values[0] else values[0])
+        self.rerun()
+
+
+def fragment_latency(nobs: int, workdir: str, interactions: int = 20) -> pd.DataFrame:
+    """Percentiles of each tab fragment's time after ``interactions`` changes of its widget."""
+    session = DashboardSession(nobs, workdir)
+    trace = session.root / "profile.jsonl"
+    saved = {name: os.environ.get(name) for name in ("MES_PROFILE", "MES_PROFILE_FILE", "MES_PROFILE_MEMORY")}
+    try:
+        session.profile(trace)
+        rows = []
+        for tab, (kind, label, values) in TAB_ACTIONS.items():
+            # Two warm-up interactions cache both values
+            for _ in range(2):
+                session.interact(kind, label, values)
+            start = len(read_trace(trace))
+            for _ in range(interactions):
+                session.interact(kind, label, values)
+            seconds = [s["seconds"] for r in read_trace(trace)[start:] for s in r["sections"]
+                       if s["section"] == TAB_FRAGMENTS[tab]]
+            p50, p95 = np.percentile(seconds, [50, 95]) * 1e3
+            rows.append({"Tab": tab, "Fragment": TAB_FRAGMENTS[tab], "n": nobs, "Runs": len(seconds),
+                         "p50 (ms)": p50, "p95 (ms)": p95, "Max (ms)": max(seconds) * 1e3,
+                         "Target": "ok" if p95 < FRAGMENT_TARGET_MS else "over"})
+        return pd.DataFrame(rows)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def dashboard_cases(preset: Preset, workdir: str) -> list[Case]:
+    cases = []
+    for n in preset.dashboard_sizes:
+        session = DashboardSession(n, workdir)
+        cases += [
+            Case("dashboard/cold", session.start, {"n": n}, setup=session.cold, warmup=False),
+            Case("dashboard/restart", session.start, {"n": n}, setup=session.restart, warmup=False),
+            Case("dashboard/rerun", session.rerun, {"n": n}, setup=session.ensure),
+        ]
+        for tab, (kind, label, values) in TAB_ACTIONS.items():
+            run = lambda session=session, kind=kind, label=label, values=values: session.interact(kind, label, values)
+            cases.append(Case(f"dashboard/tab/{tab}", run, {"n": n}, setup=session.ensure))
+    return cases
@@ -0,0 +1,109 @@
+"""Timing loop, presets and JSON baselines."""
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+BASELINE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Preset:
+    sizes: tuple[int, ...]            # observations for the estimators and transforms
+    table_rows: tuple[int, ...]       # rows of the styled / exported tables
+    pipeline_sizes: tuple[int, ...]   # observations for the full pipeline
+    entities: tuple[int, ...]         # entities of 28 observations for the panel
+    dashboard_sizes: tuple[int, ...]  # observations of the workbook driven through AppTest
+    repeat: int = 5
+    budget: float = 2.0               # seconds of repetitions per case, after the first
+
+
+PRESETS = {
+    "quick": Preset(sizes=(28, 1_000, 10_000), table_rows=(20, 1_000), pipeline_sizes=(28, 200),
+                    entities=(1, 4), dashboard_sizes=(28,)),
+    "full": Preset(sizes=(28, 1_000, 10_000, 100_000), table_rows=(20, 1_000, 10_000),
+                   pipeline_sizes=(28, 200, 1_000), entities=(1, 10, 100, 500), dashboard_sizes=(28, 1_000),
+                   repeat=7, budget=5.0),
+}
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], object]
+    params: dict = field(default_factory=dict)
+    setup: Callable[[], None] | None = None     # before every repetition, not timed
+    warmup: bool = True
+
+    @property
+    def id(self) -> str:
+        args = ",".join(f"{k}={v}" for k, v in self.params.items())
+        return f"{self.name}[{args}]" if args else self.name
+
+
+def measure(case: Case, repeat: int, budget: float) -> dict:
+    """Best, median and mean wall time over up to ``repeat`` runs within ``budget`` seconds."""
+    if case.warmup:
+        if case.setup:
+            case.setup()
+        case.run()
+    times = []
+    while len(times) < repeat and (len(times) < 2 or sum(times[1:]) < budget):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times),
+            "repeats": len(times)}
+
+
+def environment() -> dict:
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_baseline(results: dict, path, preset: str) -> None:
+    payload = {"version": BASELINE_VERSION, "preset": preset, "environment": environment(), "results": results}
+    with open(path, "w") as fh:
+        json.dump(payload, fh, indent=2)
+
+
+def load_baseline(path) -> dict:
+    with open(path) as fh:
+        payload = json.load(fh)
+    if payload.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path}: baseline format {payload.get('version')}, expected {BASELINE_VERSION}")
+    return payload
+
+
+def compare(baseline: dict, results: dict, tolerance: float = 1.5, floor: float = 0.005) -> pd.DataFrame:
+    """Case-by-case ratio of best times; a slowdown beyond ``tolerance`` (and ``floor`` seconds) regresses."""
+    rows = []
+    for case_id in [*baseline, *(k for k in results if k not in baseline)]:
+        old, new = baseline.get(case_id), results.get(case_id)
+        if old is None or new is None:
+            status = "new" if old is None else "not run"
+            rows.append((case_id, old and old["min"], new and new["min"], np.nan, status))
+            continue
+        ratio = new["min"] / old["min"] if old["min"] > 0 else np.inf
+        if ratio > tolerance and new["min"] - old["min"] > floor:
+            status = "REGRESSION"
+        elif ratio < 1 / tolerance and old["min"] - new["min"] > floor:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((case_id, old["min"], new["min"], ratio, status))
+    return pd.DataFrame(rows, columns=["Case", "Baseline (s)", "Current (s)", "Ratio", "Status"])
@@ -0,0 +1,117 @@
+"""Micro-benchmarks of the transforms, table rendering, export and estimators.
+
+Every repetition starts from empty in-process caches with the result store
+disabled, so the timings are those of a computation, not of a lookup. The
+simulated bounds-test critical values stay in the on-disk cache, as they
+do in a deployment.
+"""
+import copy
+import os
+import tempfile
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from mes import ardl, bounds, diagnostics, unitroot
+from mes.ardl import ARDL_REGRESSORS, fit_ardl, search_ardl
+from mes.bootstrap import BootstrapConfig, bootstrap_ardl, bootstrap_system
+from mes.diagnostics import residual_tests
+from mes.downsample import downsample
+from mes.export import to_excel_bytes
+from mes.granger import granger_all_pairs
+from mes.panel import iter_panel
+from mes.pipeline import PipelineConfig, run_pipeline
+from mes.sls import build_system, fit_3sls
+from mes.streaming import RunningMoments
+from mes.styling import style_results_table
+from mes.transforms import prepare_data, safe_log
+from mes.unitroot import unit_root_battery
+
+from .harness import Case, Preset
+from .synthetic import prepared_data, synthetic_data, synthetic_panel, write_workbook
+
+ORDER = (2,) + (1,) * len(ARDL_REGRESSORS)
+
+
+def reset_caches() -> None:
+    """Forget in-process results and bypass the result store."""
+    os.environ["MES_STORE"] = "off"
+    ardl._SEARCH_CACHE.clear()
+    unitroot._CACHE.clear()
+    diagnostics._CACHE.clear()
+    bounds.critical_values.cache_clear()
+
+
+def results_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Coefficient table shaped like the ARDL and 3SLS outputs."""
+    rng = np.random.default_rng(seed)
+    coef = rng.normal(0, 1, rows)
+    se = rng.uniform(0.1, 1, rows)
+    return pd.DataFrame({"Variable": [f"x{i}" for i in range(rows)], "Coefficient": coef, "Std. Error": se,
+                         "t value": coef / se, "p-value": rng.uniform(0, 0.3, rows)})
+
+
+def _case(name, func, **params) -> Case:
+    return Case(name, func, params, setup=reset_caches)
+
+
+def _panel_workbook(entities: int, workdir: str) -> str:
+    path = os.path.join(workdir, f"panel{entities}.xlsx")
+    if not os.path.exists(path):
+        write_workbook(synthetic_panel(28, entities), path)
+    return path
+
+
+def _panel_setup(entities: int, workdir: str) -> None:
+    reset_caches()
+    _panel_workbook(entities, workdir)
+
+
+def _panel(entities: int, workdir: str) -> list:
+    # A fresh bundle directory per repetition, or later runs would only read bundles
+    root = tempfile.mkdtemp(dir=workdir, prefix="bundles-")
+    return list(iter_panel(_panel_workbook(entities, workdir), "country", PipelineConfig(), root))
+
+
+def _append(moments: RunningMoments, block: pd.DataFrame) -> RunningMoments:
+    return copy.deepcopy(moments).update(block)
+
+
+def micro_cases(preset: Preset, workdir: str) -> list[Case]:
+    cases = []
+    for n in preset.sizes:
+        raw, df = synthetic_data(n), prepared_data(n)
+        cases += [
+            _case("transforms/safe_log", partial(safe_log, raw["REM"]), n=n),
+            _case("transforms/prepare_data", partial(prepare_data, raw), n=n),
+            _case("ardl/fit_ardl", partial(fit_ardl, df, ORDER), n=n),
+            _case("ardl/search_ardl", partial(search_ardl, df, 2), n=n),
+            _case("granger/granger_all_pairs", partial(granger_all_pairs, df), n=n),
+            _case("sls/fit_3sls", lambda df=df: fit_3sls(build_system(df)), n=n),
+            _case("unitroot/unit_root_battery", partial(unit_root_battery, df, n_jobs=1), n=n),
+            _case("diagnostics/residual_tests", partial(residual_tests, fit_ardl(df, ORDER).resid), n=n),
+            _case("export/to_excel_bytes", partial(to_excel_bytes, {"Data": df}), n=n),
+            _case("downsample/lttb", partial(downsample, raw, "year", "REM"), n=n),
+            _case("streaming/moments", lambda df=df: RunningMoments(df.columns).update(df), n=n),
+            # One percent of new rows merged into the moments of the rest
+            _case("streaming/append", partial(_append, RunningMoments(df.columns).update(df.iloc[:-max(1, n // 100)]),
+                                              df.iloc[-max(1, n // 100):]), n=n),
+        ]
+    for rows in preset.table_rows:
+        cases.append(_case("styling/style_results_table",
+                           lambda table=results_table(rows): style_results_table(table).to_html(), rows=rows))
+
+    fit = fit_ardl(prepared_data(28), ORDER)
+    sls_fit = fit_3sls(build_system(prepared_data(28)))
+    cases += [
+        _case("bootstrap/bootstrap_ardl", partial(bootstrap_ardl, fit, BootstrapConfig(reps=2000), 1), reps=2000),
+        _case("bootstrap/bootstrap_system", partial(bootstrap_system, sls_fit, BootstrapConfig(reps=500), 1),
+              reps=500),
+    ]
+    for n in preset.pipeline_sizes:
+        cases.append(_case("pipeline/run_pipeline", partial(run_pipeline, prepared_data(n)), n=n))
+    for entities in preset.entities:
+        cases.append(Case("panel/iter_panel", partial(_panel, entities, workdir), {"entities": entities},
+                          setup=partial(_panel_setup, entities, workdir), warmup=False))
+    return cases
@@ -0,0 +1,52 @@
+"""Synthetic datasets with the columns and signs of ``base.xlsx``."""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from mes import EXPECTED_COLS, prepare_data
+
+# Starting level of the strictly positive series (they enter the models in logs)
+_LEVELS = {"REM": 2.0, "TC": 500.0, "FDI": 3.0, "OPEN": 60.0, "CREDIT": 8.0, "INV": 20.0,
+           "MIGSTOCK": 2e5, "HOSTGDP": 1e3}
+
+
+def _ar1(rng, n, mean, rho, sd):
+    return mean + signal.lfilter([1.0], [1.0, -rho], rng.normal(0.0, sd, n))
+
+
+def synthetic_entity(nobs: int, seed: int = 0) -> pd.DataFrame:
+    """One country: persistent AR(1) logs for the positive series, AR(1) growth and inflation.
+
+    Near-unit-root rather than random-walk logs keep 100k-year series finite.
+    """
+    rng = np.random.default_rng(seed)
+    data = {"year": 1995 + np.arange(nobs)}
+    for name, level in _LEVELS.items():
+        data[name] = np.exp(_ar1(rng, nobs, np.log(level), 0.97, 0.05))
+    data["GROWTH"] = _ar1(rng, nobs, 4.0, 0.5, 2.0)
+    data["INF"] = _ar1(rng, nobs, 3.0, 0.6, 2.5)
+    return pd.DataFrame(data)[EXPECTED_COLS]
+
+
+@lru_cache(maxsize=16)
+def synthetic_data(nobs: int, seed: int = 0) -> pd.DataFrame:
+    return synthetic_entity(nobs, seed)
+
+
+@lru_cache(maxsize=16)
+def prepared_data(nobs: int, seed: int = 0) -> pd.DataFrame:
+    return prepare_data(synthetic_data(nobs, seed))
+
+
+@lru_cache(maxsize=8)
+def synthetic_panel(nobs: int, entities: int, seed: int = 0) -> pd.DataFrame:
+    """``entities`` countries of ``nobs`` years each, stacked with a ``country`` column."""
+    frames = [synthetic_entity(nobs, seed + i).assign(country=f"C{i:03d}") for i in range(entities)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_workbook(df: pd.DataFrame, path) -> str:
+    df.to_excel(path, index=False)
+    return str(path)
@@ -0,0 +1,18 @@
+"""Estimation core for the ARDL/ECM + 3SLS dashboard."""
+from .transforms import EXPECTED_COLS, LOG_COLUMNS, missing_columns, prepare_data, safe_log
+from .sls import SYSTEM_EQUATIONS, SYSTEM_INSTRUMENTS, Equation, build_system, estimate_3sls, fit_3sls, system_tables
+
+__all__ = [
+    "EXPECTED_COLS",
+    "LOG_COLUMNS",
+    "SYSTEM_EQUATIONS",
+    "SYSTEM_INSTRUMENTS",
+    "Equation",
+    "build_system",
+    "estimate_3sls",
+    "fit_3sls",
+    "missing_columns",
+    "prepare_data",
+    "safe_log",
+    "system_tables",
+]
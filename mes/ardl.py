@@ -0,0 +1,295 @@
+"""ARDL lag-order search and the ARDL / ECM / long-run tables.
+
+Every candidate ARDL(p, q1, ..., qk) is a column subset of one maximal lag
+matrix estimated on a common sample, so the search only needs the Gram
+matrix of that matrix: each model's SSR comes from solving its Gram
+sub-block, and models with the same number of columns are solved together
+as one batched system.
+"""
+import itertools
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from scipy import linalg, stats
+
+from .cache import LRUCache, fingerprint
+from .parallel import parallel_map, resolve_jobs
+from .transforms import numeric_frame
+
+ARDL_DEPENDENT = "GROWTH"
+ARDL_REGRESSORS = ("logREM", "logINV", "logOPEN", "INF", "logCREDIT", "logTC", "logFDI")
+CONSTANT = "Constant"
+MIN_DF_RESID = 10
+
+_MIN_CHUNK = 512     # smaller chunks cost more in pickling than they save
+_BATCH_SIZE = 4096
+_SEARCH_CACHE = LRUCache(16)    # rankings of the last searches (data x max_lag)
+
+
+def lag_name(var: str, lag: int) -> str:
+    return var if lag == 0 else f"L({var},{lag})"
+
+
+def format_order(order) -> str:
+    return f"ARDL({','.join(str(int(o)) for o in order)})"
+
+
+@dataclass
+class LagMatrix:
+    """Dependent variable and all lags up to ``max_lag`` on a common sample."""
+    y: np.ndarray
+    X: np.ndarray                # y lags 1..max_lag, then x_j lags 0..max_lag
+    names: list[str]
+    index: pd.Index
+    max_lag: int
+
+
+def lag_matrix(df: pd.DataFrame, max_lag: int, dependent=ARDL_DEPENDENT, regressors=ARDL_REGRESSORS) -> LagMatrix:
+    frame = numeric_frame(df, [dependent, *regressors])
+    values = frame.to_numpy(dtype=float)
+    T = len(values)
+    if T <= max_lag + 1:
+        raise ValueError(f"{T} observations are not enough for lags up to {max_lag}")
+    cols, names = [], []
+    for i in range(1, max_lag + 1):
+        cols.append(values[max_lag - i:T - i, 0])
+        names.append(lag_name(dependent, i))
+    for j, x in enumerate(regressors, start=1):
+        for lag in range(max_lag + 1):
+            cols.append(values[max_lag - lag:T - lag, j])
+            names.append(lag_name(x, lag))
+    return LagMatrix(values[max_lag:, 0], np.column_stack(cols), names, frame.index[max_lag:], max_lag)
+
+
+def _column_mask(orders: np.ndarray, max_lag: int) -> np.ndarray:
+    """Boolean (models, columns) selection of the maximal lag matrix."""
+    lags = np.arange(max_lag + 1)
+    y_part = orders[:, :1] >= lags[None, 1:]
+    x_part = orders[:, 1:, None] >= lags[None, None, :]
+    return np.hstack([y_part, x_part.reshape(len(orders), -1)])
+
+
+def _batched_solve(A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.solve(A, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("mij,mj->mi", np.linalg.pinv(A), b)
+
+
+def _score_models(orders: np.ndarray, gram: np.ndarray, xty: np.ndarray, yty: float, max_lag: int) -> np.ndarray:
+    """SSR of every model in ``orders`` from sub-blocks of the Gram matrix."""
+    mask = _column_mask(orders, max_lag)
+    size = mask.sum(axis=1)
+    ssr = np.empty(len(orders))
+    for k in np.unique(size):
+        rows = np.flatnonzero(size == k)
+        for start in range(0, len(rows), _BATCH_SIZE):
+            batch = rows[start:start + _BATCH_SIZE]
+            idx = np.nonzero(mask[batch])[1].reshape(len(batch), k)
+            A = gram[idx[:, :, None], idx[:, None, :]]
+            b = xty[idx]
+            ssr[batch] = yty - np.einsum("mk,mk->m", b, _batched_solve(A, b))
+    return ssr
+
+
+def min_df_resid(n_params) -> np.ndarray | int:
+    """Residual degrees of freedom a specification must keep: 10, or half its parameters if more."""
+    return np.maximum(MIN_DF_RESID, np.asarray(n_params) // 2)
+
+
+def check_df_resid(fit: "ArdlFit") -> None:
+    """Reject a near-saturated fit, whose likelihood and bounds test are meaningless."""
+    floor = int(min_df_resid(len(fit.coef)))
+    if fit.df_resid < floor:
+        raise ValueError(f"{format_order(fit.order)} leaves {fit.df_resid} residual degrees of freedom "
+                         f"on {fit.nobs} observations, below the floor of {floor}")
+
+
+def candidate_orders(max_lag: int, n_regressors: int, nobs: int) -> np.ndarray:
+    """All (p, q1..qk) with p >= 1 keeping :func:`min_df_resid` residual degrees of freedom.
+
+    Without the floor, near-saturated models (one residual degree of
+    freedom on ~25 annual observations) win every likelihood criterion.
+    """
+    grid = itertools.product(range(1, max_lag + 1), *[range(max_lag + 1)] * n_regressors)
+    orders = np.array(list(grid), dtype=np.int64)
+    n_params = orders[:, 0] + (orders[:, 1:] + 1).sum(axis=1) + 1
+    return orders[nobs - n_params >= min_df_resid(n_params)]
+
+
+def search_ardl(df: pd.DataFrame, max_lag: int = 2, dependent=ARDL_DEPENDENT, regressors=ARDL_REGRESSORS,
+                criterion: str = "AIC", n_jobs: int | None = None) -> pd.DataFrame:
+    """Rank every ARDL lag combination up to ``max_lag`` by AIC or BIC.
+
+    The last searches are cached by a hash of the data and the search parameters.
+    """
+    regressors = tuple(regressors)
+    frame = numeric_frame(df, [dependent, *regressors])
+    key = fingerprint(frame, max_lag, dependent, regressors)
+    ranking = _SEARCH_CACHE.get(key, lambda: _run_search(frame, max_lag, dependent, regressors, n_jobs))
+    return ranking.sort_values(criterion, kind="stable").reset_index(drop=True)
+
+
+def _run_search(frame, max_lag, dependent, regressors, n_jobs) -> pd.DataFrame:
+    lm = lag_matrix(frame, max_lag, dependent, regressors)
+    n = len(lm.y)
+
+    # Centring absorbs the intercept; scaling keeps the Gram blocks well conditioned
+    X = lm.X - lm.X.mean(axis=0)
+    X /= np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+    yc = lm.y - lm.y.mean()
+    gram, xty, yty = X.T @ X, X.T @ yc, float(yc @ yc)
+
+    orders = candidate_orders(max_lag, len(regressors), n)
+    if not len(orders):
+        raise ValueError(f"no ARDL specification up to lag {max_lag} keeps {MIN_DF_RESID} residual degrees "
+                         f"of freedom on {n} observations")
+    # One chunk per worker, so --jobs takes effect on the default search too
+    size = max(_MIN_CHUNK, -(-len(orders) // resolve_jobs(n_jobs)))
+    chunks = [orders[i:i + size] for i in range(0, len(orders), size)]
+    score = partial(_score_models, gram=gram, xty=xty, yty=yty, max_lag=max_lag)
+    ssr = np.concatenate(parallel_map(score, chunks, n_jobs)) if chunks else np.empty(0)
+    ssr = np.maximum(ssr, np.finfo(float).tiny)
+
+    n_params = orders[:, 0] + (orders[:, 1:] + 1).sum(axis=1) + 1
+    loglik = -0.5 * n * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+    ranking = pd.DataFrame(orders, columns=[dependent, *regressors])
+    ranking.insert(0, "Model", [format_order(o) for o in orders])
+    ranking["k"] = n_params
+    ranking["logLik"] = loglik
+    ranking["AIC"] = -2 * loglik + 2 * (n_params + 1)
+    ranking["BIC"] = -2 * loglik + np.log(n) * (n_params + 1)
+    return ranking
+
+
+def best_order(ranking: pd.DataFrame, dependent=ARDL_DEPENDENT, regressors=ARDL_REGRESSORS) -> tuple[int, ...]:
+    return tuple(int(v) for v in ranking.iloc[0][[dependent, *regressors]])
+
+
+@dataclass
+class ArdlFit:
+    order: tuple[int, ...]
+    dependent: str
+    regressors: tuple[str, ...]
+    names: list[str]             # y lags, x lags, then the constant
+    coef: np.ndarray
+    cov: np.ndarray
+    resid: np.ndarray
+    X: np.ndarray
+    y: np.ndarray
+    index: pd.Index
+
+    @property
+    def nobs(self) -> int:
+        return len(self.y)
+
+    @property
+    def df_resid(self) -> int:
+        return self.nobs - len(self.coef)
+
+    def phi(self, coef=None) -> np.ndarray:
+        coef = self.coef if coef is None else coef
+        return coef[..., :self.order[0]]
+
+    def beta(self, j: int, coef=None) -> np.ndarray:
+        coef = self.coef if coef is None else coef
+        start = self.order[0] + sum(q + 1 for q in self.order[1:j + 1])
+        return coef[..., start:start + self.order[j + 1] + 1]
+
+
+def ardl_design(frame: pd.DataFrame, order, dependent=ARDL_DEPENDENT, regressors=ARDL_REGRESSORS):
+    """Regressor matrix (constant last) and names of one ARDL specification."""
+    max_lag = max(order)
+    lm = lag_matrix(frame, max_lag, dependent, regressors)
+    mask = _column_mask(np.asarray([order]), max_lag)[0]
+    X = np.column_stack([lm.X[:, mask], np.ones(len(lm.y))])
+    names = [name for name, keep in zip(lm.names, mask) if keep] + [CONSTANT]
+    return lm.y, X, names, lm.index
+
+
+def ols(y: np.ndarray, X: np.ndarray):
+    """QR least squares returning coefficients, covariance and residuals."""
+    Q, R = np.linalg.qr(X)
+    coef = linalg.solve_triangular(R, Q.T @ y)
+    resid = y - X @ coef
+    sigma2 = resid @ resid / (len(y) - X.shape[1])
+    R_inv = linalg.solve_triangular(R, np.eye(R.shape[0]))
+    return coef, sigma2 * R_inv @ R_inv.T, resid
+
+
+def fit_ardl(df: pd.DataFrame, order, dependent=ARDL_DEPENDENT, regressors=ARDL_REGRESSORS) -> ArdlFit:
+    regressors = tuple(regressors)
+    order = tuple(int(o) for o in order)
+    frame = numeric_frame(df, [dependent, *regressors])
+    y, X, names, index = ardl_design(frame, order, dependent, regressors)
+    coef, cov, resid = ols(y, X)
+    return ArdlFit(order, dependent, regressors, names, coef, cov, resid, X, y, index)
+
+
+def _coef_table(names, est, cov, df_resid, est_col="Coefficient") -> pd.DataFrame:
+    se = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = 2 * stats.t.sf(np.abs(est / se), df_resid)
+    return pd.DataFrame({"Variable": names, est_col: est, "Std. Error": se, "p-value": p})
+
+
+def ardl_table(fit: ArdlFit) -> pd.DataFrame:
+    return _coef_table(fit.names, fit.coef, fit.cov, fit.df_resid)
+
+
+def long_run_coefficients(fit: ArdlFit, coef=None) -> np.ndarray:
+    """theta_j = sum(beta_j) / (1 - sum(phi)); ``coef`` may carry leading batch axes."""
+    coef = fit.coef if coef is None else coef
+    denom = 1 - fit.phi(coef).sum(axis=-1)
+    return np.stack([fit.beta(j, coef).sum(axis=-1) for j in range(len(fit.regressors))], axis=-1) / denom[..., None]
+
+
+def long_run_table(fit: ArdlFit) -> pd.DataFrame:
+    theta = long_run_coefficients(fit)
+    denom = 1 - fit.phi().sum()
+    # Delta-method Jacobian of theta with respect to the ARDL coefficients
+    J = np.zeros((len(theta), len(fit.coef)))
+    p = fit.order[0]
+    J[:, :p] = (theta / denom)[:, None]
+    start = p
+    for j, q in enumerate(fit.order[1:]):
+        J[j, start:start + q + 1] = 1 / denom
+        start += q + 1
+    return _coef_table(list(fit.regressors), theta, J @ fit.cov @ J.T, fit.df_resid, "Coefficient (LR)")
+
+
+def ecm_transform(fit: ArdlFit) -> tuple[list[str], np.ndarray]:
+    """Linear map from the ARDL levels coefficients to the ECM short-run form."""
+    k = len(fit.coef)
+    rows, names = [], []
+    p = fit.order[0]
+    for i in range(1, p):
+        row = np.zeros(k)
+        row[i:p] = -1
+        rows.append(row)
+        names.append(f"d({lag_name(fit.dependent, i)})")
+    start = p
+    for x, q in zip(fit.regressors, fit.order[1:]):
+        for i in range(q):
+            row = np.zeros(k)
+            if i == 0:
+                row[start] = 1
+            else:
+                row[start + i + 1:start + q + 1] = -1
+            rows.append(row)
+            names.append(f"d({lag_name(x, i)})")
+        start += q + 1
+    ect = np.zeros(k)
+    ect[:p] = 1
+    const = np.zeros(k)
+    const[-1] = 1
+    return names + ["ect", CONSTANT], np.vstack(rows + [ect, const])
+
+
+def ecm_table(fit: ArdlFit) -> pd.DataFrame:
+    names, T = ecm_transform(fit)
+    est = T @ fit.coef
+    est[names.index("ect")] -= 1
+    return _coef_table(names, est, T @ fit.cov @ T.T, fit.df_resid)
@@ -0,0 +1,150 @@
+"""Residual and moving-block bootstrap for the 3SLS system and the ARDL.
+
+Replications are cut into fixed-size chunks, each with its own
+``SeedSequence`` child, and the chunks are spread over a process pool.
+Because the chunking does not depend on the number of workers, a given
+seed reproduces the same draws on any machine, and draws are kept in the
+shared result store keyed by the model data and the draw settings.
+"""
+from dataclasses import asdict, dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .ardl import ArdlFit, long_run_coefficients
+from .cache import fingerprint
+from .parallel import parallel_map
+from .sls import INTERCEPT, SystemFit, fit_3sls, structural_form
+from .store import stored
+
+CI_LOW = "Boot CI low"
+CI_HIGH = "Boot CI high"
+BOOT_SE = "Boot Std. Error"
+METHODS = ("residual", "block")
+
+DEFAULT_SEED = 12345
+_CHUNK_REPS = 250
+
+
+@dataclass(frozen=True)
+class BootstrapConfig:
+    reps: int = 2000
+    method: str = "residual"
+    block_length: int = 4
+    seed: int = DEFAULT_SEED
+    level: float = 0.95
+
+
+def resample_rows(rng: np.random.Generator, n: int, reps: int, method: str, block_length: int) -> np.ndarray:
+    """(reps, n) row indices for an i.i.d. or moving-block resample."""
+    if method == "residual":
+        return rng.integers(0, n, size=(reps, n))
+    if method == "block":
+        length = max(1, min(block_length, n))
+        n_blocks = -(-n // length)
+        starts = rng.integers(0, n - length + 1, size=(reps, n_blocks))
+        return (starts[:, :, None] + np.arange(length)).reshape(reps, -1)[:, :n]
+    raise ValueError(f"unknown bootstrap method {method!r}; expected one of {METHODS}")
+
+
+def draw_spec(config: BootstrapConfig, **extra) -> dict:
+    """Settings that determine the draws (the interval level only affects summaries)."""
+    return {**{k: v for k, v in asdict(config).items() if k != "level"}, **extra}
+
+
+def replication_chunks(config: BootstrapConfig) -> list[tuple[np.random.SeedSequence, int]]:
+    """(seed, reps) work units; the seeds are fixed by ``config`` whatever the number of workers."""
+    sizes = [min(_CHUNK_REPS, config.reps - start) for start in range(0, config.reps, _CHUNK_REPS)]
+    return list(zip(np.random.SeedSequence(config.seed).spawn(len(sizes)), sizes))
+
+
+def rescaled_residuals(resid: np.ndarray, n_params) -> np.ndarray:
+    """Centred residuals inflated by sqrt(n / (n - k)) to undo the fitting shrinkage."""
+    n = resid.shape[0]
+    return (resid - resid.mean(axis=0)) * np.sqrt(n / (n - np.asarray(n_params)))
+
+
+def _system_chunk(task, fit: SystemFit, config: BootstrapConfig) -> np.ndarray:
+    seed, reps = task
+    rng = np.random.default_rng(seed)
+    data = fit.data
+    B, Gamma = structural_form(fit)
+    solve = np.linalg.inv(np.eye(B.shape[0]) - B)
+    systematic = data.Z @ Gamma
+    resid = rescaled_residuals(fit.resid, np.array([X.shape[1] for X in data.X]))
+    rows = resample_rows(rng, data.nobs, reps, config.method, config.block_length)
+    draws = np.empty((reps, len(fit.coef)))
+    for r in range(reps):
+        # Rows are resampled jointly so the cross-equation correlation is kept
+        y_star = (systematic + resid[rows[r]]) @ solve
+        draws[r] = fit_3sls(data.with_dependents(y_star)).coef
+    return draws
+
+
+def bootstrap_system(fit: SystemFit, config: BootstrapConfig = BootstrapConfig(), n_jobs: int | None = None) -> np.ndarray:
+    """(reps, K) 3SLS coefficient draws, regenerating the endogenous block from the reduced form."""
+    func = partial(_system_chunk, fit=fit, config=config)
+    data = fit.data
+    return stored("bootstrap_system", fingerprint(data.y, data.Z, *data.X), draw_spec(config),
+                  lambda: {"draws": np.vstack(parallel_map(func, replication_chunks(config), n_jobs))})["draws"]
+
+
+def ardl_chunk(task, fit: ArdlFit, config: BootstrapConfig) -> np.ndarray:
+    """(reps, k) ARDL coefficient draws for one ``(seed, reps)`` unit of :func:`replication_chunks`."""
+    seed, reps = task
+    rng = np.random.default_rng(seed)
+    n, p = fit.nobs, fit.order[0]
+    phi = fit.phi()
+    fixed = fit.X[:, p:] @ fit.coef[p:]
+    resid = rescaled_residuals(fit.resid, len(fit.coef))
+    shocks = resid[resample_rows(rng, n, reps, config.method, config.block_length)]
+
+    # Recursion over time, vectorised over replications; the pre-sample keeps the observed values
+    path = np.empty((reps, p + n))
+    path[:, :p] = fit.X[0, :p][::-1]
+    for t in range(n):
+        recent = path[:, t:p + t][:, ::-1]          # y_{t-1}, ..., y_{t-p}
+        path[:, p + t] = fixed[t] + recent @ phi + shocks[:, t]
+    y_star = path[:, p:]
+    lags = [path[:, p - i:p - i + n] for i in range(1, p + 1)]
+    X_star = np.concatenate([np.stack(lags, axis=2), np.broadcast_to(fit.X[:, p:], (reps, n, fit.X.shape[1] - p))], axis=2)
+    Q, R = np.linalg.qr(X_star)
+    return np.linalg.solve(R, np.einsum("rnk,rn->rk", Q, y_star)[..., None])[..., 0]
+
+
+def bootstrap_ardl(fit: ArdlFit, config: BootstrapConfig = BootstrapConfig(), n_jobs: int | None = None) -> np.ndarray:
+    """(reps, k) ARDL coefficient draws from a recursive residual bootstrap with fixed regressors."""
+    func = partial(ardl_chunk, fit=fit, config=config)
+    return stored("bootstrap_ardl", fingerprint(fit.X, fit.y), draw_spec(config, order=fit.order),
+                  lambda: {"draws": np.vstack(parallel_map(func, replication_chunks(config), n_jobs))})["draws"]
+
+
+def summarize_draws(names, draws: np.ndarray, level: float = 0.95) -> pd.DataFrame:
+    """Bootstrap standard error and percentile interval per coefficient."""
+    alpha = (1 - level) / 2
+    low, high = np.nanquantile(draws, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({
+        "Variable": list(names),
+        BOOT_SE: np.nanstd(draws, axis=0, ddof=1),
+        CI_LOW: low,
+        CI_HIGH: high,
+    })
+
+
+def system_summaries(fit: SystemFit, draws: np.ndarray, level: float = 0.95) -> dict[str, pd.DataFrame]:
+    """Per-equation summaries keyed like :func:`mes.sls.system_tables`."""
+    bounds = np.cumsum([X.shape[1] for X in fit.data.X])[:-1]
+    return {
+        eq.name: summarize_draws([INTERCEPT, *eq.regressors], d, level)
+        for eq, d in zip(fit.data.equations, np.split(draws, bounds, axis=1))
+    }
+
+
+def long_run_summary(fit: ArdlFit, draws: np.ndarray, level: float = 0.95) -> pd.DataFrame:
+    return summarize_draws(fit.regressors, long_run_coefficients(fit, draws), level)
+
+
+def attach_summary(table: pd.DataFrame, summary: pd.DataFrame) -> pd.DataFrame:
+    """Add the bootstrap columns to a results table, matched on ``Variable``."""
+    return table.drop(columns=[BOOT_SE, CI_LOW, CI_HIGH], errors="ignore").merge(summary, on="Variable", how="left")
@@ -0,0 +1,158 @@
+"""Pesaran, Shin & Smith (2001) bounds test with simulated critical values.
+
+The F-statistic is the Wald test that the levels terms of the conditional
+ECM are jointly zero, computed directly from the ARDL fit (the UECM is a
+linear reparametrisation of the ARDL). Critical values are simulated for
+the actual sample size: every replication draws a random-walk dependent
+variable with pure I(0) or pure I(1) regressors, and all replications of a
+batch are solved as one stacked QR. Each (T, k, case) table is written to
+the on-disk cache so later sessions only read a small JSON file.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .ardl import ArdlFit
+from .cache import cache_dir
+
+LEVELS = (0.10, 0.05, 0.025, 0.01)
+DEFAULT_REPS = 20000
+DEFAULT_SEED = 20010501
+_BATCH_SIZE = 5000
+_BATCH_ELEMENTS = 2 ** 22   # draws per batch: long samples simulate fewer replications at a time
+
+# case -> (unrestricted deterministics, restricted deterministics), PSS numbering
+CASES = {
+    1: ((), ()),
+    2: ((), ("const",)),
+    3: (("const",), ()),
+    4: (("const",), ("trend",)),
+    5: (("const", "trend"), ()),
+}
+
+
+def bounds_f_stat(fit: ArdlFit, case: int = 3) -> float:
+    """F-test that the lagged levels (and restricted constant for case 2) are zero."""
+    if case not in (2, 3):
+        raise ValueError("bounds F from an ARDL with a constant supports cases 2 and 3")
+    n_coef = len(fit.coef)
+    rows = []
+    phi_row = np.zeros(n_coef)
+    phi_row[:fit.order[0]] = 1
+    rows.append(phi_row)
+    start = fit.order[0]
+    for q in fit.order[1:]:
+        row = np.zeros(n_coef)
+        row[start:start + q + 1] = 1
+        rows.append(row)
+        start += q + 1
+    target = [1.0] + [0.0] * len(fit.regressors)
+    if case == 2:
+        const_row = np.zeros(n_coef)
+        const_row[-1] = 1
+        rows.append(const_row)
+        target.append(0.0)
+    R = np.vstack(rows)
+    gap = R @ fit.coef - np.asarray(target)
+    wald = gap @ np.linalg.solve(R @ fit.cov @ R.T, gap)
+    return float(wald / len(gap))
+
+
+def _deterministics(names, T: int) -> np.ndarray:
+    cols = {"const": np.ones(T), "trend": np.arange(1, T + 1, dtype=float)}
+    return np.column_stack([cols[n] for n in names]) if names else np.empty((T, 0))
+
+
+def _simulate_f(T: int, k: int, case: int, integrated: bool, reps: int, rng: np.random.Generator) -> np.ndarray:
+    unrestricted, restricted = CASES[case]
+    D_u = _deterministics(unrestricted, T)
+    D_r = _deterministics(restricted, T)
+    m = 1 + k + D_r.shape[1]
+    out = np.empty(reps)
+    # Replications are drawn one after the other, so the batch size does not change the draws
+    batch = max(1, min(_BATCH_SIZE, _BATCH_ELEMENTS // ((T + 1) * (k + 1))))
+    for start in range(0, reps, batch):
+        R = min(batch, reps - start)
+        shocks = rng.standard_normal((R, T + 1, k + 1))
+        y = np.cumsum(shocks[:, :, 0], axis=1)
+        x = np.cumsum(shocks[:, :, 1:], axis=1) if integrated else shocks[:, :, 1:]
+        dy = np.diff(y, axis=1)
+        levels = np.concatenate([y[:, :-1, None], x[:, :-1]], axis=2)
+        X = np.concatenate([np.broadcast_to(D_u, (R, *D_u.shape)), levels,
+                            np.broadcast_to(D_r, (R, *D_r.shape))], axis=2)
+        Q, _ = np.linalg.qr(X)
+        proj = np.einsum("rtk,rt->rk", Q, dy)
+        ssr_u = np.einsum("rt,rt->r", dy, dy) - np.einsum("rk,rk->r", proj, proj)
+        if D_u.shape[1]:
+            Qd, _ = np.linalg.qr(D_u)
+            proj_r = dy @ Qd
+            ssr_r = np.einsum("rt,rt->r", dy, dy) - np.einsum("rk,rk->r", proj_r, proj_r)
+        else:
+            ssr_r = np.einsum("rt,rt->r", dy, dy)
+        out[start:start + R] = ((ssr_r - ssr_u) / m) / (ssr_u / (T - X.shape[2]))
+    return out
+
+
+@lru_cache(maxsize=64)
+def critical_values(T: int, k: int, case: int = 3, reps: int = DEFAULT_REPS, seed: int = DEFAULT_SEED) -> dict:
+    """``{level: (I(0) bound, I(1) bound)}`` for a sample of T observations and k regressors."""
+    if case not in CASES:
+        raise ValueError(f"unknown bounds-test case {case}")
+    path = cache_dir("bounds") / f"T{T}_k{k}_case{case}_r{reps}_s{seed}.json"
+    if path.exists():
+        try:
+            stored = json.loads(path.read_text())
+            return {float(level): tuple(bounds) for level, bounds in stored.items()}
+        except (OSError, ValueError, TypeError):
+            pass    # unreadable table (e.g. left by an older interrupted write): simulate again
+    rng = np.random.default_rng([seed, T, k, case])
+    quantiles = [1 - level for level in LEVELS]
+    lower = np.quantile(_simulate_f(T, k, case, False, reps, rng), quantiles)
+    upper = np.quantile(_simulate_f(T, k, case, True, reps, rng), quantiles)
+    table = {level: (float(lo), float(hi)) for level, lo, hi in zip(LEVELS, lower, upper)}
+    # Written whole then renamed: concurrent sessions never read a truncated table
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({str(level): bounds for level, bounds in table.items()}))
+    os.replace(tmp, path)
+    return table
+
+
+def critical_values_table(cv: dict) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Seuil": [f"{level:.1%}" for level in cv],
+        "I(0)": [b[0] for b in cv.values()],
+        "I(1)": [b[1] for b in cv.values()],
+    })
+
+
+def bounds_decision(f_stat: float, lower: float, upper: float) -> str:
+    if f_stat > upper:
+        return "✅ Cointégration"
+    if f_stat < lower:
+        return "❌ Pas de cointégration"
+    return "⚠️ Zone d'indétermination"
+
+
+def bounds_test(fit: ArdlFit, case: int = 3, level: float = 0.05, reps: int = DEFAULT_REPS,
+                seed: int = DEFAULT_SEED) -> tuple[pd.DataFrame, dict]:
+    """Bounds-test row in the dashboard's schema plus the full critical-value table."""
+    f_stat = bounds_f_stat(fit, case)
+    cv = critical_values(fit.nobs, len(fit.regressors), case, reps, seed)
+    lower, upper = cv[level]
+    row = pd.DataFrame({
+        "Test": ["Pesaran Bounds"],
+        "F-stat": [f_stat],
+        f"CV {level:.0%} I(0)": [lower],
+        f"CV {level:.0%} I(1)": [upper],
+        "Result": [bounds_decision(f_stat, lower, upper)],
+    })
+    return row, cv
+
+
+def asymptotic_f_pvalue(f_stat: float, fit: ArdlFit) -> float:
+    """Conventional F p-value of the levels restriction (not valid under I(1) regressors)."""
+    return float(stats.f.sf(f_stat, len(fit.regressors) + 1, fit.df_resid))
@@ -0,0 +1,146 @@
+"""Batch command line: ``python -m mes run data/*.xlsx --out bundles --jobs 4``.
+
+``python -m mes panel panel.xlsx --summary panel.csv`` estimates every
+country of a stacked workbook and prints each one as it finishes;
+``python -m mes store list|diff|evict`` inspects the shared result store;
+``python -m mes profile`` summarizes the dashboard's profiling trace.
+"""
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .panel import iter_panel, panel_table
+from .parallel import resolve_jobs
+from .pipeline import PipelineConfig, bundle_root, process_workbook
+from .profiling import read_trace, summarize_trace, trace_path
+from .store import result_store
+
+
+def _config(args) -> PipelineConfig:
+    return PipelineConfig(
+        ardl_max_lag=args.max_lag,
+        ardl_criterion=args.criterion,
+        granger_max_lag=args.granger_lag,
+        bounds_case=args.case,
+        n_jobs=1,
+    )
+
+
+def _run(args) -> int:
+    config = _config(args)
+    root = str(args.out or bundle_root())
+    jobs = min(resolve_jobs(args.jobs), len(args.workbooks))
+    failures = 0
+    if jobs <= 1:
+        results = []
+        for workbook in args.workbooks:
+            try:
+                results.append((workbook, process_workbook(workbook, config, root), None))
+            except Exception as exc:
+                results.append((workbook, None, exc))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(process_workbook, w, config, root): w for w in args.workbooks}
+            results = []
+            for future in as_completed(futures):
+                exc = future.exception()
+                results.append((futures[future], None if exc else future.result(), exc))
+    for workbook, path, exc in results:
+        if exc is None:
+            print(f"{workbook} -> {path}")
+        else:
+            failures += 1
+            print(f"{workbook}: {type(exc).__name__}: {exc}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def _panel(args) -> int:
+    root = str(args.out or bundle_root())
+    results = []
+    for result in iter_panel(args.workbook, args.entity, _config(args), root, n_jobs=args.jobs):
+        results.append(result)
+        if result.ok:
+            print(f"{result.entity} -> {result.path}")
+        else:
+            print(f"{result.entity}: {result.error}", file=sys.stderr)
+    if args.summary:
+        panel_table(results).to_csv(args.summary, index=False)
+    return 0 if all(r.ok for r in results) else 1
+
+
+def _store(args) -> int:
+    store = result_store()
+    if store is None:
+        print("result store disabled (MES_STORE=off)", file=sys.stderr)
+        return 1
+    if args.action == "list":
+        table = store.runs(args.kind)
+        print(table.to_string(index=False) if len(table) else f"no stored runs in {store.path}")
+    elif args.action == "diff":
+        if len(args.keys) != 2:
+            print("diff takes two run keys (or unambiguous prefixes)", file=sys.stderr)
+            return 2
+        print(store.diff(*args.keys).to_string(index=False))
+    else:
+        max_bytes = None if args.max_mb is None else int(args.max_mb * 2 ** 20)
+        print(f"{store.evict(max_bytes)} runs evicted")
+    return 0
+
+
+def _profile(args) -> int:
+    records = read_trace(args.file)
+    if not records:
+        print(f"no profiled runs in {args.file or trace_path()} (run the dashboard with MES_PROFILE=1)",
+              file=sys.stderr)
+        return 1
+    sessions = len({r["session"] for r in records})
+    print(f"{len(records)} runs in {sessions} sessions")
+    print(summarize_trace(records).head(args.top).to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    return 0
+
+
+def _add_model_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--out", help="bundle directory (default: $MES_BUNDLE_DIR or ./bundles)")
+    parser.add_argument("--max-lag", type=int, default=PipelineConfig.ardl_max_lag, help="maximum ARDL lag")
+    parser.add_argument("--criterion", choices=["AIC", "BIC"], default=PipelineConfig.ardl_criterion)
+    parser.add_argument("--granger-lag", type=int, default=PipelineConfig.granger_max_lag,
+                        help="maximum Granger lag")
+    parser.add_argument("--case", type=int, choices=[2, 3], default=PipelineConfig.bounds_case,
+                        help="bounds-test case")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m mes", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="estimate every model and write one result bundle per workbook")
+    run.add_argument("workbooks", nargs="+", help="input .xlsx files")
+    run.add_argument("--jobs", type=int, default=None, help="workbooks processed in parallel (default: all cores)")
+    _add_model_options(run)
+    run.set_defaults(func=_run)
+
+    panel = sub.add_parser("panel", help="estimate every entity of a stacked workbook, one bundle each")
+    panel.add_argument("workbook", help="input .xlsx file with an entity (country) column")
+    panel.add_argument("--entity", help="entity column (default: detected among country, iso3c, ...)")
+    panel.add_argument("--jobs", type=int, default=None, help="entities processed in parallel (default: all cores)")
+    panel.add_argument("--summary", help="write the cross-entity comparison table to this CSV file")
+    _add_model_options(panel)
+    panel.set_defaults(func=_panel)
+
+    store = sub.add_parser("store", help="list, compare or evict runs of the shared result store")
+    store.add_argument("action", choices=["list", "diff", "evict"])
+    store.add_argument("keys", nargs="*", help="two run keys (or prefixes) for diff")
+    store.add_argument("--kind", help="only list runs of this kind (bundle, bootstrap_ardl, forecast, ...)")
+    store.add_argument("--max-mb", type=float, help="evict down to this size (default: $MES_STORE_MAX_MB)")
+    store.set_defaults(func=_store)
+
+    profile = sub.add_parser("profile", help="slowest sections of the dashboard's profiling trace")
+    profile.add_argument("--file", help="trace file (default: $MES_PROFILE_FILE or profile.jsonl in the cache)")
+    profile.add_argument("--top", type=int, default=20, help="sections listed (default: 20)")
+    profile.set_defaults(func=_profile)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,114 @@
+"""Columnar, memory-mapped cache of the input workbooks.
+
+A workbook is parsed with openpyxl once, passed through
+:func:`mes.transforms.prepare_data` when it has the expected columns, and
+written as one ``.npy`` file per column. Later loads memory-map those files
+and wrap them in a DataFrame without copying, so reruns neither parse the
+workbook nor recompute the log transforms. Text columns are stored as
+fixed-width strings plus a mask of their missing cells.
+
+Entries are addressed in two steps: a cheap stat key (path, size, mtime)
+points to the content hash of the file, and the columns live under that
+content hash. Touching a file therefore costs one re-hash, not a re-parse.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import cache_dir
+from .transforms import missing_columns, prepare_data
+
+_HASH_BLOCK = 1 << 20
+_LAYOUT = 2     # bumped when the column files change meaning
+
+
+def _stat_key(path: Path) -> str:
+    st = path.stat()
+    return hashlib.sha1(f"{path.resolve()}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()
+
+
+def file_hash(path: str | os.PathLike) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def dataset_version(path: str | os.PathLike) -> str:
+    """Content hash of a workbook, served from the stat index when the file is unchanged."""
+    path = Path(path)
+    pointer = cache_dir("data", "stat") / f"{_stat_key(path)}.json"
+    if pointer.exists():
+        return json.loads(pointer.read_text())["version"]
+    version = file_hash(path)
+    # Written whole then renamed: concurrent sessions never read a truncated pointer
+    tmp = pointer.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": version, "source": str(path.resolve())}))
+    os.replace(tmp, pointer)
+    return version
+
+
+def _write_columns(df: pd.DataFrame, target: Path, meta: dict) -> None:
+    tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=".ingest-"))
+    try:
+        columns, masked = [], []
+        for i, name in enumerate(df.columns):
+            values = df[name]
+            if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+                arr = values.to_numpy()
+            else:
+                missing = values.isna().to_numpy()
+                arr = values.where(~missing, "").astype(str).to_numpy(dtype=str)
+                if missing.any():
+                    np.save(tmp / f"{i}.na.npy", missing, allow_pickle=False)
+                    masked.append(i)
+            np.save(tmp / f"{i}.npy", arr, allow_pickle=False)
+            columns.append(str(name))
+        meta = {**meta, "columns": columns, "masked": masked, "nrows": len(df)}
+        (tmp / "meta.json").write_text(json.dumps(meta))
+        try:
+            tmp.rename(target)
+        except OSError:
+            # Another process finished the same ingest first
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def ingest(path: str | os.PathLike, sheet_name=0) -> Path:
+    """Convert a workbook to the columnar cache (once) and return its directory."""
+    path = Path(path)
+    version = dataset_version(path)
+    target = cache_dir("data", "columns") / f"{version}-{sheet_name}-v{_LAYOUT}"
+    if not (target / "meta.json").exists():
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        prepared = not missing_columns(df)
+        if prepared:
+            df = prepare_data(df)
+        _write_columns(df, target, {"version": version, "source": str(path), "prepared": prepared})
+    return target
+
+
+def load_columns(target: Path) -> pd.DataFrame:
+    """Memory-map a cached entry into a DataFrame backed by read-only arrays."""
+    meta = json.loads((target / "meta.json").read_text())
+    data = {name: np.load(target / f"{i}.npy", mmap_mode="r") for i, name in enumerate(meta["columns"])}
+    df = pd.DataFrame(data, copy=False)
+    for i in meta.get("masked", []):
+        name = meta["columns"][i]
+        df[name] = df[name].where(~np.load(target / f"{i}.na.npy"))
+    df.attrs["version"] = meta["version"]
+    return df
+
+
+def load_dataset(path: str | os.PathLike, sheet_name=0) -> pd.DataFrame:
+    """Prepared data of a workbook, parsed at most once per content version."""
+    return load_columns(ingest(path, sheet_name))
@@ -0,0 +1,126 @@
+"""Residual diagnostics: zero mean, ARCH effects, autocorrelation and normality.
+
+Every test runs along the last axis of a ``(..., n)`` residual array, so one
+call covers a single model, the equations of the system, bootstrap draws
+or rolling windows alike. Box-Pierce and Ljung-Box share one FFT-based
+autocorrelation function and the ARCH LM auxiliary regressions are solved
+as one batched QR. Defaults reproduce R's ``wilcox.test``, ``t.test``,
+``FinTS::ArchTest(lags = 6)``, ``Box.test(lag = 6)``,
+``nortest::lillie.test`` and ``shapiro.test``.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .cache import LRUCache, fingerprint
+
+DIAGNOSTIC_TESTS = ("Wilcoxon", "t-test", "ARCH LM", "Box-Pierce", "Ljung-Box", "Lilliefors", "Shapiro-Wilk")
+DEFAULT_LAGS = 6
+LEVEL = 0.05
+
+_CACHE = LRUCache(64)    # per model, bootstrap batch or set of rolling windows
+
+
+def acf(x: np.ndarray, max_lag: int) -> np.ndarray:
+    """Sample autocorrelations at lags 0..max_lag along the last axis, via one FFT per series."""
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    x = x - x.mean(axis=-1, keepdims=True)
+    size = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    spec = np.fft.rfft(x, size, axis=-1)
+    acov = np.fft.irfft(spec * spec.conj(), size, axis=-1)[..., :max_lag + 1]
+    return acov / acov[..., :1]
+
+
+def box_tests(resid: np.ndarray, lags: int = DEFAULT_LAGS):
+    """Box-Pierce and Ljung-Box statistics and p-values from a shared ACF."""
+    n = resid.shape[-1]
+    rho2 = acf(resid, lags)[..., 1:] ** 2
+    bp = n * rho2.sum(axis=-1)
+    lb = n * (n + 2) * (rho2 / (n - np.arange(1, lags + 1))).sum(axis=-1)
+    return bp, stats.chi2.sf(bp, lags), lb, stats.chi2.sf(lb, lags)
+
+
+def arch_lm(resid: np.ndarray, lags: int = DEFAULT_LAGS):
+    """Engle's LM test: ``(n - lags) R^2`` of the squared residuals on their own lags."""
+    e2 = resid ** 2
+    n = e2.shape[-1]
+    y = e2[..., lags:]
+    X = np.stack([np.ones_like(y)] + [e2[..., lags - i:n - i] for i in range(1, lags + 1)], axis=-1)
+    Q, _ = np.linalg.qr(X)
+    fitted = np.einsum("...ij,...j->...i", Q, np.einsum("...ij,...i->...j", Q, y))
+    ssr = ((y - fitted) ** 2).sum(axis=-1)
+    sst = ((y - y.mean(axis=-1, keepdims=True)) ** 2).sum(axis=-1)
+    stat = (n - lags) * (1 - ssr / sst)
+    return stat, stats.chi2.sf(stat, lags)
+
+
+def lilliefors(resid: np.ndarray):
+    """Kolmogorov-Smirnov distance to the fitted normal, Dallal-Wilkinson p-value as in nortest."""
+    n = resid.shape[-1]
+    x = np.sort(resid, axis=-1)
+    F = stats.norm.cdf((x - x.mean(axis=-1, keepdims=True)) / x.std(axis=-1, ddof=1, keepdims=True))
+    i = np.arange(1, n + 1)
+    K = np.maximum((i / n - F).max(axis=-1), (F - (i - 1) / n).max(axis=-1))
+    Kd, nd = (K, n) if n <= 100 else (K * (n / 100) ** 0.49, 100)
+    p = np.exp(-7.01256 * Kd ** 2 * (nd + 2.78019) + 2.99587 * Kd * np.sqrt(nd + 2.78019)
+               - 0.122119 + 0.974598 / np.sqrt(nd) + 1.67997 / nd)
+    KK = (np.sqrt(n) - 0.01 + 0.85 / np.sqrt(n)) * K
+    large = np.select(
+        [KK <= 0.302, KK <= 0.5, KK <= 0.9, KK <= 1.31],
+        [np.ones_like(KK),
+         np.polyval([81.218052, -138.55152, 80.709644, -19.828315, 2.76773], KK),
+         np.polyval([-32.355711, 94.029866, -97.490286, 40.662806, -4.901232], KK),
+         np.polyval([2.423045, -12.234627, 23.186922, -19.558097, 6.198765], KK)],
+        0.0,
+    )
+    return K, np.where(p > 0.1, large, p)
+
+
+def _run(resid: np.ndarray, lags: int):
+    wilcoxon = stats.wilcoxon(resid, axis=-1)
+    ttest = stats.ttest_1samp(resid, 0.0, axis=-1)
+    arch = arch_lm(resid, lags)
+    bp, p_bp, lb, p_lb = box_tests(resid, lags)
+    lillie = lilliefors(resid)
+    # shapiro only takes an axis argument in recent SciPy releases
+    flat = resid.reshape(-1, resid.shape[-1])
+    shapiro = np.array([tuple(stats.shapiro(r)) for r in flat]).reshape(*resid.shape[:-1], 2)
+    statistic = np.stack([wilcoxon.statistic, ttest.statistic, arch[0], bp, lb, lillie[0], shapiro[..., 0]], axis=-1)
+    pvalue = np.stack([wilcoxon.pvalue, ttest.pvalue, arch[1], p_bp, p_lb, lillie[1], shapiro[..., 1]], axis=-1)
+    return statistic, pvalue
+
+
+def residual_tests(resid: np.ndarray, lags: int = DEFAULT_LAGS) -> tuple[np.ndarray, np.ndarray]:
+    """(..., 7) statistics and p-values in :data:`DIAGNOSTIC_TESTS` order; recent calls are cached by residual hash."""
+    resid = np.asarray(resid, dtype=float)
+    if resid.shape[-1] <= 2 * lags + 2:
+        raise ValueError(f"{resid.shape[-1]} residuals are too few for {lags} lags")
+    key = fingerprint(resid, lags)
+    return _CACHE.get(key, lambda: _run(resid, lags))
+
+
+def diagnostic_pvalues(resid: np.ndarray, labels=None, lags: int = DEFAULT_LAGS) -> pd.DataFrame:
+    """One row of p-values per residual series of a 2-D ``(series, n)`` array."""
+    resid = np.atleast_2d(resid)
+    _, pvalue = residual_tests(resid, lags)
+    return pd.DataFrame(pvalue, index=labels, columns=list(DIAGNOSTIC_TESTS))
+
+
+def diagnostics_table(resid: np.ndarray, lags: int = DEFAULT_LAGS, level: float = LEVEL) -> pd.DataFrame:
+    """Test, statistic, p-value and status for the residuals of one model."""
+    statistic, pvalue = residual_tests(np.ravel(resid), lags)
+    return pd.DataFrame({
+        "Test": list(DIAGNOSTIC_TESTS),
+        "Statistic": statistic,
+        "p-value": pvalue,
+        "Status": np.where(pvalue >= level, "✅", "❌"),
+    })
+
+
+def diagnostics_verdict(table: pd.DataFrame) -> tuple[bool, str]:
+    """Overall verdict of a diagnostics table and the message shown with it."""
+    failed = table.loc[table["Status"] != "✅", "Test"].tolist()
+    if not failed:
+        return True, "✅ **Tous les diagnostics OK** - Résidus proches du bruit blanc"
+    return False, f"⚠️ **Hypothèses rejetées à 5 %** : {', '.join(failed)}"
@@ -0,0 +1,52 @@
+"""Largest-Triangle-Three-Buckets downsampling of long series for plotting.
+
+LTTB keeps the first and last points and, in each of ``n_out - 2`` equal
+buckets, the point forming the largest triangle with the point kept in the
+previous bucket and the mean of the next bucket, so peaks and troughs
+survive a reduction to a few thousand points. Plotted through a window,
+the reduction only applies while the window holds more than ``n_out``
+points: a narrow enough window shows the series at full resolution.
+"""
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 2_000
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Sorted indices of the ``n_out`` points kept (all of them when there are no more)."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n) if n_out >= n else np.linspace(0, n - 1, max(n_out, 0)).astype(int)
+    # Bucket b (0-based) covers [edges[b], edges[b + 1]); the first and last points are kept apart
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / sizes
+    # The last bucket looks ahead to the last point
+    next_x, next_y = np.append(mean_x[1:], x[-1]), np.append(mean_y[1:], y[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - next_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[b + 1] = a
+    return kept
+
+
+def downsample(frame: pd.DataFrame, x: str, y: str, n_out: int = MAX_POINTS, window=None) -> pd.DataFrame:
+    """Rows of ``frame[[x, y]]`` inside ``window`` (inclusive bounds on ``x``), reduced to ``n_out`` by LTTB."""
+    data = frame[[x, y]].dropna()
+    if window is not None:
+        data = data[(data[x] >= window[0]) & (data[x] <= window[1])]
+    data = data.sort_values(x, kind="stable")
+    if len(data) <= n_out:
+        return data
+    xs = data[x].to_numpy()
+    xs = xs.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(xs.dtype, np.datetime64) else xs
+    return data.iloc[lttb(xs, data[y].to_numpy(), n_out)]
@@ -0,0 +1,120 @@
+"""Streaming export of result tables to xlsx, zipped CSV or zipped Parquet.
+
+Every writer walks the tables in row chunks and writes straight into the
+target file object, so the writer never holds a second copy of the
+tables: xlsx through openpyxl's write-only mode, CSV and Parquet as
+members of a zip archive. :func:`cached_export` streams to a file in the
+on-disk cache, so the finished file is not kept in the process either.
+Parquet needs the optional ``pyarrow`` dependency.
+"""
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import cache_dir
+
+CHUNK_ROWS = 50_000
+KEEP_EXPORTS = 8
+FORMATS = {
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv.zip", "application/zip"),
+    "parquet": ("parquet.zip", "application/zip"),
+}
+
+
+def available_formats() -> list[str]:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return ["xlsx", "csv"]
+    return list(FORMATS)
+
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
+
+
+def _write_xlsx(sheets: dict[str, pd.DataFrame], fileobj) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, df_ in sheets.items():
+        ws = wb.create_sheet(title=name[:31])
+        ws.append([str(c) for c in df_.columns])
+        for chunk in _chunks(df_):
+            # tolist() yields Python scalars, which openpyxl writes without type sniffing
+            columns = [col.tolist() for _, col in chunk.astype(object).where(chunk.notna(), None).items()]
+            for row in zip(*columns):
+                ws.append(row)
+    wb.save(fileobj)
+
+
+def _write_csv_zip(sheets: dict[str, pd.DataFrame], fileobj) -> None:
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, df_ in sheets.items():
+            with zf.open(f"{name}.csv", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as fh:
+                for i, chunk in enumerate(_chunks(df_)):
+                    chunk.to_csv(fh, index=False, header=i == 0)
+                if df_.empty:
+                    df_.to_csv(fh, index=False)
+
+
+def _write_parquet_zip(sheets: dict[str, pd.DataFrame], fileobj) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_STORED) as zf:
+        for name, df_ in sheets.items():
+            schema = pa.Schema.from_pandas(df_, preserve_index=False)
+            with zf.open(f"{name}.parquet", "w") as fh, pq.ParquetWriter(fh, schema) as writer:
+                for chunk in _chunks(df_):
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+_WRITERS = {"xlsx": _write_xlsx, "csv": _write_csv_zip, "parquet": _write_parquet_zip}
+
+
+def write_export(sheets: dict[str, pd.DataFrame], fmt: str, fileobj) -> None:
+    """Stream ``sheets`` to a binary file object in one of :data:`FORMATS`."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {list(FORMATS)}")
+    _WRITERS[fmt](sheets, fileobj)
+
+
+def export_file(sheets: dict[str, pd.DataFrame], fmt: str, path: str | os.PathLike) -> Path:
+    """Stream ``sheets`` to ``path``, written whole then renamed so readers never see a partial file."""
+    path = Path(path)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as fh:
+            write_export(sheets, fmt, fh)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def cached_export(sheets: dict[str, pd.DataFrame], fmt: str, key: str) -> Path:
+    """Export file of ``sheets`` under ``key``, written once; only the newest :data:`KEEP_EXPORTS` are kept."""
+    folder = cache_dir("exports")
+    path = folder / f"{key[:16]}.{FORMATS[fmt][0]}"
+    if not path.exists():
+        export_file(sheets, fmt, path)
+        done = [p for p in folder.iterdir() if p.suffix != ".tmp"]
+        for old in sorted(done, key=lambda p: p.stat().st_mtime, reverse=True)[KEEP_EXPORTS:]:
+            old.unlink(missing_ok=True)
+    return path
+
+
+def export_bytes(sheets: dict[str, pd.DataFrame], fmt: str) -> bytes:
+    output = io.BytesIO()
+    write_export(sheets, fmt, output)
+    return output.getvalue()
+
+
+def to_excel_bytes(sheets: dict[str, pd.DataFrame]) -> bytes:
+    return export_bytes(sheets, "xlsx")
@@ -0,0 +1,97 @@
+"""Simulated multi-step forecasts of the ARDL/ECM dependent variable.
+
+The ECM is a reparametrization of the levels ARDL, so its dynamics are
+the linear recursion ``phi(L) y_t = u_t`` with ``u_t`` the constant plus the
+distributed lags of the regressors plus a shock. Regressors are held at
+their last observed values (their lags still use the observed history),
+which makes the forecast converge to the long-run equilibrium of the ECM.
+Shocks are drawn by resampling the rescaled residuals and every path is
+filtered at once with ``scipy.signal.lfilter`` along the horizon axis of a
+(paths, horizon) array, and the paths are kept in the shared result store.
+Parameter uncertainty is not simulated.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from .ardl import ArdlFit
+from .bootstrap import rescaled_residuals
+from .cache import fingerprint
+from .store import stored
+from .transforms import numeric_frame
+
+DEFAULT_PATHS = 20000
+DEFAULT_HORIZON = 8
+DEFAULT_SEED = 2022
+FAN_LEVELS = (0.5, 0.8, 0.9)
+
+
+@dataclass
+class Forecast:
+    steps: np.ndarray            # (h,) labels of the forecast periods
+    point: np.ndarray            # (h,) path without shocks
+    paths: np.ndarray            # (S, h) simulated paths
+    equilibrium: float           # long-run level implied by the last regressor values
+    last: float                  # last observed value
+
+    def bands(self, levels=FAN_LEVELS) -> pd.DataFrame:
+        """Point path, median and central intervals (``Low 90%``, ``High 90%``, ...) per step."""
+        table = pd.DataFrame({"Step": self.steps, "Forecast": self.point,
+                              "Median": np.median(self.paths, axis=0)})
+        for level in levels:
+            lo, hi = np.quantile(self.paths, [(1 - level) / 2, (1 + level) / 2], axis=0)
+            table[f"Low {level:.0%}"] = lo
+            table[f"High {level:.0%}"] = hi
+        return table
+
+
+def _deterministic(fit: ArdlFit, x_hist: np.ndarray, horizon: int) -> np.ndarray:
+    """Constant plus regressor contribution for steps 1..horizon, regressors frozen at their last values."""
+    det = np.full(horizon, fit.coef[-1])
+    for j in range(len(fit.regressors)):
+        beta = fit.beta(j)
+        for lag, b in enumerate(beta):
+            # x_{T+h-lag}: observed while h <= lag, last value afterwards
+            h = np.arange(1, horizon + 1)
+            source = np.minimum(h - lag, 0) - 1
+            det += b * x_hist[source, j]
+    return det
+
+
+def ecm_forecast(fit: ArdlFit, df: pd.DataFrame, horizon: int = DEFAULT_HORIZON, n_paths: int = DEFAULT_PATHS,
+                 seed: int = DEFAULT_SEED, steps=None) -> Forecast:
+    """Simulate ``n_paths`` forecast paths of ``fit.dependent`` over ``horizon`` periods.
+
+    Paths are stored by data, model order, horizon, number of paths and seed.
+    """
+    frame = numeric_frame(df, [fit.dependent, *fit.regressors])
+    steps = np.arange(1, horizon + 1) if steps is None else np.asarray(steps)
+    spec = {"order": fit.order, "horizon": horizon, "n_paths": n_paths, "seed": seed}
+    items = stored("forecast", fingerprint(frame, fit.coef, fit.resid), spec,
+                   lambda: _simulate(fit, frame, horizon, n_paths, seed))
+    return Forecast(steps, items["point"], items["paths"], float(items["equilibrium"]), float(items["last"]))
+
+
+def _simulate(fit, frame, horizon, n_paths, seed) -> dict:
+    values = frame.to_numpy(dtype=float)
+    y_hist, x_hist = values[:, 0], values[:, 1:]
+    p = fit.order[0]
+    phi = fit.phi()
+    a = np.concatenate([[1.0], -phi])
+
+    det = _deterministic(fit, x_hist, horizon)
+    # Initial state from the last p observations, most recent first
+    zi = signal.lfiltic([1.0], a, y_hist[::-1][:p])
+    point = signal.lfilter([1.0], a, det, zi=zi)[0]
+
+    rng = np.random.default_rng(seed)
+    resid = rescaled_residuals(fit.resid, len(fit.coef))
+    shocks = rng.choice(resid, size=(n_paths, horizon))
+    paths = signal.lfilter([1.0], a, det[None, :] + shocks, axis=1, zi=np.broadcast_to(zi, (n_paths, p)))[0]
+
+    denom = 1 - phi.sum()
+    level = fit.coef[-1] + sum(fit.beta(j).sum() * x_hist[-1, j] for j in range(len(fit.regressors)))
+    equilibrium = level / denom if abs(denom) > 1e-12 else np.nan
+    return {"point": point, "paths": paths, "equilibrium": np.float64(equilibrium), "last": y_hist[-1]}
@@ -0,0 +1,81 @@
+"""Granger causality F-tests for every ordered pair of variables.
+
+For a given lag order all unrestricted regressions (one per ordered pair)
+share the same shape, so they are stacked and solved with one batched QR;
+the restricted regressions only depend on the effect variable and are
+solved once per variable.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .ardl import ARDL_DEPENDENT, ARDL_REGRESSORS
+
+GRANGER_VARIABLES = (ARDL_DEPENDENT, *ARDL_REGRESSORS, "MIGSTOCK", "HOSTGDP")
+
+
+def _batched_ssr(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Residual sums of squares of the stacked regressions y[b] ~ X[b]."""
+    Q, _ = np.linalg.qr(X)
+    proj = np.einsum("bnk,bn->bk", Q, y)
+    return np.einsum("bn,bn->b", y, y) - np.einsum("bk,bk->b", proj, proj)
+
+
+def granger_lag(values: np.ndarray, lag: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """F, p-value and residual df for all ordered pairs at one lag.
+
+    ``values`` is (T, v); the returned F and p-value arrays are (v, v) indexed
+    as [cause, effect] with NaN on the diagonal.
+    """
+    T, v = values.shape
+    n = T - lag
+    dof = n - 1 - 2 * lag
+    if dof < 1:
+        raise ValueError(f"{T} observations are not enough for Granger tests at lag {lag}")
+    lags = np.stack([values[lag - i:T - i] for i in range(1, lag + 1)], axis=2)   # (n, v, lag)
+    y = values[lag:].T                                                             # (v, n)
+    ones = np.ones((n, 1))
+
+    own = np.concatenate([np.broadcast_to(ones, (v, n, 1)), lags.transpose(1, 0, 2)], axis=2)
+    ssr_r = _batched_ssr(own, y)
+
+    cause, effect = np.nonzero(~np.eye(v, dtype=bool))
+    X_u = np.concatenate([own[effect], lags.transpose(1, 0, 2)[cause]], axis=2)
+    ssr_u = _batched_ssr(X_u, y[effect])
+
+    F = np.full((v, v), np.nan)
+    F[cause, effect] = ((ssr_r[effect] - ssr_u) / lag) / (ssr_u / dof)
+    p = np.full((v, v), np.nan)
+    p[cause, effect] = stats.f.sf(F[cause, effect], lag, dof)
+    return F, p, dof
+
+
+def granger_all_pairs(df: pd.DataFrame, variables=GRANGER_VARIABLES, max_lag: int = 4) -> pd.DataFrame:
+    """Long table of Granger tests (Cause, Effect, Lag, F, p-value) for lags 1..max_lag."""
+    variables = list(variables)
+    values = df[variables].apply(pd.to_numeric, errors="coerce").dropna().to_numpy(dtype=float)
+    frames = []
+    for lag in range(1, max_lag + 1):
+        F, p, dof = granger_lag(values, lag)
+        cause, effect = np.nonzero(~np.isnan(F))
+        frames.append(pd.DataFrame({
+            "Cause": np.asarray(variables)[cause],
+            "Effect": np.asarray(variables)[effect],
+            "Lag": lag,
+            "F": F[cause, effect],
+            "df": dof,
+            "p-value": p[cause, effect],
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def granger_matrix(results: pd.DataFrame, value: str = "p-value") -> pd.DataFrame:
+    """Pair x lag matrix of ``value`` suitable for a heatmap."""
+    pairs = results["Cause"] + " → " + results["Effect"]
+    return results.assign(Pair=pairs).pivot(index="Pair", columns="Lag", values=value)
+
+
+def granger_target(results: pd.DataFrame, effect: str, lag: int) -> pd.DataFrame:
+    """Tests of every variable causing ``effect`` at one lag, in the dashboard's schema."""
+    rows = results[(results["Effect"] == effect) & (results["Lag"] == lag)]
+    return rows.rename(columns={"Cause": "Variable"})[["Variable", "F", "p-value"]].reset_index(drop=True)
@@ -0,0 +1,82 @@
+"""Dynamic and cumulative multipliers of the ARDL regressors.
+
+The response of ``y`` to a unit change in ``x_j`` is the expansion of
+``beta_j(L) / phi(L)``: filtering the coefficient sequences of every
+``beta_j(L)`` through ``1 / phi(L)`` gives all impulse responses in one
+call, and their cumulative sums converge to the long-run coefficients.
+For bootstrap draws each replication has its own ``phi(L)``, so the same
+recursion runs over the horizon, vectorized over draws and regressors;
+replication chunks are drawn and converted in the process pool, and the
+draws are kept in the shared result store.
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from .ardl import ArdlFit
+from .bootstrap import BootstrapConfig, ardl_chunk, draw_spec, replication_chunks
+from .cache import fingerprint
+from .parallel import parallel_map
+from .store import stored
+
+DEFAULT_HORIZON = 10
+
+
+def _beta_sequences(fit: ArdlFit, coef: np.ndarray, horizon: int) -> np.ndarray:
+    """(..., k, horizon + 1) distributed-lag coefficients, zero beyond each lag order."""
+    seq = np.zeros(coef.shape[:-1] + (len(fit.regressors), horizon + 1))
+    for j in range(len(fit.regressors)):
+        beta = fit.beta(j, coef)[..., :horizon + 1]
+        seq[..., j, :beta.shape[-1]] = beta
+    return seq
+
+
+def dynamic_multipliers(fit: ArdlFit, horizon: int = DEFAULT_HORIZON, coef: np.ndarray | None = None,
+                        cumulative: bool = True) -> np.ndarray:
+    """Multipliers at horizons 0..horizon, shape ``(k, horizon + 1)`` or ``(draws, k, horizon + 1)``."""
+    coef = fit.coef if coef is None else np.asarray(coef)
+    seq = _beta_sequences(fit, coef, horizon)
+    phi = fit.phi(coef)
+    if coef.ndim == 1:
+        m = signal.lfilter([1.0], np.concatenate([[1.0], -phi]), seq, axis=-1)
+    else:
+        m = np.empty_like(seq)
+        p = phi.shape[-1]
+        for h in range(horizon + 1):
+            m[..., h] = seq[..., h]
+            for i in range(1, min(p, h) + 1):
+                m[..., h] += phi[:, i - 1, None] * m[..., h - i]
+    return np.cumsum(m, axis=-1) if cumulative else m
+
+
+def _multiplier_chunk(task, fit: ArdlFit, config: BootstrapConfig, horizon: int, cumulative: bool) -> np.ndarray:
+    return dynamic_multipliers(fit, horizon, ardl_chunk(task, fit, config), cumulative)
+
+
+def bootstrap_multipliers(fit: ArdlFit, horizon: int = DEFAULT_HORIZON, config: BootstrapConfig = BootstrapConfig(),
+                          cumulative: bool = True, n_jobs: int | None = None) -> np.ndarray:
+    """(reps, k, horizon + 1) multiplier draws; same coefficient draws as :func:`mes.bootstrap.bootstrap_ardl`."""
+    func = partial(_multiplier_chunk, fit=fit, config=config, horizon=horizon, cumulative=cumulative)
+    spec = draw_spec(config, order=fit.order, horizon=horizon, cumulative=cumulative)
+    return stored("bootstrap_multipliers", fingerprint(fit.X, fit.y), spec,
+                  lambda: {"draws": np.concatenate(parallel_map(func, replication_chunks(config), n_jobs))})["draws"]
+
+
+def multiplier_table(fit: ArdlFit, horizon: int = DEFAULT_HORIZON, draws: np.ndarray | None = None,
+                     level: float = 0.95, cumulative: bool = True) -> pd.DataFrame:
+    """Long table (Variable, Horizon, Multiplier[, CI low, CI high]) for every regressor."""
+    m = dynamic_multipliers(fit, horizon, cumulative=cumulative)
+    k = len(fit.regressors)
+    table = pd.DataFrame({
+        "Variable": np.repeat(fit.regressors, horizon + 1),
+        "Horizon": np.tile(np.arange(horizon + 1), k),
+        "Multiplier": m.ravel(),
+    })
+    if draws is not None:
+        alpha = (1 - level) / 2
+        low, high = np.nanquantile(draws, [alpha, 1 - alpha], axis=0)
+        table["CI low"] = low.ravel()
+        table["CI high"] = high.ravel()
+    return table
@@ -0,0 +1,132 @@
+"""Panel mode: the full pipeline run once per entity of a stacked workbook.
+
+A panel workbook has the usual columns plus an entity (country) column.
+Each entity is estimated independently and saved as its own bundle.
+Entities are submitted to the process pool lazily, with a bounded number
+in flight, and results are yielded as they finish, so memory does not
+grow with the number of entities. Workers receive the workbook path and
+read their rows from the memory-mapped columnar cache; only the compact
+per-entity summaries travel back.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .cache import fingerprint
+from .datastore import load_dataset
+from .parallel import resolve_jobs
+from .pipeline import PipelineConfig, ResultBundle, bundle_path, ensure_bundle
+from .transforms import ENTITY_COLUMNS, entity_column, prepare_data
+
+ENTITY = "Entity"
+
+
+@dataclass
+class EntityResult:
+    entity: str
+    summary: dict | None
+    path: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def entities(df: pd.DataFrame, column: str) -> list[str]:
+    return sorted(pd.unique(df[column].astype(str)))
+
+
+def entity_frame(df: pd.DataFrame, column: str, entity: str) -> pd.DataFrame:
+    """Rows of one entity, sorted by year, with the log transforms.
+
+    ``attrs["version"]`` derives from the panel's version when it has one,
+    otherwise from the rows themselves.
+    """
+    frame = df[df[column].astype(str) == entity]
+    frame = prepare_data(frame) if "logREM" not in frame.columns else frame.sort_values("year").reset_index(drop=True)
+    parent = df.attrs.get("version")
+    frame.attrs["version"] = fingerprint(parent, entity) if parent else fingerprint(frame)
+    return frame
+
+
+def entity_summary(entity: str, bundle: ResultBundle) -> dict:
+    """Key figures of one entity: ARDL order, bounds test, ECT and long-run coefficients."""
+    tables = bundle.tables
+    bounds = tables["Bounds_test"].iloc[0]
+    ecm = tables["ECM_short"].set_index("Variable")
+    summary = {
+        ENTITY: entity,
+        "Obs": bundle.meta["nobs"],
+        "ARDL": "ARDL(" + ",".join(str(o) for o in bundle.ardl_order) + ")",
+        "F-stat": float(bounds["F-stat"]),
+        "CV 5% I(1)": float(bounds["CV 5% I(1)"]),
+        "Result": bounds["Result"],
+        "ECT": float(ecm.loc["ect", "Coefficient"]) if "ect" in ecm.index else np.nan,
+    }
+    for _, row in tables["Long_run"].iterrows():
+        summary[f"LR {row['Variable']}"] = float(row["Coefficient (LR)"])
+    return summary
+
+
+def _process_entity(task, config: PipelineConfig, root) -> EntityResult:
+    source, column, entity = task
+    try:
+        # Frame sources are shipped already sliced by iter_panel
+        frame = source if isinstance(source, pd.DataFrame) else entity_frame(load_dataset(source), column, entity)
+        version = frame.attrs["version"]
+        bundle = ensure_bundle(frame, config, root, meta={"entity": entity}, version=version)
+        path = bundle_path(version, config, root)
+        return EntityResult(entity, entity_summary(entity, bundle), str(path))
+    except Exception as exc:
+        return EntityResult(entity, None, error=f"{type(exc).__name__}: {exc}")
+
+
+def iter_panel(source: pd.DataFrame | str | os.PathLike, column: str | None = None,
+               config: PipelineConfig = PipelineConfig(), root: str | os.PathLike | None = None,
+               n_jobs: int | None = None, max_pending: int | None = None) -> Iterator[EntityResult]:
+    """Run the pipeline for every entity, yielding results in completion order.
+
+    At most ``max_pending`` entities (default twice the workers) are queued
+    at once. A failing entity is reported in its result instead of
+    stopping the others.
+    """
+    df = source if isinstance(source, pd.DataFrame) else load_dataset(source)
+    column = column or entity_column(df)
+    if column is None:
+        raise ValueError(f"no entity column found; expected one of {ENTITY_COLUMNS}")
+    names = entities(df, column)
+    config = replace(config, n_jobs=1)
+    root = str(root) if root is not None else None
+    if isinstance(source, pd.DataFrame):
+        # Ship each worker its own slice rather than the whole panel
+        tasks = ((entity_frame(df, column, name), column, name) for name in names)
+    else:
+        tasks = ((str(source), column, name) for name in names)
+
+    jobs = min(resolve_jobs(n_jobs), len(names))
+    if jobs <= 1:
+        for task in tasks:
+            yield _process_entity(task, config, root)
+        return
+    max_pending = max_pending or 2 * jobs
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        for task in tasks:
+            pending.add(pool.submit(_process_entity, task, config, root))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+
+
+def panel_table(results) -> pd.DataFrame:
+    """Summaries of the successful entities, one row each, sorted by entity."""
+    rows = [r.summary for r in results if r.ok]
+    return pd.DataFrame(rows).sort_values(ENTITY).reset_index(drop=True) if rows else pd.DataFrame()
@@ -0,0 +1,19 @@
+"""Process-pool helpers shared by the estimators."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_jobs(n_jobs: int | None) -> int:
+    if n_jobs is None or n_jobs <= 0:
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def parallel_map(func, items, n_jobs: int | None = None) -> list:
+    """``map`` over a process pool, staying in-process for a single job or item."""
+    items = list(items)
+    n_jobs = min(resolve_jobs(n_jobs), len(items))
+    if n_jobs <= 1:
+        return [func(item) for item in items]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(func, items))
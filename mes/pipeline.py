@@ -0,0 +1,210 @@
+"""Headless estimation pipeline and on-disk result bundles.
+
+``run_pipeline`` chains data load -> transforms -> unit-root tests ->
+ARDL search/ECM -> residual diagnostics -> bounds test -> Granger -> 3SLS
+and returns every table under the sheet names of the dashboard export. A bundle is a directory holding one CSV per
+table plus ``manifest.json`` (data version, configuration, selected ARDL
+order, stage timings); the dashboard only reads bundles and refits the
+cheap selected models when it needs the fitted objects.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from .ardl import ardl_table, best_order, check_df_resid, ecm_table, fit_ardl, long_run_table, search_ardl
+from .bounds import bounds_test, critical_values_table
+from .cache import fingerprint
+from .datastore import dataset_version, load_dataset
+from .diagnostics import diagnostics_table
+from .granger import GRANGER_VARIABLES, granger_all_pairs
+from .sls import build_system, fit_3sls, system_tables
+from .store import result_store
+from .transforms import entity_column, missing_columns, prepare_data
+from .unitroot import unit_root_battery
+
+BUNDLE_VERSION = 4
+MANIFEST = "manifest.json"
+SYSTEM_SHEETS = {"logREM": "3SLS_eq1", "GROWTH": "3SLS_eq2", "logINV": "3SLS_eq3", "OPEN": "3SLS_eq4"}
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    ardl_max_lag: int = 2
+    ardl_criterion: str = "AIC"
+    granger_max_lag: int = 4
+    bounds_case: int = 3
+    n_jobs: int | None = 1
+
+    def key(self) -> str:
+        # n_jobs changes how, not what, is computed
+        return fingerprint(BUNDLE_VERSION, {k: v for k, v in asdict(self).items() if k != "n_jobs"})[:10]
+
+    def spec(self) -> dict:
+        """Model specification under which the result store files a bundle."""
+        return {"bundle_version": BUNDLE_VERSION, **{k: v for k, v in asdict(self).items() if k != "n_jobs"}}
+
+
+@dataclass
+class ResultBundle:
+    tables: dict[str, pd.DataFrame]
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def ardl_order(self) -> tuple[int, ...]:
+        return tuple(self.meta["ardl_order"])
+
+
+class _Timer:
+    def __init__(self):
+        self.stages = {}
+
+    def __call__(self, name):
+        self._name = name
+        return self
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.stages[self._name] = round(time.perf_counter() - self._start, 6)
+
+
+def run_pipeline(data: pd.DataFrame | str | os.PathLike, config: PipelineConfig = PipelineConfig()) -> ResultBundle:
+    """Estimate every model on one data set (a workbook path or a prepared frame)."""
+    timer = _Timer()
+    with timer("load"):
+        if isinstance(data, pd.DataFrame):
+            df, source, version = data, None, fingerprint(data)
+        else:
+            df, source, version = load_dataset(data), str(data), dataset_version(data)
+    missing = missing_columns(df)
+    if missing:
+        raise ValueError(f"missing columns: {missing}")
+    entity = entity_column(df)
+    if entity is not None and df[entity].nunique() > 1:
+        raise ValueError(f"data stacks several entities in {entity!r}; run them with mes.panel")
+    with timer("transforms"):
+        if "logREM" not in df.columns:
+            df = prepare_data(df)
+
+    tables = {}
+    with timer("unit_root"):
+        tables["Unit_root"] = unit_root_battery(df, n_jobs=config.n_jobs)
+    with timer("ardl"):
+        ranking = search_ardl(df, config.ardl_max_lag, criterion=config.ardl_criterion, n_jobs=config.n_jobs)
+        ardl_fit = fit_ardl(df, best_order(ranking))
+        check_df_resid(ardl_fit)
+        tables["ARDL_general"] = ardl_table(ardl_fit)
+        tables["ECM_short"] = ecm_table(ardl_fit)
+        tables["Long_run"] = long_run_table(ardl_fit)
+        tables["ARDL_ranking"] = ranking.head(20)
+    with timer("diagnostics"):
+        tables["Diagnostics"] = diagnostics_table(ardl_fit.resid)
+    with timer("bounds"):
+        tables["Bounds_test"], cv = bounds_test(ardl_fit, case=config.bounds_case)
+        tables["Bounds_CV"] = critical_values_table(cv)
+    with timer("granger"):
+        tables["Granger"] = granger_all_pairs(df, GRANGER_VARIABLES, config.granger_max_lag)
+    with timer("3sls"):
+        for name, table in system_tables(fit_3sls(build_system(df))).items():
+            tables[SYSTEM_SHEETS[name]] = table
+
+    meta = {
+        "bundle_version": BUNDLE_VERSION,
+        "source": source,
+        "data_version": version,
+        "config": asdict(config),
+        "config_key": config.key(),
+        "ardl_order": list(ardl_fit.order),
+        "nobs": len(df),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "timings": timer.stages,
+    }
+    return ResultBundle(tables, meta)
+
+
+def bundle_root() -> Path:
+    return Path(os.environ.get("MES_BUNDLE_DIR", "bundles"))
+
+
+def bundle_path(version: str, config: PipelineConfig, root: str | os.PathLike | None = None) -> Path:
+    return Path(root or bundle_root()) / f"{version[:16]}-{config.key()}"
+
+
+def bundle_exists(version: str, config: PipelineConfig, root: str | os.PathLike | None = None) -> bool:
+    """Whether the bundle directory of a data version and configuration has been written."""
+    return (bundle_path(version, config, root) / MANIFEST).exists()
+
+
+def save_bundle(bundle: ResultBundle, path: str | os.PathLike) -> Path:
+    """Write a bundle atomically: tables as CSV, metadata as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".bundle-"))
+    try:
+        for name, table in bundle.tables.items():
+            table.to_csv(tmp / f"{name}.csv", index=False)
+        meta = {**bundle.meta, "tables": list(bundle.tables)}
+        (tmp / MANIFEST).write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+        try:
+            tmp.rename(path)
+        except OSError:
+            # Bundles are keyed by data version and configuration: an existing one holds the same results
+            if not (path / MANIFEST).exists():
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return path
+
+
+def load_bundle(path: str | os.PathLike) -> ResultBundle:
+    path = Path(path)
+    meta = json.loads((path / MANIFEST).read_text())
+    tables = {name: pd.read_csv(path / f"{name}.csv") for name in meta["tables"]}
+    return ResultBundle(tables, meta)
+
+
+def ensure_bundle(data: pd.DataFrame | str | os.PathLike, config: PipelineConfig = PipelineConfig(),
+                  root: str | os.PathLike | None = None, meta: dict | None = None,
+                  version: str | None = None) -> ResultBundle:
+    """Load the bundle of a data version and configuration, computing it if absent.
+
+    The shared result store is tried first, then the bundle directory; a
+    computed bundle is written to both. ``meta`` entries are added to the
+    manifest of a newly computed bundle. ``version`` skips hashing the data
+    when the caller already knows it.
+    """
+    if version is None:
+        version = fingerprint(data) if isinstance(data, pd.DataFrame) else dataset_version(data)
+    path = bundle_path(version, config, root)
+    store = result_store()
+    run = store.get("bundle", version, config.spec()) if store is not None else None
+    if run is not None:
+        bundle = ResultBundle(run.items, run.meta)
+    elif (path / MANIFEST).exists():
+        bundle = load_bundle(path)
+    else:
+        bundle = run_pipeline(data, config)
+        bundle.meta.update({"data_version": version, **(meta or {})})
+    if run is None and store is not None:
+        store.put("bundle", version, config.spec(), bundle.tables, bundle.meta)
+    if not (path / MANIFEST).exists():
+        save_bundle(bundle, path)
+    return bundle
+
+
+def process_workbook(workbook: str, config: PipelineConfig, root: str) -> str:
+    """Run and save one workbook; returns the bundle directory (used by the CLI pool)."""
+    bundle = run_pipeline(workbook, config)
+    store = result_store()
+    if store is not None:
+        store.put("bundle", bundle.meta["data_version"], config.spec(), bundle.tables, bundle.meta)
+    return str(save_bundle(bundle, bundle_path(bundle.meta["data_version"], config, root)))
@@ -0,0 +1,267 @@
+"""Opt-in timing and memory traces of dashboard reruns.
+
+A :class:`Profiler` records nested sections (wall time and, with
+``tracemalloc``, the allocation peak above the section's starting point)
+and, at the end of a run, appends one JSON line per run to the trace file
+(``MES_PROFILE_FILE``, default ``profile.jsonl`` in the cache directory).
+Functions decorated with :func:`profiled` open a section in the profiler
+returned by the provider installed with :func:`set_provider`, and cost a
+single call when there is none.
+
+``tracemalloc`` is process-wide: tracing starts with the first profiler
+and stops when the last one is closed (or garbage collected with its
+session). The peak is only reset while a single profiler is active, so
+when sessions overlap the memory peaks also count the other sessions'
+allocations and are approximate upper bounds.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import cache_dir
+
+_MB = 2 ** 20
+
+_tracers: set[int] = set()      # profilers using tracemalloc
+_tracers_lock = threading.Lock()
+_started_tracing = False        # tracing started here, not by PYTHONTRACEMALLOC or another tool
+_tokens = itertools.count()
+
+
+def _no_profiler():
+    return None
+
+
+_provider = _no_profiler
+
+
+def env_enabled() -> bool:
+    return os.environ.get("MES_PROFILE", "").lower() in ("1", "true", "yes", "on")
+
+
+def memory_enabled() -> bool:
+    """``tracemalloc`` slows Python-heavy code severalfold: ``MES_PROFILE_MEMORY=0`` keeps timings only."""
+    return os.environ.get("MES_PROFILE_MEMORY", "1").lower() not in ("0", "false", "no", "off")
+
+
+def trace_path() -> Path:
+    path = os.environ.get("MES_PROFILE_FILE")
+    return Path(path) if path else cache_dir() / "profile.jsonl"
+
+
+def set_provider(provider) -> None:
+    """Install the function returning the active profiler (or ``None``), e.g. from session state."""
+    global _provider
+    _provider = provider
+
+
+def current() -> "Profiler | None":
+    return _provider()
+
+
+def _acquire_memory(token: int) -> None:
+    global _started_tracing
+    with _tracers_lock:
+        _tracers.add(token)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+
+
+def _release_memory(token: int) -> None:
+    global _started_tracing
+    with _tracers_lock:
+        _tracers.discard(token)
+        if not _tracers and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _sole_tracer(token: int) -> bool:
+    with _tracers_lock:
+        return _tracers == {token}
+
+
+class Profiler:
+    def __init__(self, session: str = "", memory: bool = True, path: str | os.PathLike | None = None):
+        self.session = session
+        self.memory = memory
+        self.path = Path(path) if path else trace_path()
+        self.runs = 0
+        self.last: dict | None = None
+        self._stack: list[dict] = []
+        self._sections: dict[str, dict] = {}
+        self._token = next(_tokens)
+        self._release = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._stack)
+
+    def _memory(self) -> tuple[int, int]:
+        return tracemalloc.get_traced_memory() if self.memory and tracemalloc.is_tracing() else (0, 0)
+
+    def _reset_peak(self) -> None:
+        # Resetting while another session is profiled would cut that session's peak short
+        if self.memory and tracemalloc.is_tracing() and _sole_tracer(self._token):
+            tracemalloc.reset_peak()
+
+    def _enter(self, name: str) -> None:
+        path = f"{self._stack[-1]['path']}/{name}" if self._stack else name
+        # Registered on entry so that the breakdown lists parents before their children
+        self._sections.setdefault(path, {"depth": len(self._stack), "calls": 0, "seconds": 0.0,
+                                         "peak_mb": 0.0, "alloc_mb": 0.0})
+        current, _ = self._memory()
+        self._reset_peak()
+        self._stack.append({"path": path, "start": time.perf_counter(), "mem": current, "peak": current})
+
+    def _exit(self) -> dict:
+        frame = self._stack.pop()
+        seconds = time.perf_counter() - frame["start"]
+        current, peak = self._memory()
+        peak = max(peak, frame["peak"])
+        if self._stack:
+            # The parent keeps the child's peak; its own measurement restarts from here
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        self._reset_peak()
+        entry = self._sections[frame["path"]]
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        # Tracing started after the section leaves zeros: never report a negative peak
+        entry["peak_mb"] = max(entry["peak_mb"], (peak - frame["mem"]) / _MB)
+        entry["alloc_mb"] += (current - frame["mem"]) / _MB
+        return {"seconds": seconds, "peak_mb": (peak - frame["mem"]) / _MB}
+
+    def start(self, kind: str = "rerun") -> None:
+        """Open a run, dropping any run left open.
+
+        Sections opened outside a run start (and close) a ``fragment`` run of their own.
+        """
+        if self.memory and self._release is None:
+            _acquire_memory(self._token)
+            self._release = weakref.finalize(self, _release_memory, self._token)
+        self._sections = {}
+        self._kind = kind
+        self._stack = []
+        self._enter("run")
+
+    def finish(self) -> dict:
+        """Close the run, append its record to the trace file and return it."""
+        totals = self._exit()
+        self.runs += 1
+        self._sections.pop("run")
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "session": self.session,
+            "run": self.runs,
+            "kind": self._kind,
+            "seconds": round(totals["seconds"], 6),
+            "peak_mb": round(totals["peak_mb"], 3),
+            "sections": [{"section": path.removeprefix("run/"), "depth": entry["depth"] - 1, "calls": entry["calls"],
+                          "seconds": round(entry["seconds"], 6), "peak_mb": round(entry["peak_mb"], 3),
+                          "alloc_mb": round(entry["alloc_mb"], 3)}
+                         for path, entry in self._sections.items()],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.last = record
+        return record
+
+    def close_run(self) -> dict | None:
+        """Finish the open run, if any, closing the sections still open (e.g. when the script is stopped)."""
+        if not self.running:
+            return None
+        while len(self._stack) > 1:
+            self._exit()
+        return self.finish()
+
+    def close(self) -> None:
+        """Stop using ``tracemalloc``; tracing ends once no other profiler needs it."""
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+    @contextmanager
+    def section(self, name: str):
+        implicit = not self.running
+        if implicit:
+            self.start("fragment")
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+            if implicit:
+                self.finish()
+
+
+def profiled(name: str | None = None):
+    """Time every call of the decorated function as a section of the active profiler."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = current()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.section(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def section(name: str):
+    """Context manager timing a block in the active profiler, a no-op without one."""
+    profiler = current()
+    return profiler.section(name) if profiler is not None else nullcontext()
+
+
+def profile_table(record: dict) -> pd.DataFrame:
+    """Breakdown of one run: sections indented by depth, with their share of the run."""
+    sections = record["sections"]
+    return pd.DataFrame({
+        "Section": ["  " * s["depth"] + s["section"].rsplit("/", 1)[-1] for s in sections],
+        "Calls": [s["calls"] for s in sections],
+        "Time (ms)": [s["seconds"] * 1e3 for s in sections],
+        "% run": [100 * s["seconds"] / record["seconds"] if record["seconds"] else np.nan for s in sections],
+        "Peak (MB)": [s["peak_mb"] for s in sections],
+        "Alloc (MB)": [s["alloc_mb"] for s in sections],
+    })
+
+
+def read_trace(path: str | os.PathLike | None = None) -> list[dict]:
+    path = Path(path) if path else trace_path()
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def summarize_trace(records: list[dict]) -> pd.DataFrame:
+    """Hot spots across runs and sessions: time per section, slowest first."""
+    rows = [{**s, "key": (r["session"], r["run"])} for r in records for s in r["sections"]]
+    if not rows:
+        return pd.DataFrame(columns=["Section", "Runs", "Calls", "Total (s)", "Mean / run (ms)", "p95 / run (ms)", "Max peak (MB)"])
+    frame = pd.DataFrame(rows)
+    grouped = frame.groupby("section")
+    table = pd.DataFrame({
+        "Runs": grouped["key"].nunique(),
+        "Calls": grouped["calls"].sum(),
+        "Total (s)": grouped["seconds"].sum(),
+        "Mean / run (ms)": grouped["seconds"].mean() * 1e3,
+        "p95 / run (ms)": grouped["seconds"].quantile(0.95) * 1e3,
+        "Max peak (MB)": grouped["peak_mb"].max(),
+    })
+    return table.sort_values("Total (s)", ascending=False).rename_axis("Section").reset_index()
@@ -0,0 +1,147 @@
+"""Recursive and rolling least squares with CUSUM / CUSUMSQ stability tests.
+
+Estimates are updated with rank-one (Sherman-Morrison) updates of the
+inverse moment matrix ``P = (X'X)^-1``: adding an observation costs
+O(k^2) and removing one from a rolling window (a downdate) costs the
+same, so a path over T observations is O(T k^2) instead of the O(T^2 k^2)
+of refitting every sample. The standardized recursive residuals
+
+    w_t = (y_t - x_t' b_{t-1}) / sqrt(1 + x_t' P_{t-1} x_t)
+
+fall out of the updates and feed the Brown-Durbin-Evans tests.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Brown, Durbin & Evans (1975) CUSUM boundary constants
+CUSUM_A = {0.10: 0.850, 0.05: 0.948, 0.01: 1.143}
+REFRESH = 500
+
+
+@dataclass
+class RecursivePath:
+    names: list[str]
+    index: pd.Index              # last observation of each estimation sample
+    coef: np.ndarray             # (S, k)
+    se: np.ndarray               # (S, k), NaN while the sample has no residual degrees of freedom
+    window: int | None = None    # None for expanding (recursive) samples
+
+    def frame(self, value: str = "coef") -> pd.DataFrame:
+        return pd.DataFrame(getattr(self, value), index=self.index, columns=self.names)
+
+
+def _initial(X: np.ndarray, y: np.ndarray):
+    try:
+        P = np.linalg.inv(X.T @ X)
+    except np.linalg.LinAlgError:
+        raise ValueError("the initial sample is singular; start the recursion later") from None
+    b = P @ (X.T @ y)
+    e = y - X @ b
+    return P, b, float(e @ e)
+
+
+def _update(P, b, x, y, sign=1.0):
+    """Add (sign=+1) or remove (sign=-1) one observation; returns the prediction error and its scale."""
+    Px = P @ x
+    d = 1.0 + sign * (x @ Px)
+    e = y - x @ b
+    b = b + sign * Px * (e / d)
+    P = P - sign * np.outer(Px, Px) / d
+    return P, b, e, d
+
+
+def _se(P, ssr, dof):
+    if dof <= 0:
+        return np.full(P.shape[0], np.nan)
+    return np.sqrt(np.clip(np.diag(P), 0, None) * ssr / dof)
+
+
+def recursive_ls(X: np.ndarray, y: np.ndarray, index=None, names=None, start: int | None = None):
+    """Expanding-sample estimates from ``start`` observations (default k) to the full sample.
+
+    Returns the :class:`RecursivePath` and the T - start recursive residuals.
+    """
+    T, k = X.shape
+    start = max(start or k, k)
+    if start >= T:
+        raise ValueError(f"{T} observations leave no recursive residual for {k} coefficients")
+    index = pd.RangeIndex(T) if index is None else pd.Index(index)
+    P, b, ssr = _initial(X[:start], y[:start])
+    coef, se = [b], [_se(P, ssr, start - k)]
+    w = np.empty(T - start)
+    for t in range(start, T):
+        P, b, e, d = _update(P, b, X[t], y[t])
+        w[t - start] = e / np.sqrt(d)
+        ssr += e * e / d
+        coef.append(b)
+        se.append(_se(P, ssr, t + 1 - k))
+    path = RecursivePath(list(names or range(k)), index[start - 1:], np.array(coef), np.array(se))
+    return path, w
+
+
+def rolling_ls(X: np.ndarray, y: np.ndarray, window: int, index=None, names=None,
+               refresh: int = REFRESH) -> RecursivePath:
+    """Fixed-width window estimates, moved one observation at a time by an update and a downdate.
+
+    Downdates accumulate rounding error, so the window is re-estimated from
+    scratch every ``refresh`` steps.
+    """
+    T, k = X.shape
+    if not k <= window <= T:
+        raise ValueError(f"the window must hold between {k} and {T} observations")
+    index = pd.RangeIndex(T) if index is None else pd.Index(index)
+    P, b, ssr = _initial(X[:window], y[:window])
+    coef, se = [b], [_se(P, ssr, window - k)]
+    for t in range(window, T):
+        s = t - window + 1
+        if s % refresh == 0:
+            P, b, ssr = _initial(X[s:t + 1], y[s:t + 1])
+        else:
+            # Add the new observation before dropping the old one so P stays well conditioned
+            P, b, e, d = _update(P, b, X[t], y[t])
+            ssr += e * e / d
+            P, b, e, d = _update(P, b, X[s - 1], y[s - 1], sign=-1.0)
+            ssr -= e * e / d
+        coef.append(b)
+        se.append(_se(P, ssr, window - k))
+    return RecursivePath(list(names or range(k)), index[window - 1:], np.array(coef), np.array(se), window)
+
+
+def cusum(w: np.ndarray, index=None, level: float = 0.05) -> pd.DataFrame:
+    """CUSUM of the recursive residuals with the straight-line 5% (or 10%, 1%) boundaries."""
+    n = len(w)
+    r = np.arange(1, n + 1)
+    stat = np.cumsum(w) / np.std(w, ddof=1)
+    bound = CUSUM_A[level] * (np.sqrt(n) + 2 * r / np.sqrt(n))
+    return pd.DataFrame({"CUSUM": stat, "Lower": -bound, "Upper": bound}, index=index)
+
+
+def cusumsq_critical(n: int, level: float = 0.05) -> float:
+    """Half-width of the CUSUMSQ band for ``n`` recursive residuals.
+
+    Uses the asymptotic Kolmogorov-Smirnov form ``sqrt(-log(level / 2) / 2) / sqrt(n / 2 - 1)``
+    of Durbin's (1969) table, which is slightly conservative in short samples.
+    """
+    return float(np.sqrt(-np.log(level / 2) / 2) / np.sqrt(max(n / 2 - 1, 1)))
+
+
+def cusumsq(w: np.ndarray, index=None, level: float = 0.05) -> pd.DataFrame:
+    """Cumulative share of squared recursive residuals around its expected path ``r / n``."""
+    n = len(w)
+    sq = np.cumsum(w * w)
+    expected = np.arange(1, n + 1) / n
+    c0 = cusumsq_critical(n, level)
+    return pd.DataFrame({"CUSUMSQ": sq / sq[-1], "Lower": expected - c0, "Upper": expected + c0}, index=index)
+
+
+def stability_summary(cs: pd.DataFrame, cssq: pd.DataFrame) -> pd.DataFrame:
+    """One row per test: whether the statistic leaves its band anywhere."""
+    rows = []
+    for name, table in (("CUSUM", cs), ("CUSUMSQ", cssq)):
+        stat = table[name]
+        crossed = bool(((stat < table["Lower"]) | (stat > table["Upper"])).any())
+        rows.append({"Test": name, "Points": len(table),
+                     "Result": "❌ Instabilité détectée" if crossed else "✅ Stable"})
+    return pd.DataFrame(rows)
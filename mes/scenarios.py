@@ -0,0 +1,136 @@
+"""Policy scenarios propagated through the reduced form of the 3SLS system.
+
+With ``Y = Y B + Z Gamma + U`` the reduced form is ``Y = (Z Gamma + U) M``
+where ``M = (I - B)^-1``. A shock ``s`` to the structural equations and a
+change ``dz`` in the exogenous variables therefore move the endogenous
+block by ``s M + dz Gamma M``, feedback between the four equations
+included. The engine precomputes ``M`` and ``Gamma M`` for the point
+estimate and for a set of coefficient draws, so evaluating any batch of
+scenarios is a pair of ``einsum`` calls.
+
+The static reduced form only needs ``I - B`` to be invertible, so every
+draw with a well-conditioned ``I - B`` is kept, whether or not the feedback
+converges (spectral radius of ``B`` below one). The share of stable draws
+is reported separately; near a singular ``I - B`` the effects change sign
+and the point estimate can sit far in a tail of the distribution, which
+:func:`scenario_summary` makes explicit with its quantile among the draws.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .sls import INTERCEPT, SystemFit, structural_form
+
+DEFAULT_DRAWS = 2000
+DEFAULT_SEED = 2022
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+MAX_CONDITION = 1e8      # cond(I - B) beyond which (I - B)^-1 is numerically meaningless
+ESTIMATE_QUANTILE = "Quantile de l'estimation"
+
+
+@dataclass
+class ScenarioEngine:
+    endogenous: tuple[str, ...]
+    exogenous: tuple[str, ...]
+    impact: np.ndarray           # (D + 1, m, m) M, point estimate first
+    exo_impact: np.ndarray       # (D + 1, L, m) Gamma M
+    radius: np.ndarray           # (D + 1,) spectral radius of B
+    condition: np.ndarray        # (D + 1,) condition number of I - B
+    dropped: int                 # draws with an ill-conditioned I - B
+    B: np.ndarray                # point-estimate structural coefficients
+    Gamma: np.ndarray
+
+    @property
+    def n_draws(self) -> int:
+        return self.impact.shape[0] - 1
+
+    @property
+    def stable(self) -> np.ndarray:
+        """Whether the feedback between the equations converges (spectral radius below one)."""
+        return self.radius < 1
+
+    @property
+    def stable_share(self) -> float:
+        """Share of the kept draws whose feedback converges."""
+        return float(self.stable[1:].mean()) if self.n_draws else np.nan
+
+    def shock_vectors(self, shocks: dict[str, np.ndarray | float]) -> tuple[np.ndarray, np.ndarray]:
+        """Split named shocks into (S, m) structural and (S, L) exogenous arrays.
+
+        Endogenous names shift their own equation; exogenous names change
+        the variable itself. Values may be scalars or equal-length arrays.
+        """
+        size = max([np.size(v) for v in shocks.values()], default=1)
+        endo = np.zeros((size, len(self.endogenous)))
+        exo = np.zeros((size, len(self.exogenous)))
+        for name, value in shocks.items():
+            if name in self.endogenous:
+                endo[:, self.endogenous.index(name)] = value
+            elif name in self.exogenous:
+                exo[:, self.exogenous.index(name)] = value
+            else:
+                raise KeyError(f"{name!r} is not a variable of the system")
+        return endo, exo
+
+    def simulate(self, shocks: dict[str, np.ndarray | float]) -> np.ndarray:
+        """(S, D + 1, m) responses of the endogenous variables, point estimate at draw 0."""
+        endo, exo = self.shock_vectors(shocks)
+        return np.einsum("sm,dmk->sdk", endo, self.impact) + np.einsum("sl,dlk->sdk", exo, self.exo_impact)
+
+    def first_round(self, shocks: dict[str, np.ndarray | float]) -> np.ndarray:
+        """(S, m) effects before any feedback: each equation's own coefficients only."""
+        endo, exo = self.shock_vectors(shocks)
+        return endo @ self.B + exo @ self.Gamma
+
+
+def build_engine(fit: SystemFit, draws: np.ndarray | None = None, n_draws: int = DEFAULT_DRAWS,
+                 seed: int = DEFAULT_SEED) -> ScenarioEngine:
+    """Precompute reduced-form multipliers for the estimate and coefficient draws.
+
+    ``draws`` may be bootstrap coefficients; otherwise they are sampled from
+    the asymptotic normal distribution of the 3SLS estimator. Draws whose
+    ``I - B`` has a condition number above :data:`MAX_CONDITION` are
+    dropped; the point estimate is always kept.
+    """
+    if draws is None:
+        rng = np.random.default_rng(seed)
+        draws = rng.multivariate_normal(fit.coef, fit.cov, size=n_draws, method="cholesky")
+    coef = np.vstack([fit.coef, draws])
+    B, Gamma = structural_form(fit, coef)
+    I_B = np.eye(B.shape[-1]) - B
+    condition = np.linalg.cond(I_B)
+    keep = condition < MAX_CONDITION
+    keep[0] = True
+    M = np.linalg.inv(I_B[keep])
+    return ScenarioEngine(
+        endogenous=tuple(eq.dependent for eq in fit.data.equations),
+        exogenous=(INTERCEPT, *fit.data.instrument_names),
+        impact=M,
+        exo_impact=Gamma[keep] @ M,
+        radius=np.abs(np.linalg.eigvals(B[keep])).max(axis=-1),
+        condition=condition[keep],
+        dropped=int((~keep).sum()),
+        B=B[0],
+        Gamma=Gamma[0],
+    )
+
+
+def scenario_frame(engine: ScenarioEngine, responses: np.ndarray) -> pd.DataFrame:
+    """Responses of one scenario over the draws, as columns ``Δ<variable>``."""
+    return pd.DataFrame(responses[1:], columns=[f"Δ{name}" for name in engine.endogenous])
+
+
+def scenario_summary(engine: ScenarioEngine, responses: np.ndarray, quantiles=QUANTILES) -> pd.DataFrame:
+    """Point estimate, draw quantiles and where the estimate falls among the draws, per response."""
+    draws = responses[1:]
+    if len(draws):
+        q = np.quantile(draws, quantiles, axis=0)
+        rank = (draws < responses[0]).mean(axis=0)
+    else:
+        q, rank = np.full((len(quantiles), responses.shape[1]), np.nan), np.nan
+    table = pd.DataFrame({"Variable": [f"Δ{name}" for name in engine.endogenous], "Estimation": responses[0]})
+    for level, row in zip(quantiles, q):
+        table[f"Q{level:.0%}"] = row
+    table[ESTIMATE_QUANTILE] = rank
+    return table
@@ -0,0 +1,174 @@
+"""Three-stage least squares estimation of the four-equation system.
+
+The system is estimated the way ``systemfit(method="3SLS")`` does it: 2SLS
+equation by equation, a cross-equation residual covariance, then one GLS
+step over the stacked equations. The GLS normal matrix is assembled from a
+single cross-product of the projected regressors weighted block-wise by the
+inverse covariance, so no ``kron(Sigma^-1, I_n)`` is ever formed.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import linalg, stats
+
+RESULT_COLUMNS = ["Variable", "Estimate", "Std. Error", "t value", "Pr(>|t|)"]
+INTERCEPT = "(Intercept)"
+
+
+@dataclass(frozen=True)
+class Equation:
+    name: str
+    dependent: str
+    regressors: tuple[str, ...]
+
+
+SYSTEM_EQUATIONS = (
+    Equation("logREM", "logREM", ("GROWTH", "MIGSTOCK", "HOSTGDP", "logTC")),
+    Equation("GROWTH", "GROWTH", ("logREM", "logINV", "OPEN", "logFDI", "logTC")),
+    Equation("logINV", "logINV", ("logREM", "CREDIT", "GROWTH", "INF")),
+    Equation("OPEN", "OPEN", ("logREM", "GROWTH", "logINV", "HOSTGDP")),
+)
+
+# Every exogenous regressor of the system and nothing else: no exclusion restriction beyond the
+# equations themselves, each of which is over-identified. The R study's instrument list was not
+# kept; its estimates are within about one of their standard errors of these (see tests/test_sls.py).
+SYSTEM_INSTRUMENTS = ("MIGSTOCK", "HOSTGDP", "logTC", "logFDI", "CREDIT", "INF")
+
+
+@dataclass
+class SystemData:
+    """Design matrices of the system, built once from the data frame."""
+    equations: tuple[Equation, ...]
+    y: np.ndarray                # (n, m) dependent variables
+    X: list[np.ndarray]          # per equation (n, k_i), intercept first
+    Z: np.ndarray                # (n, L) instruments, intercept first
+    index: pd.Index
+    sources: list[np.ndarray]    # per equation, columns of hstack([y, Z]) making up X
+    instrument_names: tuple[str, ...]
+
+    def with_dependents(self, y: np.ndarray) -> "SystemData":
+        """Same system with new values of the dependent (endogenous) variables."""
+        YZ = np.hstack([y, self.Z])
+        return SystemData(self.equations, y, [YZ[:, idx] for idx in self.sources], self.Z, self.index,
+                          self.sources, self.instrument_names)
+
+    @property
+    def nobs(self) -> int:
+        return self.y.shape[0]
+
+
+@dataclass
+class SystemFit:
+    data: SystemData
+    coef: np.ndarray             # stacked coefficients (K,)
+    cov: np.ndarray              # (K, K)
+    sigma: np.ndarray            # (m, m) residual covariance used in the GLS step
+    resid: np.ndarray            # (n, m) 3SLS residuals
+
+    def split(self, values: np.ndarray) -> list[np.ndarray]:
+        bounds = np.cumsum([X.shape[1] for X in self.data.X])[:-1]
+        return np.split(values, bounds)
+
+
+def build_system(df: pd.DataFrame, equations=SYSTEM_EQUATIONS, instruments=SYSTEM_INSTRUMENTS) -> SystemData:
+    """Extract the complete-case arrays needed by :func:`fit_3sls`."""
+    dependents = [eq.dependent for eq in equations]
+    lookup = {name: i for i, name in enumerate([*dependents, INTERCEPT, *instruments])}
+    sources = []
+    for eq in equations:
+        unknown = [r for r in eq.regressors if r not in lookup]
+        if unknown:
+            raise ValueError(f"{eq.name}: {unknown} are neither dependent variables nor instruments")
+        sources.append(np.array([lookup[INTERCEPT], *(lookup[r] for r in eq.regressors)]))
+
+    used = {eq.dependent for eq in equations} | {r for eq in equations for r in eq.regressors} | set(instruments)
+    frame = df[sorted(used)].apply(pd.to_numeric, errors="coerce").dropna()
+    n = len(frame)
+    ones = np.ones((n, 1))
+    y = frame[dependents].to_numpy(dtype=float)
+    X = [np.hstack([ones, frame[list(eq.regressors)].to_numpy(dtype=float)]) for eq in equations]
+    Z = np.hstack([ones, frame[list(instruments)].to_numpy(dtype=float)])
+    return SystemData(tuple(equations), y, X, Z, frame.index, sources, tuple(instruments))
+
+
+def _residual_cov(resid: np.ndarray, k: np.ndarray) -> np.ndarray:
+    # systemfit's default "geomean" degrees-of-freedom correction
+    dof = resid.shape[0] - k
+    return resid.T @ resid / np.sqrt(np.outer(dof, dof))
+
+
+def fit_3sls(data: SystemData) -> SystemFit:
+    y, Z = data.y, data.Z
+    m = y.shape[1]
+    k = np.array([X.shape[1] for X in data.X])
+    eq_of = np.repeat(np.arange(m), k)
+
+    # First stage: project every regressor on the instrument space in one pass
+    Q, _ = np.linalg.qr(Z)
+    X_all = np.hstack(data.X)
+    Xh_all = Q @ (Q.T @ X_all)
+
+    # 2SLS per equation, giving the residuals behind Sigma
+    H = Xh_all.T @ Xh_all
+    G = Xh_all.T @ y
+    starts = np.concatenate([[0], np.cumsum(k)])
+    resid = np.empty_like(y)
+    for i, X in enumerate(data.X):
+        s = slice(starts[i], starts[i + 1])
+        b = linalg.cho_solve(linalg.cho_factor(H[s, s]), G[s, i])
+        resid[:, i] = y[:, i] - X @ b
+
+    sigma = _residual_cov(resid, k)
+    sigma_inv = linalg.cho_solve(linalg.cho_factor(sigma), np.eye(m))
+
+    # GLS step: block (i, j) of the normal matrix is sigma^{ij} Xh_i' Xh_j
+    A = H * sigma_inv[np.ix_(eq_of, eq_of)]
+    rhs = (G * sigma_inv[eq_of]).sum(axis=1)
+    factor = linalg.cho_factor(A)
+    coef = linalg.cho_solve(factor, rhs)
+    cov = linalg.cho_solve(factor, np.eye(len(coef)))
+
+    resid3 = y - np.column_stack([X @ b for X, b in zip(data.X, np.split(coef, starts[1:-1]))])
+    return SystemFit(data, coef, cov, sigma, resid3)
+
+
+def structural_form(fit: SystemFit, coef: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """``B`` (m, m) and ``Gamma`` (L, m) such that ``Y = Y B + Z Gamma + U``.
+
+    ``coef`` may carry leading batch axes, e.g. bootstrap or simulation draws.
+    """
+    coef = fit.coef if coef is None else coef
+    data = fit.data
+    m, L = data.y.shape[1], data.Z.shape[1]
+    eq = np.concatenate([np.full(len(idx), i) for i, idx in enumerate(data.sources)])
+    src = np.concatenate(data.sources)
+    endo = src < m
+    B = np.zeros((*coef.shape[:-1], m, m))
+    Gamma = np.zeros((*coef.shape[:-1], L, m))
+    B[..., src[endo], eq[endo]] = coef[..., endo]
+    Gamma[..., src[~endo] - m, eq[~endo]] = coef[..., ~endo]
+    return B, Gamma
+
+
+def system_tables(fit: SystemFit) -> dict[str, pd.DataFrame]:
+    """One ``Variable/Estimate/Std. Error/t value/Pr(>|t|)`` table per equation."""
+    tables = {}
+    se = np.sqrt(np.diag(fit.cov))
+    n = fit.data.nobs
+    for eq, X, b, s in zip(fit.data.equations, fit.data.X, fit.split(fit.coef), fit.split(se)):
+        t = b / s
+        p = 2 * stats.t.sf(np.abs(t), n - X.shape[1])
+        tables[eq.name] = pd.DataFrame({
+            "Variable": [INTERCEPT, *eq.regressors],
+            "Estimate": b,
+            "Std. Error": s,
+            "t value": t,
+            "Pr(>|t|)": p,
+        })
+    return tables
+
+
+def estimate_3sls(df: pd.DataFrame, equations=SYSTEM_EQUATIONS, instruments=SYSTEM_INSTRUMENTS) -> dict[str, pd.DataFrame]:
+    """Build, fit and tabulate the system in one call."""
+    return system_tables(fit_3sls(build_system(df, equations, instruments)))
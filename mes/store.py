@@ -0,0 +1,280 @@
+"""Persistent SQLite store of estimation results, shared by sessions and workers.
+
+An entry is addressed by a kind (``bundle``, ``bootstrap_ardl``,
+``forecast``...), the content hash of its input data and a JSON model
+specification, and holds named tables and arrays (result tables, bootstrap
+draws, simulated paths) serialized with ``numpy.save`` / ``numpy.savez``.
+The database lives in the cache directory (``MES_STORE`` overrides the
+file, ``MES_STORE=off`` disables it), uses WAL so readers never wait for a
+writer, and evicts the least recently used entries once the payloads
+exceed ``MES_STORE_MAX_MB``.
+"""
+import io
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import cache_dir, fingerprint
+
+DEFAULT_MAX_MB = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_accessed ON runs (accessed);
+CREATE TABLE IF NOT EXISTS payloads (
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, name)
+);
+"""
+
+_STORES: dict[str, "ResultStore"] = {}
+
+
+@dataclass
+class StoredRun:
+    key: str
+    kind: str
+    data_version: str
+    spec: dict
+    meta: dict = field(default_factory=dict)
+    items: dict = field(default_factory=dict)   # name -> DataFrame or ndarray
+
+
+def _spec_json(spec: dict) -> str:
+    # Tuples and lists hash alike; numpy scalars and other values by their str
+    return json.dumps(spec, sort_keys=True, default=str)
+
+
+def _pack(obj) -> tuple[str, bytes]:
+    buf = io.BytesIO()
+    if isinstance(obj, pd.DataFrame):
+        # One array per column, like the columnar data cache; the index is not kept
+        arrays = {"columns": np.array([str(c) for c in obj.columns], dtype=str)}
+        for i in range(obj.shape[1]):
+            values = obj.iloc[:, i]
+            if pd.api.types.is_bool_dtype(values) and not values.isna().any():
+                arrays[f"c{i}"] = values.to_numpy(dtype=bool)
+            elif pd.api.types.is_numeric_dtype(values):
+                arrays[f"c{i}"] = values.to_numpy(dtype=float, na_value=np.nan) \
+                    if values.isna().any() else values.to_numpy()
+            else:
+                arrays[f"c{i}"] = values.astype(str).to_numpy(dtype=str)
+                arrays[f"n{i}"] = values.isna().to_numpy()
+        np.savez(buf, **arrays)
+        return "table", buf.getvalue()
+    np.save(buf, np.asarray(obj), allow_pickle=False)
+    return "array", buf.getvalue()
+
+
+def _unpack(kind: str, data: bytes):
+    buf = io.BytesIO(data)
+    if kind == "array":
+        return np.load(buf, allow_pickle=False)
+    with np.load(buf, allow_pickle=False) as z:
+        columns = z["columns"].tolist()
+        data = {}
+        for i in range(len(columns)):
+            values = z[f"c{i}"]
+            if f"n{i}" in z.files:
+                values = pd.Series(values, dtype=object).mask(z[f"n{i}"])
+            data[i] = values
+    table = pd.DataFrame(data)
+    table.columns = columns
+    return table
+
+
+def store_path() -> Path:
+    path = os.environ.get("MES_STORE")
+    return Path(path) if path else cache_dir() / "results.sqlite"
+
+
+def result_store() -> "ResultStore | None":
+    """Store at :func:`store_path`, one instance per process; ``None`` when disabled."""
+    if os.environ.get("MES_STORE", "").lower() == "off":
+        return None
+    path = str(store_path())
+    if path not in _STORES:
+        _STORES[path] = ResultStore(path)
+    return _STORES[path]
+
+
+def stored(kind: str, data_version: str, spec: dict, compute) -> dict:
+    """``compute()`` (returning named tables/arrays) through the shared store."""
+    store = result_store()
+    return compute() if store is None else store.cached(kind, data_version, spec, compute)
+
+
+class ResultStore:
+    def __init__(self, path: str | os.PathLike, max_bytes: int | None = None):
+        self.path = Path(path)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("MES_STORE_MAX_MB", DEFAULT_MAX_MB)) * 2 ** 20)
+        self.max_bytes = max_bytes
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call: safe across Streamlit threads and pool workers. The idempotent
+        # schema also recreates a database removed with the cache directory while running.
+        fresh = not self.path.exists()
+        if fresh:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if fresh:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(kind: str, data_version: str, spec: dict) -> str:
+        return fingerprint(kind, data_version, _spec_json(spec))[:20]
+
+    def get(self, kind: str, data_version: str, spec: dict) -> StoredRun | None:
+        """The stored entry, or ``None``; a hit counts as a use for eviction."""
+        key = self.key(kind, data_version, spec)
+        with self._connect() as conn:
+            hit = conn.execute("UPDATE runs SET accessed = ?, hits = hits + 1 WHERE key = ?",
+                               (time.time(), key)).rowcount
+        if not hit:
+            return None
+        try:
+            return self.load(key)
+        except KeyError:
+            # Evicted by another process in between
+            return None
+
+    def put(self, kind: str, data_version: str, spec: dict, items: dict, meta: dict | None = None) -> str:
+        key = self.key(kind, data_version, spec)
+        packed = [(key, name, *_pack(obj)) for name, obj in items.items()]
+        meta_json = json.dumps(meta or {}, default=str)
+        size = sum(len(p[3]) for p in packed) + len(meta_json)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM payloads WHERE key = ?", (key,))
+            conn.executemany("INSERT INTO payloads (key, name, type, data) VALUES (?, ?, ?, ?)", packed)
+            conn.execute("INSERT OR REPLACE INTO runs (key, kind, data_version, spec, meta, created, accessed, size)"
+                         " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (key, kind, data_version, _spec_json(spec), meta_json, now, now, size))
+            self._evict(conn, self.max_bytes, keep=key)
+        return key
+
+    def cached(self, kind: str, data_version: str, spec: dict, compute) -> dict:
+        """Items of the entry, calling ``compute()`` (returning the items) and storing them on a miss."""
+        run = self.get(kind, data_version, spec)
+        if run is not None:
+            return run.items
+        items = compute()
+        self.put(kind, data_version, spec, items)
+        return items
+
+    def _resolve(self, conn, key: str) -> str:
+        # Unambiguous prefixes are accepted, as for git hashes
+        rows = conn.execute("SELECT key FROM runs WHERE key LIKE ?", (key + "%",)).fetchall()
+        if len(rows) != 1:
+            raise KeyError(f"{'no' if not rows else 'several'} stored runs match {key!r}")
+        return rows[0][0]
+
+    def load(self, key: str) -> StoredRun:
+        with self._connect() as conn:
+            key = self._resolve(conn, key)
+            kind, version, spec, meta = conn.execute(
+                "SELECT kind, data_version, spec, meta FROM runs WHERE key = ?", (key,)).fetchone()
+            payloads = conn.execute("SELECT name, type, data FROM payloads WHERE key = ? ORDER BY rowid",
+                                    (key,)).fetchall()
+        items = {name: _unpack(kind_, data) for name, kind_, data in payloads}
+        return StoredRun(key, kind, version, json.loads(spec), json.loads(meta), items)
+
+    def _evict(self, conn, max_bytes: int, keep: str | None = None) -> int:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM runs").fetchone()[0]
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM runs ORDER BY accessed").fetchall():
+            if total <= max_bytes:
+                break
+            if key != keep:
+                victims.append((key,))
+                total -= size
+        conn.executemany("DELETE FROM payloads WHERE key = ?", victims)
+        conn.executemany("DELETE FROM runs WHERE key = ?", victims)
+        return len(victims)
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Drop least recently used entries until the payloads fit in ``max_bytes``; returns how many."""
+        with self._connect() as conn:
+            return self._evict(conn, self.max_bytes if max_bytes is None else max_bytes)
+
+    def runs(self, kind: str | None = None) -> pd.DataFrame:
+        """Stored entries, most recently used first."""
+        query = "SELECT key, kind, data_version, spec, created, accessed, hits, size FROM runs"
+        with self._connect() as conn:
+            rows = conn.execute(query + (" WHERE kind = ?" if kind else "") + " ORDER BY accessed DESC",
+                                (kind,) if kind else ()).fetchall()
+        table = pd.DataFrame(rows, columns=["Key", "Kind", "Data", "Spec", "Created", "Last used", "Hits", "Size (KB)"])
+        table["Data"] = table["Data"].str[:12]
+        for col in ("Created", "Last used"):
+            table[col] = pd.to_datetime(table[col], unit="s").dt.floor("s")
+        table["Size (KB)"] = (table["Size (KB)"] / 1024).round(1)
+        return table
+
+    def diff(self, key_a: str, key_b: str, atol: float = 1e-10) -> pd.DataFrame:
+        """Specification, data and per-item differences between two stored runs."""
+        a, b = self.load(key_a), self.load(key_b)
+        rows = []
+        if a.data_version != b.data_version:
+            rows.append(("data", a.data_version[:12], b.data_version[:12], np.nan, "❌ différent"))
+        for name in sorted(set(a.spec) | set(b.spec)):
+            if a.spec.get(name) != b.spec.get(name):
+                rows.append((f"spec.{name}", str(a.spec.get(name)), str(b.spec.get(name)), np.nan, "❌ différent"))
+        for name in [*a.items, *(n for n in b.items if n not in a.items)]:
+            x, y = a.items.get(name), b.items.get(name)
+            if x is None or y is None:
+                rows.append((name, _shape(x), _shape(y), np.nan, "➖ absent de " + ("A" if x is None else "B")))
+                continue
+            delta = _max_delta(x, y)
+            rows.append((name, _shape(x), _shape(y), delta, "✅ identique" if delta <= atol else "❌ différent"))
+        return pd.DataFrame(rows, columns=["Item", "A", "B", "Max abs diff", "Status"])
+
+
+def _shape(obj) -> str:
+    return "" if obj is None else "×".join(str(n) for n in np.shape(obj))
+
+
+def _max_delta(x, y) -> float:
+    """Largest absolute difference between two tables or arrays; ``inf`` when they do not line up."""
+    if isinstance(x, pd.DataFrame) != isinstance(y, pd.DataFrame) or np.shape(x) != np.shape(y):
+        return np.inf
+    if isinstance(x, pd.DataFrame):
+        if list(x.columns) != list(y.columns):
+            return np.inf
+        numeric = [pd.api.types.is_numeric_dtype(x[c]) and pd.api.types.is_numeric_dtype(y[c]) for c in x.columns]
+        other = [c for c, num in zip(x.columns, numeric) if not num]
+        if not x[other].astype(str).equals(y[other].astype(str)):
+            return np.inf
+        x, y = x.loc[:, numeric].to_numpy(dtype=float), y.loc[:, numeric].to_numpy(dtype=float)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if (np.isnan(x) != np.isnan(y)).any():
+        return np.inf
+    d = np.abs(x - y)
+    return float(np.max(np.where(np.isnan(d), 0.0, d), initial=0.0))
@@ -0,0 +1,144 @@
+"""Descriptive statistics and correlations maintained as observations arrive.
+
+:class:`RunningMoments` keeps, for every pair of columns, the number of
+rows where both are observed, the two means over those rows, the two sums
+of squared deviations and the co-moment. Batches are merged with the
+pairwise update of Chan, Golub and LeVeque (Welford's update for one
+batch at a time), so an appended block costs O(rows × columns²) however
+long the history, and missing values are handled pairwise like
+``DataFrame.corr``. The diagonal gives the univariate count, mean and
+variance.
+
+:func:`running_moments` persists the accumulator of a source in the cache
+directory and, when a new version of the data only appends rows to the
+one already accumulated, merges the new rows instead of starting over.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from .cache import cache_dir, fingerprint
+
+_FIELDS = ("n", "mean", "m2", "comoment", "min", "max")
+
+
+class RunningMoments:
+    def __init__(self, columns):
+        self.columns = [str(c) for c in columns]
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))        # mean[a, b]: mean of column a where a and b are observed
+        self.m2 = np.zeros((k, k))          # m2[a, b]: squared deviations of a from mean[a, b], same rows
+        self.comoment = np.zeros((k, k))
+        self.min = np.full(k, np.nan)
+        self.max = np.full(k, np.nan)
+        self.nobs = 0                       # rows accumulated, observed or not
+
+    def update(self, frame: pd.DataFrame) -> "RunningMoments":
+        """Merge a block of rows (same columns) into the accumulator."""
+        x = frame[self.columns].to_numpy(dtype=float)
+        if not len(x):
+            return self
+        observed = ~np.isnan(x)
+        v = observed.astype(float)
+        seen = observed.any(axis=0)
+        # Centred on the block's own means first: one-pass sums stay accurate for large levels
+        shift = np.where(observed, x, 0.0).sum(axis=0) / np.maximum(v.sum(axis=0), 1)
+        d = np.where(observed, x - shift, 0.0)
+        n = v.T @ v
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dmean = np.where(n > 0, (d.T @ v) / n, 0.0)
+            m2 = (d * d).T @ v - n * dmean ** 2
+            comoment = d.T @ d - n * dmean * dmean.T
+        batch = {"n": n, "mean": dmean + shift[:, None], "m2": np.maximum(m2, 0.0), "comoment": comoment}
+        self._merge(batch)
+        block_min = np.where(seen, np.where(observed, x, np.inf).min(axis=0), np.nan)
+        block_max = np.where(seen, np.where(observed, x, -np.inf).max(axis=0), np.nan)
+        self.min, self.max = np.fmin(self.min, block_min), np.fmax(self.max, block_max)
+        self.nobs += len(x)
+        return self
+
+    def _merge(self, other: dict) -> None:
+        na, nb = self.n, other["n"]
+        n = na + nb
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(n > 0, na * nb / n, 0.0)
+            share = np.where(n > 0, nb / n, 0.0)
+        delta = other["mean"] - self.mean
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + other["m2"] + delta ** 2 * weight
+        self.comoment = self.comoment + other["comoment"] + delta * delta.T * weight
+        self.n = n
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Combine with the accumulator of another block of the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("cannot merge moments of different columns")
+        self._merge({f: getattr(other, f) for f in ("n", "mean", "m2", "comoment")})
+        self.min, self.max = np.fmin(self.min, other.min), np.fmax(self.max, other.max)
+        self.nobs += other.nobs
+        return self
+
+    def describe(self) -> pd.DataFrame:
+        """Count, mean, standard deviation (ddof=1), min and max per column."""
+        n, m2 = np.diag(self.n), np.diag(self.m2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(n > 1, np.sqrt(m2 / (n - 1)), np.nan)
+        return pd.DataFrame({"count": n, "mean": np.where(n > 0, np.diag(self.mean), np.nan), "std": std,
+                             "min": self.min, "max": self.max}, index=self.columns)
+
+    def corr(self) -> pd.DataFrame:
+        """Pearson correlations over pairwise complete rows, as ``DataFrame.corr()``."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        r = np.where(self.n > 1, np.clip(r, -1, 1), np.nan)
+        np.fill_diagonal(r, np.where(np.diag(self.n) > 1, 1.0, np.nan))
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+    def to_bytes(self, **extra) -> bytes:
+        buf = io.BytesIO()
+        np.savez(buf, columns=np.array(self.columns, dtype=str), nobs=self.nobs,
+                 **{f: getattr(self, f) for f in _FIELDS}, **extra)
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> tuple["RunningMoments", dict]:
+        """The accumulator and the extra arrays saved with it."""
+        with np.load(io.BytesIO(data), allow_pickle=False) as z:
+            moments = cls(z["columns"].tolist())
+            for f in _FIELDS:
+                setattr(moments, f, z[f])
+            moments.nobs = int(z["nobs"])
+            extra = {name: z[name] for name in z.files if name not in (*_FIELDS, "columns", "nobs")}
+        return moments, extra
+
+
+def running_moments(frame: pd.DataFrame, key: str) -> RunningMoments:
+    """Moments of ``frame``, resumed from the accumulator saved for ``key`` when ``frame`` extends its rows.
+
+    ``key`` names the series being followed (e.g. the workbook path and
+    country); the saved state is checked against a hash of the rows it
+    covers, so edited history falls back to a full pass.
+    """
+    frame = frame.reset_index(drop=True)
+    path = cache_dir("data", "moments") / f"{fingerprint(key)[:20]}.npz"
+    moments = None
+    if path.exists():
+        try:
+            saved, extra = RunningMoments.from_bytes(path.read_bytes())
+        except (OSError, ValueError, KeyError):
+            saved, extra = None, {}
+        if (saved is not None and saved.columns == [str(c) for c in frame.columns] and saved.nobs <= len(frame)
+                and str(extra.get("prefix")) == fingerprint(frame.iloc[:saved.nobs])):
+            if saved.nobs == len(frame):
+                return saved
+            moments = saved.update(frame.iloc[saved.nobs:])
+    if moments is None:
+        moments = RunningMoments(frame.columns).update(frame)
+    # Written whole then renamed: concurrent sessions never read half a state
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(moments.to_bytes(prefix=np.array(fingerprint(frame))))
+    os.replace(tmp, path)
+    return moments
@@ -0,0 +1,82 @@
+"""Styling of the results tables shown by the dashboard.
+
+Cell styles are computed a column at a time (no per-cell callbacks), once
+for the whole table, so that a page of a long table is shaded on the same
+scale as the full table.
+"""
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+PAGE_ROWS = 500     # rows of a styled page; longer tables are paginated
+
+_POSITIVE = "background-color: rgba(44, 160, 44, "
+_NEGATIVE = "background-color: rgba(214, 39, 40, "
+_PVALUE_STYLES = [
+    "background-color: rgba(214, 39, 40, 0.4); color: white; font-weight: bold",
+    "background-color: rgba(214, 39, 40, 0.3); font-weight: bold",
+    "background-color: rgba(255, 127, 14, 0.2)",
+]
+_PVALUE_DEFAULT = "background-color: rgba(200, 200, 200, 0.1)"
+
+
+def coefficient_columns(df: pd.DataFrame) -> list[int]:
+    return [i for i, c in enumerate(df.columns) if 'Coefficient' in str(c) or 'Estimate' in str(c)]
+
+
+def pvalue_columns(df: pd.DataFrame) -> list[int]:
+    return [i for i, c in enumerate(df.columns) if 'p-value' in str(c) or 'Pr(>|t|)' in str(c)]
+
+
+def coefficient_css(values: pd.Series, scale: float) -> np.ndarray:
+    """Green (positive) or red shading, opaque up to 0.4 as |value| reaches ``scale``; blank if not numeric."""
+    v = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    intensity = pd.Series(np.minimum(np.abs(v) / scale, 0.4)).round(4).astype(str).to_numpy(dtype=object)
+    css = np.where(v > 0, _POSITIVE, _NEGATIVE).astype(object) + intensity + ")"
+    return np.where(np.isnan(v), "", css)
+
+
+def pvalue_css(values: pd.Series) -> np.ndarray:
+    """Red at 1 % and 5 %, orange at 10 %, grey otherwise; blank if not numeric."""
+    v = pd.to_numeric(values, errors="coerce")
+    css = np.select([v < 0.01, v < 0.05, v < 0.1], _PVALUE_STYLES, _PVALUE_DEFAULT).astype(object)
+    # Missing p-values keep the grey of non-significant ones, text cells stay blank
+    return np.where(v.isna() & values.notna(), "", css)
+
+
+def results_table_css(df: pd.DataFrame) -> pd.DataFrame:
+    """CSS of every cell of a results table, positionally aligned with ``df``."""
+    css = np.full(df.shape, "", dtype=object)
+    coef_cols = coefficient_columns(df)
+    if coef_cols:
+        # Every coefficient column is shaded on the scale of the first one
+        first = pd.to_numeric(df.iloc[:, coef_cols[0]], errors="coerce").abs().max()
+        scale = max(first, 1) if pd.notna(first) else 1
+        for i in coef_cols:
+            css[:, i] = coefficient_css(df.iloc[:, i], scale)
+    for i in pvalue_columns(df):
+        css[:, i] = pvalue_css(df.iloc[:, i])
+    return pd.DataFrame(css, index=df.index, columns=df.columns)
+
+
+def _apply_css(data: pd.DataFrame, css: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame(css, index=data.index, columns=data.columns)
+
+
+def style_results_table(df: pd.DataFrame, css: pd.DataFrame | None = None) -> Styler:
+    """Coefficients shaded by sign and size, p-values by significance, four decimals.
+
+    ``css`` (from :func:`results_table_css`, e.g. memoized or computed on the
+    full table when ``df`` is one page of it) must line up with ``df`` by position.
+    """
+    css = results_table_css(df) if css is None else css
+    return df.style.apply(_apply_css, axis=None, css=np.asarray(css)).format(precision=4)
+
+
+def page_count(n_rows: int, page_rows: int = PAGE_ROWS) -> int:
+    return max(1, -(-n_rows // page_rows))
+
+
+def page_slice(page: int, page_rows: int = PAGE_ROWS) -> slice:
+    """Rows of the 1-based ``page``."""
+    return slice((page - 1) * page_rows, page * page_rows)
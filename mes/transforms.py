@@ -0,0 +1,45 @@
+"""Data preparation shared by the dashboard and the estimators."""
+import numpy as np
+import pandas as pd
+
+EXPECTED_COLS = ["year", "GROWTH", "REM", "TC", "FDI", "OPEN", "CREDIT", "INV", "INF", "MIGSTOCK", "HOSTGDP"]
+# Column names recognised as the entity (country) identifier of a stacked panel, case-insensitive
+ENTITY_COLUMNS = ("country", "entity", "pays", "iso3c", "iso3")
+
+# Derived column -> source column, in the order the dashboard has always built them
+LOG_COLUMNS = {
+    "logREM": "REM",
+    "logTC": "TC",
+    "logFDI": "FDI",
+    "logOPEN": "OPEN",
+    "logCREDIT": "CREDIT",
+    "logINV": "INV",
+}
+
+
+def safe_log(s: pd.Series):
+    s = pd.to_numeric(s, errors="coerce")
+    s = s.where(s > 0)
+    return np.log(s)
+
+
+def numeric_frame(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """``columns`` of ``df`` as numbers, rows with any missing value dropped."""
+    return df[list(columns)].apply(pd.to_numeric, errors="coerce").dropna()
+
+
+def missing_columns(df: pd.DataFrame) -> list[str]:
+    return [c for c in EXPECTED_COLS if c not in df.columns]
+
+
+def entity_column(df: pd.DataFrame) -> str | None:
+    by_name = {str(c).lower(): c for c in df.columns}
+    return next((by_name[name] for name in ENTITY_COLUMNS if name in by_name), None)
+
+
+def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Sort by year and add the ``safe_log`` columns used by every model."""
+    df = df.sort_values("year").reset_index(drop=True).copy()
+    for name, source in LOG_COLUMNS.items():
+        df[name] = safe_log(df[source])
+    return df
@@ -0,0 +1,210 @@
+"""Unit-root battery (ADF, Phillips-Perron, KPSS) and integration orders.
+
+The ADF lag length is chosen by AIC as in ``statsmodels.adfuller``: all
+candidate regressions are column prefixes of one lag matrix
+``[const, (trend), y_{t-1}, dy_{t-1}, ..., dy_{t-maxlag}]`` on a common
+sample, so a single QR of that matrix gives every candidate's SSR as a
+cumulative sum of squared projections. ADF and PP p-values use
+MacKinnon's (1994) response surfaces and the critical values his 2010
+ones; KPSS p-values are interpolated in the Kwiatkowski et al. table.
+Series are independent and are spread over the process pool.
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from scipy import linalg, stats
+
+from .cache import LRUCache, fingerprint
+from .parallel import parallel_map
+from .transforms import EXPECTED_COLS, LOG_COLUMNS
+
+REGRESSIONS = ("c", "ct")
+LEVEL = 0.05
+TRANSFORMS = ("Niveau", "Δ")
+
+# MacKinnon (1994), one series: bounds of the surface, switch point, small-p and large-p coefficients
+_TAU_MAX = {"c": 2.74, "ct": 0.7}
+_TAU_MIN = {"c": -18.83, "ct": -16.18}
+_TAU_STAR = {"c": -1.61, "ct": -2.89}
+_TAU_SMALLP = {"c": [2.1659, 1.4412, 3.8269e-2], "ct": [3.2512, 1.6047, 4.9588e-2]}
+_TAU_LARGEP = {"c": [1.7339, 9.3202e-1, -1.2745e-1, -1.0368e-2], "ct": [2.5261, 6.1654e-1, -3.7956e-1, -6.0285e-2]}
+# MacKinnon (2010) critical values at 1%, 5%, 10%: b0 + b1/T + b2/T^2 + b3/T^3
+_TAU_2010 = {
+    "c": [[-3.43035, -6.5393, -16.786, -79.433], [-2.86154, -2.8903, -4.234, -40.040], [-2.56677, -1.5384, -2.809, 0.0]],
+    "ct": [[-3.95877, -9.0531, -28.428, -134.155], [-3.41049, -4.3904, -9.036, -45.374],
+           [-3.12705, -2.5856, -3.925, -22.380]],
+}
+# Kwiatkowski, Phillips, Schmidt & Shin (1992), Table 1
+_KPSS_P = (0.10, 0.05, 0.025, 0.01)
+_KPSS_CRIT = {"c": (0.347, 0.463, 0.574, 0.739), "ct": (0.119, 0.146, 0.176, 0.216)}
+
+_CACHE = LRUCache(32)    # batteries of the last datasets x deterministic terms
+
+
+def schwert_lags(nobs: int) -> int:
+    return int(np.ceil(12 * (nobs / 100) ** 0.25))
+
+
+def mackinnon_pvalue(stat: float, regression: str = "c") -> float:
+    if stat > _TAU_MAX[regression]:
+        return 1.0
+    if stat < _TAU_MIN[regression]:
+        return 0.0
+    coef = _TAU_SMALLP[regression] if stat <= _TAU_STAR[regression] else _TAU_LARGEP[regression]
+    return float(stats.norm.cdf(np.polyval(coef[::-1], stat)))
+
+
+def mackinnon_critical(nobs: int, regression: str = "c") -> dict[str, float]:
+    return {level: float(np.polyval(row[::-1], 1 / nobs))
+            for level, row in zip(("1%", "5%", "10%"), _TAU_2010[regression])}
+
+
+def _deterministic(n: int, regression: str) -> np.ndarray:
+    cols = [np.ones(n)] if regression == "c" else [np.ones(n), np.arange(1, n + 1, dtype=float)]
+    return np.column_stack(cols)
+
+
+def _adf_design(x: np.ndarray, lags: int, regression: str):
+    dx = np.diff(x)
+    n = len(dx) - lags
+    cols = [x[lags:-1]] + [dx[lags - i:len(dx) - i] for i in range(1, lags + 1)]
+    return np.column_stack([_deterministic(n, regression), *cols]), dx[lags:]
+
+
+def _ols_t(X: np.ndarray, y: np.ndarray, j: int) -> float:
+    Q, R = np.linalg.qr(X)
+    coef = linalg.solve_triangular(R, Q.T @ y)
+    resid = y - X @ coef
+    R_inv = linalg.solve_triangular(R, np.eye(R.shape[0]))
+    se = np.sqrt(resid @ resid / (len(y) - X.shape[1]) * (R_inv[j] @ R_inv[j]))
+    return float(coef[j] / se)
+
+
+def adf(x: np.ndarray, regression: str = "c", max_lag: int | None = None) -> dict:
+    """Augmented Dickey-Fuller test with the lag length chosen by AIC."""
+    x = np.asarray(x, dtype=float)
+    ntrend = 1 if regression == "c" else 2
+    if max_lag is None:
+        max_lag = min(schwert_lags(len(x)), len(x) // 2 - ntrend - 1)
+    if max_lag < 0:
+        raise ValueError(f"{len(x)} observations are too few for the ADF test")
+
+    # All lag lengths on the sample of the longest: nested prefixes of one matrix
+    X, y = _adf_design(x, max_lag, regression)
+    n = len(y)
+    proj = np.linalg.qr(X)[0].T @ y
+    ssr = y @ y - np.cumsum(proj ** 2)[ntrend:]
+    k = np.arange(ntrend + 1, X.shape[1] + 1)
+    aic = n * (np.log(2 * np.pi) + np.log(np.maximum(ssr, np.finfo(float).tiny) / n) + 1) + 2 * k
+    lags = int(np.argmin(aic))
+
+    X, y = _adf_design(x, lags, regression)
+    stat = _ols_t(X, y, ntrend)
+    return {"stat": stat, "pvalue": mackinnon_pvalue(stat, regression), "lags": lags, "nobs": len(y),
+            "critical": mackinnon_critical(len(y), regression)}
+
+
+def _long_run_variance(u: np.ndarray, lags: int) -> float:
+    """Newey-West (Bartlett kernel) long-run variance, autocovariances divided by n."""
+    n = len(u)
+    lags = min(lags, n - 1)
+    gamma = np.array([u[j:] @ u[:n - j] for j in range(lags + 1)]) / n
+    weights = 1 - np.arange(1, lags + 1) / (lags + 1)
+    return float(gamma[0] + 2 * weights @ gamma[1:])
+
+
+def phillips_perron(x: np.ndarray, regression: str = "c", lags: int | None = None) -> dict:
+    """Phillips-Perron Z(tau) test of ``y_t = deterministic + rho y_{t-1} + u_t``."""
+    x = np.asarray(x, dtype=float)
+    y, n = x[1:], len(x) - 1
+    lags = schwert_lags(n) if lags is None else lags
+    X = np.column_stack([_deterministic(n, regression), x[:-1]])
+    j = X.shape[1] - 1
+    Q, R = np.linalg.qr(X)
+    coef = linalg.solve_triangular(R, Q.T @ y)
+    u = y - X @ coef
+    s2 = u @ u / (n - X.shape[1])
+    R_inv = linalg.solve_triangular(R, np.eye(R.shape[0]))
+    se = np.sqrt(s2 * (R_inv[j] @ R_inv[j]))
+    t = (coef[j] - 1) / se
+    gamma0 = u @ u / n
+    lam2 = _long_run_variance(u, lags)
+    stat = float(np.sqrt(gamma0 / lam2) * t - 0.5 * (lam2 - gamma0) / np.sqrt(lam2) * n * se / np.sqrt(s2))
+    return {"stat": stat, "pvalue": mackinnon_pvalue(stat, regression), "lags": lags}
+
+
+def kpss(x: np.ndarray, regression: str = "c", lags: int | None = None) -> dict:
+    """KPSS test of level (``c``) or trend (``ct``) stationarity; p-values clipped to [0.01, 0.10]."""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    lags = schwert_lags(n) if lags is None else lags
+    D = _deterministic(n, regression)
+    e = x - D @ np.linalg.lstsq(D, x, rcond=None)[0]
+    eta = np.sum(np.cumsum(e) ** 2) / n ** 2
+    stat = float(eta / _long_run_variance(e, lags))
+    crit = _KPSS_CRIT[regression]
+    return {"stat": stat, "pvalue": float(np.interp(stat, crit, _KPSS_P)), "lags": lags}
+
+
+def unit_root_series(values: np.ndarray, regression: str = "c") -> dict:
+    """ADF, PP and KPSS results of one series as a flat row."""
+    a, p, k = adf(values, regression), phillips_perron(values, regression), kpss(values, regression)
+    return {
+        "Obs": len(values),
+        "ADF": a["stat"], "ADF lags": a["lags"], "ADF p-value": a["pvalue"],
+        "PP": p["stat"], "PP p-value": p["pvalue"],
+        "KPSS": k["stat"], "KPSS p-value": k["pvalue"],
+    }
+
+
+def _battery_item(item, regression):
+    name, transform, values = item
+    return {"Variable": name, "Transformation": transform, **unit_root_series(values, regression)}
+
+
+def default_series(df: pd.DataFrame) -> list[str]:
+    """Observed columns (without ``year``) followed by the log transforms present in ``df``."""
+    return [c for c in (*EXPECTED_COLS, *LOG_COLUMNS) if c != "year" and c in df.columns]
+
+
+def unit_root_battery(df: pd.DataFrame, variables=None, regression: str = "c",
+                      n_jobs: int | None = None) -> pd.DataFrame:
+    """Long table of the three tests on the levels and first differences of each variable.
+
+    Recent results are cached by a hash of the data and the deterministic terms.
+    """
+    if regression not in REGRESSIONS:
+        raise ValueError(f"regression must be one of {REGRESSIONS}")
+    variables = list(variables or default_series(df))
+    frame = df[variables].apply(pd.to_numeric, errors="coerce")
+    key = fingerprint(frame, regression)
+    return _CACHE.get(key, lambda: _run_battery(frame, variables, regression, n_jobs))
+
+
+def _run_battery(frame: pd.DataFrame, variables: list, regression: str, n_jobs: int | None) -> pd.DataFrame:
+    items = []
+    for name in variables:
+        level = frame[name].dropna().to_numpy()
+        items += [(name, TRANSFORMS[0], level), (name, TRANSFORMS[1], np.diff(level))]
+    return pd.DataFrame(parallel_map(partial(_battery_item, regression=regression), items, n_jobs))
+
+
+def _stationary(rows: pd.DataFrame, level: float) -> pd.Series:
+    # Majority of the three verdicts: ADF and PP reject a unit root, KPSS does not reject stationarity
+    votes = (rows["ADF p-value"] < level).astype(int) + (rows["PP p-value"] < level) + (rows["KPSS p-value"] >= level)
+    return votes >= 2
+
+
+def integration_table(battery: pd.DataFrame, level: float = LEVEL) -> pd.DataFrame:
+    """One row per variable: p-values in levels and differences and the implied order."""
+    stationary = _stationary(battery, level)
+    wide = battery.assign(Stationary=stationary).pivot(index="Variable", columns="Transformation")
+    wide = wide.reindex(battery["Variable"].drop_duplicates())
+    table = pd.DataFrame(index=wide.index)
+    for test in ("ADF", "PP", "KPSS"):
+        for transform in TRANSFORMS:
+            table[f"{test} p ({transform})"] = wide[(f"{test} p-value", transform)]
+    level_ok, diff_ok = wide[("Stationary", TRANSFORMS[0])], wide[("Stationary", TRANSFORMS[1])]
+    table["Ordre"] = np.select([level_ok, diff_ok], ["I(0)", "I(1)"], "I(2)+")
+    return table.reset_index()
@@ -0,0 +1,30 @@
+"""Shared fixtures: the shipped workbook, and scratch caches so that tests never read stale results."""
+import os
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+WORKBOOK = ROOT / "base.xlsx"
+
+_ENVIRONMENT = ("MES_CACHE_DIR", "MES_BUNDLE_DIR", "MES_STORE")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def scratch_cache(tmp_path_factory):
+    """One cache directory for the session (simulated critical values are reused), result store off."""
+    saved = {name: os.environ.get(name) for name in _ENVIRONMENT}
+    cache = tmp_path_factory.mktemp("mes_cache")
+    os.environ.update(MES_CACHE_DIR=str(cache), MES_BUNDLE_DIR=str(cache / "bundles"), MES_STORE="off")
+    yield cache
+    for name, value in saved.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+@pytest.fixture(scope="session")
+def data():
+    from mes.datastore import load_dataset
+    return load_dataset(WORKBOOK)
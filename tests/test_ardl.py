@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes.ardl import (ardl_table, best_order, candidate_orders, check_df_resid, ecm_table, fit_ardl,
+                      long_run_coefficients, min_df_resid, search_ardl)
+
+# R reference (ARDL package) for the specification of the original study, ARDL(1,2,2,1,3,3,1,3)
+R_ORDER = (1, 2, 2, 1, 3, 3, 1, 3)
+R_COEF = [-0.139283, -14.065258, 0.814373, 3.478532, -1.494072, 12.180486, -4.376342,
+          5.883577, 4.602755, -0.366516, -0.270084, 0.006172, 0.225961,
+          -5.238680, -13.878765, 15.429603, 5.595321, 9.669343, -40.599514,
+          -0.045632, 0.586344, -0.029744, -0.443065, 193.713570]
+R_PVALUE = [0.02416, 0.00307, 0.05571, 0.00583, 0.08327, 0.01421, 0.02008,
+            0.00700, 0.00946, 0.00346, 0.01617, 0.44050, 0.01498,
+            0.01116, 0.00460, 0.00349, 0.00958, 0.00917, 0.00235,
+            0.05533, 0.00313, 0.09182, 0.00331, 0.00425]
+R_ECM = [-14.065, -3.479, -1.494, 4.376, 5.884, -0.367, -0.232, -0.226,
+         -5.239, -21.025, -5.595, 9.669, -0.046, 0.473, 0.443, -1.139, 193.714]
+
+
+def test_ardl_matches_r(data):
+    table = ardl_table(fit_ardl(data, R_ORDER))
+    np.testing.assert_allclose(table["Coefficient"], R_COEF, atol=1e-6)
+    np.testing.assert_allclose(table["p-value"], R_PVALUE, atol=6e-6)
+
+
+def test_ecm_matches_r(data):
+    np.testing.assert_allclose(ecm_table(fit_ardl(data, R_ORDER))["Coefficient"], R_ECM, atol=6e-4)
+
+
+def test_long_run_is_ratio_of_sums(data):
+    fit = fit_ardl(data, (2, 0, 1, 0, 2, 0, 0, 2))
+    theta = long_run_coefficients(fit)
+    denom = 1 - fit.phi().sum()
+    expected = [fit.beta(j).sum() / denom for j in range(len(fit.regressors))]
+    np.testing.assert_allclose(theta, expected, rtol=1e-12)
+
+
+def test_candidates_keep_residual_dof():
+    orders = candidate_orders(3, 7, 25)
+    n_params = orders[:, 0] + (orders[:, 1:] + 1).sum(axis=1) + 1
+    assert len(orders) and (25 - n_params >= np.maximum(10, n_params // 2)).all()
+    assert not len(candidate_orders(1, 7, 15))
+
+
+@pytest.mark.parametrize("max_lag", [1, 2, 3])
+@pytest.mark.parametrize("criterion", ["AIC", "BIC"])
+def test_selected_spec_is_not_saturated(data, max_lag, criterion):
+    fit = fit_ardl(data, best_order(search_ardl(data, max_lag, criterion=criterion)))
+    assert fit.df_resid >= min_df_resid(len(fit.coef))
+    check_df_resid(fit)
+
+
+def test_saturated_spec_is_rejected(data):
+    with pytest.raises(ValueError, match="residual degrees of freedom"):
+        check_df_resid(fit_ardl(data, R_ORDER))
+
+
+def test_search_likelihood_matches_direct_fit(data):
+    # The Gram-matrix search and a direct QR fit agree on the common sample (orders reaching max_lag)
+    ranking = search_ardl(data, 2)
+    full = ranking[ranking.iloc[:, 1:9].max(axis=1) == 2].head(5)
+    for _, row in full.iterrows():
+        fit = fit_ardl(data, tuple(row.iloc[1:9]))
+        n = fit.nobs
+        ssr = fit.resid @ fit.resid
+        loglik = -0.5 * n * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+        assert row["k"] == len(fit.coef)
+        assert row["logLik"] == pytest.approx(loglik, rel=1e-9)
+
+
+def test_search_does_not_depend_on_workers(data, monkeypatch):
+    from mes import ardl, parallel
+
+    serial = ardl._run_search(data, 2, ardl.ARDL_DEPENDENT, ardl.ARDL_REGRESSORS, 1)
+    # The default search is split into one chunk per worker
+    seen = []
+
+    def counting_map(func, items, n_jobs):
+        seen.append(len(items))
+        return parallel.parallel_map(func, items, n_jobs)
+
+    monkeypatch.setattr(ardl, "parallel_map", counting_map)
+    pooled = ardl._run_search(data, 2, ardl.ARDL_DEPENDENT, ardl.ARDL_REGRESSORS, 3)
+    assert seen == [3]
+    pd.testing.assert_frame_equal(pooled, serial)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from mes.ardl import fit_ardl
+from mes.bootstrap import BootstrapConfig, bootstrap_ardl, bootstrap_system, resample_rows, summarize_draws
+from mes.sls import build_system, fit_3sls
+
+ORDER = (1, 1, 1, 0, 1, 1, 0, 1)
+CONFIG = BootstrapConfig(reps=520, seed=7)     # three chunks, the last one partial
+
+
+@pytest.mark.parametrize("method", ["residual", "block"])
+def test_ardl_draws_do_not_depend_on_workers(data, method):
+    fit = fit_ardl(data, ORDER)
+    config = BootstrapConfig(reps=CONFIG.reps, seed=CONFIG.seed, method=method)
+    serial = bootstrap_ardl(fit, config, n_jobs=1)
+    assert serial.shape == (config.reps, len(fit.coef))
+    np.testing.assert_array_equal(bootstrap_ardl(fit, config, n_jobs=4), serial)
+
+
+def test_system_draws_do_not_depend_on_workers(data):
+    fit = fit_3sls(build_system(data))
+    config = BootstrapConfig(reps=60, seed=3)
+    serial = bootstrap_system(fit, config, n_jobs=1)
+    assert serial.shape == (config.reps, len(fit.coef))
+    np.testing.assert_array_equal(bootstrap_system(fit, config, n_jobs=4), serial)
+
+
+def test_ardl_draws_centre_on_the_estimate(data):
+    fit = fit_ardl(data, ORDER)
+    draws = bootstrap_ardl(fit, CONFIG, n_jobs=1)
+    summary = summarize_draws(fit.names, draws)
+    assert ((summary["Boot CI low"] < fit.coef) & (fit.coef < summary["Boot CI high"])).all()
+
+
+def test_block_resample_keeps_blocks_contiguous():
+    rows = resample_rows(np.random.default_rng(0), 25, 10, "block", 4)
+    assert rows.shape == (10, 25) and rows.min() >= 0 and rows.max() < 25
+    assert (np.diff(rows[:, :24].reshape(10, 6, 4), axis=2) == 1).all()
+    with pytest.raises(ValueError):
+        resample_rows(np.random.default_rng(0), 25, 10, "wild", 4)
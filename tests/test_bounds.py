@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pytest
+
+from mes import bounds
+from mes.ardl import ARDL_DEPENDENT, ARDL_REGRESSORS, fit_ardl
+from mes.bounds import LEVELS, bounds_f_stat, critical_values
+from mes.cache import cache_dir
+
+
+def _ssr(y, X):
+    resid = y - X @ np.linalg.lstsq(X, y, rcond=None)[0]
+    return resid @ resid
+
+
+def _uecm_f(data, order):
+    """Case-3 F from the restricted and unrestricted conditional ECM regressions (every q >= 1)."""
+    fit = fit_ardl(data, order)
+    frame = data[[ARDL_DEPENDENT, *ARDL_REGRESSORS]].astype(float)
+    diff = frame.diff()
+    short = [diff[ARDL_DEPENDENT].shift(i) for i in range(1, order[0])]
+    short += [diff[x].shift(l) for x, q in zip(ARDL_REGRESSORS, order[1:]) for l in range(q)]
+    levels = [frame[c].shift(1) for c in frame]
+    rows = fit.index
+    dy = diff[ARDL_DEPENDENT].loc[rows].to_numpy()
+    const = np.ones((len(rows), 1))
+    X_r = np.column_stack([const, *(s.loc[rows] for s in short)])
+    X_u = np.column_stack([X_r, *(s.loc[rows] for s in levels)])
+    ssr_r, ssr_u = _ssr(dy, X_r), _ssr(dy, X_u)
+    assert X_u.shape[1] == len(fit.coef)
+    return ((ssr_r - ssr_u) / len(levels)) / (ssr_u / (len(dy) - X_u.shape[1]))
+
+
+@pytest.mark.parametrize("order", [(1, 1, 1, 1, 1, 1, 1, 1), (2, 1, 2, 1, 1, 2, 1, 1)])
+def test_f_stat_matches_uecm_regressions(data, order):
+    assert bounds_f_stat(fit_ardl(data, order)) == pytest.approx(_uecm_f(data, order), rel=1e-8)
+
+
+def test_critical_values_are_ordered():
+    cv = critical_values(30, 3, reps=2000)
+    assert list(cv) == list(LEVELS)
+    lower, upper = np.array(list(cv.values())).T
+    assert np.all(lower < upper)
+    assert np.all(np.diff(lower) > 0) and np.all(np.diff(upper) > 0)
+
+
+def test_batch_size_does_not_change_draws(monkeypatch):
+    rng = lambda: np.random.default_rng(7)
+    full = bounds._simulate_f(40, 2, 3, True, 300, rng())
+    monkeypatch.setattr(bounds, "_BATCH_ELEMENTS", 41 * 3 * 7)
+    # Same draws; only the batched QR rounds differently
+    np.testing.assert_allclose(bounds._simulate_f(40, 2, 3, True, 300, rng()), full, rtol=1e-12)
+
+
+def test_table_is_written_whole_and_truncated_file_is_resimulated():
+    args = (28, 2, 3, 1000, 11)
+    path = cache_dir("bounds") / "T28_k2_case3_r1000_s11.json"
+    path.write_text('{"0.1": [2.')
+    cv = critical_values(*args)
+    assert {float(k): tuple(v) for k, v in json.loads(path.read_text()).items()} == cv
+    assert not list(path.parent.glob("*.tmp"))
+    critical_values.cache_clear()
+    assert critical_values(*args) == cv
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from mes.cache import LRUCache, fingerprint
+
+
+def test_lru_cache_drops_least_recently_used():
+    cache = LRUCache(2)
+    calls = []
+    compute = lambda key: (lambda: calls.append(key) or key.upper())
+    assert cache.get("a", compute("a")) == "A"
+    cache.get("b", compute("b"))
+    cache.get("a", compute("a"))      # hit: "a" becomes the most recent
+    cache.get("c", compute("c"))      # evicts "b"
+    assert calls == ["a", "b", "c"]
+    assert "a" in cache and "c" in cache and "b" not in cache and len(cache) == 2
+
+
+def test_fingerprint_follows_content():
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(df.assign(y=[3.0, 4.5]))
+    assert fingerprint(np.arange(3.0)) != fingerprint(np.arange(3.0).reshape(1, 3))
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from mes.cli import main
+from mes.datastore import dataset_version
+from mes.pipeline import PipelineConfig, bundle_exists
+
+from .conftest import WORKBOOK
+
+OPTIONS = ["--max-lag", "1", "--granger-lag", "2"]
+
+
+@pytest.fixture(scope="module")
+def broken(tmp_path_factory):
+    path = tmp_path_factory.mktemp("workbooks") / "broken.xlsx"
+    pd.read_excel(WORKBOOK).drop(columns="CREDIT").to_excel(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_run_reports_a_failing_workbook(broken, tmp_path, capsys, jobs):
+    code = main(["run", str(WORKBOOK), str(broken), "--out", str(tmp_path), "--jobs", jobs, *OPTIONS])
+    out, err = capsys.readouterr()
+    assert code == 1
+    assert f"{WORKBOOK} -> {tmp_path}" in out
+    assert f"{broken}: ValueError: missing columns" in err
+    # The good workbook is written despite the failure
+    assert bundle_exists(dataset_version(WORKBOOK), PipelineConfig(ardl_max_lag=1, granger_max_lag=2), tmp_path)
+
+
+def test_run_succeeds(tmp_path, capsys):
+    assert main(["run", str(WORKBOOK), "--out", str(tmp_path), *OPTIONS]) == 0
+    assert capsys.readouterr().err == ""
@@ -0,0 +1,88 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes.cache import cache_dir
+from mes.datastore import dataset_version, file_hash, load_dataset
+
+from .conftest import WORKBOOK
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """A workbook without the model columns, so it is stored as read."""
+    frame = pd.DataFrame({
+        "year": np.arange(2000, 2006),
+        "value": [1.5, np.nan, 3.25, -4.0, 5.0, 6.125],
+        "count": [1, 2, 3, 4, 5, 6],
+        "label": ["a", None, "c", "d", "e", "f"],
+        "flag": [True, False, True, True, False, True],
+    })
+    path = tmp_path / "small.xlsx"
+    frame.to_excel(path, index=False)
+    return path, frame
+
+
+def _memory_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def test_numeric_columns_are_memory_mapped(data):
+    for name, column in data.items():
+        if pd.api.types.is_numeric_dtype(column):
+            values = column.to_numpy()
+            assert _memory_mapped(values) and not values.flags.writeable, name
+
+
+def test_round_trip_keeps_values_and_dtypes(workbook):
+    path, _ = workbook
+    expected = pd.read_excel(path)
+    first, again = load_dataset(path), load_dataset(path)
+    for loaded in (first, again):
+        assert loaded.dtypes.to_dict() == expected.dtypes.to_dict()
+        # copy(): the comparison also checks the array class, and memmap is not ndarray
+        pd.testing.assert_frame_equal(loaded.copy(), expected)
+    # Missing text comes back missing, not as the string "nan"
+    assert first["label"].isna().tolist() == [False, True, False, False, False, False]
+    # ... and restoring them leaves the other columns mapped
+    assert _memory_mapped(first["value"].to_numpy())
+
+
+def test_prepared_workbook_round_trip(data):
+    from mes.transforms import prepare_data
+
+    pd.testing.assert_frame_equal(data, prepare_data(pd.read_excel(WORKBOOK)), check_exact=False, rtol=1e-15)
+    assert data.attrs["version"] == file_hash(WORKBOOK)
+
+
+def test_version_follows_the_content(workbook):
+    path, frame = workbook
+    before = dataset_version(path)
+    assert before == file_hash(path) == load_dataset(path).attrs["version"]
+
+    frame.assign(value=frame["value"] * 2).to_excel(path, index=False)
+    after = dataset_version(path)
+    assert after != before and after == file_hash(path)
+    assert load_dataset(path)["value"].iloc[0] == 3.0
+
+    # Rewriting the same bytes changes the stat key, not the version
+    content = path.read_bytes()
+    path.write_bytes(content)
+    os.utime(path, ns=(0, 10**9))
+    assert dataset_version(path) == after
+
+
+def test_pointer_files_are_complete(workbook):
+    path, _ = workbook
+    dataset_version(path)
+    folder = cache_dir("data", "stat")
+    assert not list(folder.glob("*.tmp"))
+    sources = [json.loads(p.read_text())["source"] for p in folder.glob("*.json")]
+    assert str(path.resolve()) in sources
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from mes import diagnostics
+from mes.ardl import fit_ardl
+from mes.diagnostics import DIAGNOSTIC_TESTS, diagnostics_table, residual_tests
+
+from .test_ardl import R_ORDER
+
+# Baseline R output on the residuals of ARDL(1,2,2,1,3,3,1,3)
+R_PVALUE = dict(zip(DIAGNOSTIC_TESTS, [0.9368, 1.0, 0.214, 0.4823, 0.3432, 0.8563, 0.6508]))
+
+
+def test_pvalues_match_r(data):
+    table = diagnostics_table(fit_ardl(data, R_ORDER).resid)
+    assert list(table["Test"]) == list(R_PVALUE)
+    np.testing.assert_allclose(table["p-value"], list(R_PVALUE.values()), atol=5e-4)
+
+
+def test_batched_tests_match_one_series_at_a_time():
+    resid = np.random.default_rng(0).standard_normal((5, 40))
+    stat, pvalue = residual_tests(resid)
+    for i, row in enumerate(resid):
+        one_stat, one_p = residual_tests(row)
+        np.testing.assert_allclose(stat[i], one_stat, rtol=1e-10)
+        np.testing.assert_allclose(pvalue[i], one_p, rtol=1e-10)
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(diagnostics, "_CACHE", diagnostics.LRUCache(3))
+    for seed in range(10):
+        residual_tests(np.random.default_rng(seed).standard_normal(30))
+    assert len(diagnostics._CACHE) == 3
+
+
+def test_too_few_residuals():
+    with pytest.raises(ValueError):
+        residual_tests(np.zeros(10))
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from mes.downsample import downsample, lttb
+
+
+def _reference_lttb(x, y, n_out):
+    """Point-by-point LTTB (Steinarsson, 2013) on the same buckets."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    kept, a = [0], 0
+    for b in range(n_out - 2):
+        lo, hi = int(b * every) + 1, int((b + 1) * every) + 1
+        nlo, nhi = hi, min(int((b + 2) * every) + 1, n - 1)
+        if b == n_out - 3:
+            nx, ny = x[-1], y[-1]
+        else:
+            nx, ny = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        best, area_max = lo, -1.0
+        for i in range(lo, min(hi, n - 1)):
+            area = abs((x[a] - nx) * (y[i] - y[a]) - (x[a] - x[i]) * (ny - y[a]))
+            if area > area_max:
+                best, area_max = i, area
+        kept.append(best)
+        a = best
+    return np.array(kept + [n - 1])
+
+
+def test_matches_point_by_point_algorithm():
+    rng = np.random.default_rng(2)
+    x = np.sort(rng.uniform(0, 100, 1003))
+    y = rng.standard_normal(1003).cumsum()
+    for n_out in (3, 10, 97, 500):
+        np.testing.assert_array_equal(lttb(x, y, n_out), _reference_lttb(x, y, n_out))
+
+
+def test_keeps_endpoints_and_spikes():
+    y = np.zeros(10_000)
+    y[[1234, 7777]] = [50.0, -80.0]
+    kept = lttb(np.arange(10_000), y, 100)
+    assert len(kept) == 100 and kept[0] == 0 and kept[-1] == 9_999
+    assert np.all(np.diff(kept) > 0)
+    assert {1234, 7777} <= set(kept)
+
+
+def test_short_series_are_untouched():
+    np.testing.assert_array_equal(lttb(np.arange(5), np.arange(5), 10), np.arange(5))
+
+
+def test_window_and_dates():
+    dates = pd.date_range("2000-01-01", periods=5_000, freq="D")
+    frame = pd.DataFrame({"date": dates[::-1], "v": np.sin(np.arange(5_000) / 50)})
+    out = downsample(frame, "date", "v", n_out=200)
+    assert len(out) == 200 and out["date"].is_monotonic_increasing
+    window = (dates[100], dates[250])
+    narrow = downsample(frame, "date", "v", n_out=200, window=window)
+    assert len(narrow) == 151 and narrow["date"].between(*window).all()
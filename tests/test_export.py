@@ -0,0 +1,75 @@
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes import export
+from mes.export import KEEP_EXPORTS, cached_export, export_bytes, export_file
+
+
+@pytest.fixture
+def sheets(monkeypatch):
+    # Small chunks so that every writer goes through several of them
+    monkeypatch.setattr(export, "CHUNK_ROWS", 7)
+    rng = np.random.default_rng(0)
+    n = 30
+    results = pd.DataFrame({
+        "Variable": [f"x{i}" for i in range(n)],
+        "Coefficient": rng.normal(size=n),
+        "Lag": np.arange(n),
+        "P-value": np.where(np.arange(n) % 5 == 0, np.nan, rng.uniform(size=n)),
+    })
+    return {"Results": results, "Short": results.head(3), "Empty": results.iloc[:0]}
+
+
+def _compare(read, sheets):
+    assert list(read) == list(sheets)
+    for name, table in sheets.items():
+        if table.empty:
+            assert read[name].empty and list(read[name].columns) == list(table.columns)
+        else:
+            pd.testing.assert_frame_equal(read[name], table.reset_index(drop=True), check_exact=False, rtol=1e-15)
+
+
+def test_xlsx_round_trip(sheets):
+    read = pd.read_excel(io.BytesIO(export_bytes(sheets, "xlsx")), sheet_name=None)
+    _compare(read, sheets)
+
+
+def test_csv_zip_round_trip(sheets):
+    with zipfile.ZipFile(io.BytesIO(export_bytes(sheets, "csv"))) as zf:
+        assert zf.namelist() == [f"{name}.csv" for name in sheets]
+        read = {name.removesuffix(".csv"): pd.read_csv(zf.open(name)) for name in zf.namelist()}
+    _compare(read, sheets)
+
+
+def test_parquet_zip_round_trip(sheets):
+    pytest.importorskip("pyarrow")
+    with zipfile.ZipFile(io.BytesIO(export_bytes(sheets, "parquet"))) as zf:
+        read = {name.removesuffix(".parquet"): pd.read_parquet(io.BytesIO(zf.read(name))) for name in zf.namelist()}
+    assert list(read) == list(sheets)
+    for name, table in sheets.items():
+        # Parquet keeps the schema, empty tables included
+        pd.testing.assert_frame_equal(read[name], table.reset_index(drop=True))
+
+
+def test_export_file_is_written_whole(sheets, tmp_path):
+    path = export_file(sheets, "csv", tmp_path / "out.csv.zip")
+    assert path.read_bytes() == export_bytes(sheets, "csv")
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv.zip"]
+    with pytest.raises(ValueError):
+        export_file(sheets, "ods", tmp_path / "out.ods")
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv.zip"]
+
+
+def test_cached_export_reuses_and_prunes(sheets, tmp_path, monkeypatch):
+    monkeypatch.setenv("MES_CACHE_DIR", str(tmp_path))
+    first = cached_export(sheets, "xlsx", "a" * 40)
+    stamp = first.stat().st_mtime_ns
+    assert cached_export(sheets, "xlsx", "a" * 40) == first and first.stat().st_mtime_ns == stamp
+    for i in range(KEEP_EXPORTS + 2):
+        cached_export(sheets, "csv", f"{i:02d}" * 20)
+    assert len(list(first.parent.iterdir())) == KEEP_EXPORTS
+    assert not first.exists()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from mes.ardl import fit_ardl
+from mes.bootstrap import rescaled_residuals
+from mes.forecast import ecm_forecast
+from mes.transforms import numeric_frame
+
+from .test_bootstrap import ORDER
+
+
+@pytest.fixture(scope="module")
+def fit(data):
+    return fit_ardl(data, ORDER)
+
+
+def _loop_paths(fit, data, horizon, shocks):
+    """Levels recursion y_t = sum phi_i y_{t-i} + c + sum beta_jl x_{j,t-l} + e_t, one step at a time."""
+    values = numeric_frame(data, [fit.dependent, *fit.regressors]).to_numpy(dtype=float)
+    phi = fit.phi()
+    x = np.vstack([values[:, 1:], np.repeat(values[-1:, 1:], horizon, axis=0)])
+    out = np.empty_like(shocks)
+    for s, row in enumerate(shocks):
+        y = list(values[:, 0])
+        for h in range(horizon):
+            t = len(values) + h
+            step = fit.coef[-1] + sum(phi[i] * y[t - 1 - i] for i in range(len(phi)))
+            for j in range(len(fit.regressors)):
+                step += sum(b * x[t - lag, j] for lag, b in enumerate(fit.beta(j)))
+            y.append(step + row[h])
+        out[s] = y[len(values):]
+    return out
+
+
+def test_paths_follow_the_levels_recursion(fit, data):
+    horizon, n_paths, seed = 6, 40, 11
+    forecast = ecm_forecast(fit, data, horizon=horizon, n_paths=n_paths, seed=seed)
+    shocks = np.random.default_rng(seed).choice(rescaled_residuals(fit.resid, len(fit.coef)),
+                                                size=(n_paths, horizon))
+    np.testing.assert_allclose(forecast.paths, _loop_paths(fit, data, horizon, shocks), rtol=1e-10)
+    np.testing.assert_allclose(forecast.point, _loop_paths(fit, data, horizon, np.zeros((1, horizon)))[0],
+                               rtol=1e-10)
+
+
+def test_point_path_converges_to_the_equilibrium(fit, data):
+    assert abs(fit.phi().sum()) < 1
+    forecast = ecm_forecast(fit, data, horizon=300, n_paths=10)
+    assert np.isfinite(forecast.equilibrium)
+    assert forecast.point[-1] == pytest.approx(forecast.equilibrium, rel=1e-8)
+
+
+def test_band_quantiles_are_ordered(fit, data):
+    bands = ecm_forecast(fit, data, horizon=8, n_paths=2000).bands()
+    columns = ["Low 90%", "Low 80%", "Low 50%", "Median", "High 50%", "High 80%", "High 90%"]
+    assert (bands[columns].diff(axis=1).iloc[:, 1:] >= 0).all().all()
+    np.testing.assert_array_equal(bands["Step"], np.arange(1, 9))
+
+
+def test_same_seed_gives_same_paths(fit, data):
+    first = ecm_forecast(fit, data, horizon=5, n_paths=300, seed=4)
+    np.testing.assert_array_equal(ecm_forecast(fit, data, horizon=5, n_paths=300, seed=4).paths, first.paths)
+    assert not np.array_equal(ecm_forecast(fit, data, horizon=5, n_paths=300, seed=5).paths, first.paths)
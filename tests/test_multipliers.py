@@ -0,0 +1,39 @@
+import numpy as np
+
+from mes.ardl import fit_ardl, long_run_coefficients
+from mes.bootstrap import BootstrapConfig, bootstrap_ardl
+from mes.multipliers import bootstrap_multipliers, dynamic_multipliers, multiplier_table
+
+ORDER = (2, 1, 1, 0, 1, 1, 0, 1)
+
+
+def test_cumulative_multipliers_converge_to_long_run(data):
+    fit = fit_ardl(data, ORDER)
+    assert np.abs(np.roots(np.concatenate([[1.0], -fit.phi()]))).max() < 1
+    m = dynamic_multipliers(fit, horizon=400)
+    np.testing.assert_allclose(m[:, -1], long_run_coefficients(fit), rtol=1e-8, atol=1e-10)
+
+
+def test_impact_multiplier_is_the_contemporaneous_coefficient(data):
+    fit = fit_ardl(data, ORDER)
+    m = dynamic_multipliers(fit, horizon=5, cumulative=False)
+    np.testing.assert_array_equal(m[:, 0], [fit.beta(j)[0] for j in range(len(fit.regressors))])
+    np.testing.assert_allclose(np.cumsum(m, axis=-1), dynamic_multipliers(fit, horizon=5))
+
+
+def test_batched_recursion_matches_filter(data):
+    fit = fit_ardl(data, ORDER)
+    draws = bootstrap_ardl(fit, BootstrapConfig(reps=30, seed=1), n_jobs=1)
+    batched = dynamic_multipliers(fit, 12, draws)
+    for r in (0, 17):
+        np.testing.assert_allclose(batched[r], dynamic_multipliers(fit, 12, draws[r]), rtol=1e-10, atol=1e-12)
+
+
+def test_bootstrap_bands_use_the_ardl_draws(data):
+    fit = fit_ardl(data, ORDER)
+    config = BootstrapConfig(reps=300, seed=4)
+    draws = bootstrap_multipliers(fit, 8, config, n_jobs=2)
+    np.testing.assert_allclose(draws, dynamic_multipliers(fit, 8, bootstrap_ardl(fit, config, n_jobs=1)))
+    table = multiplier_table(fit, 8, draws)
+    assert len(table) == len(fit.regressors) * 9
+    assert (table["CI low"] <= table["CI high"]).all()
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from mes.cache import fingerprint
+from mes.panel import ENTITY, entity_frame, iter_panel, panel_table
+from mes.pipeline import MANIFEST, PipelineConfig, bundle_path, load_bundle
+
+from .conftest import WORKBOOK
+
+CONFIG = PipelineConfig(ardl_max_lag=1, granger_max_lag=2)
+
+
+@pytest.fixture(scope="module")
+def panel():
+    """Two estimable countries and one with too few years to fit anything."""
+    chad = pd.read_excel(WORKBOOK)
+    niger = chad.assign(country="Niger", GROWTH=chad["GROWTH"] * 0.8 + 1, REM=chad["REM"] * 1.3)
+    mali = chad.head(4).assign(country="Mali")
+    return pd.concat([chad, niger, mali], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def results(panel, tmp_path_factory):
+    root = tmp_path_factory.mktemp("panel_bundles")
+    return root, list(iter_panel(panel, "country", CONFIG, root, n_jobs=2, max_pending=1))
+
+
+def test_every_entity_is_yielded(results):
+    _, results = results
+    assert sorted(r.entity for r in results) == ["Chad", "Mali", "Niger"]
+
+
+def test_failing_entity_is_isolated(results):
+    root, results = results
+    by_name = {r.entity: r for r in results}
+    assert not by_name["Mali"].ok and by_name["Mali"].summary is None and by_name["Mali"].error
+    for name in ("Chad", "Niger"):
+        result = by_name[name]
+        assert result.ok and result.summary[ENTITY] == name
+        assert load_bundle(result.path).meta["entity"] == name
+    table = panel_table(results)
+    assert list(table[ENTITY]) == ["Chad", "Niger"]
+    assert table["Obs"].tolist() == [28, 28]
+
+
+def test_serial_run_matches_the_pool(panel, results, tmp_path):
+    _, pooled = results
+    serial = {r.entity: r.summary for r in iter_panel(panel, "country", CONFIG, tmp_path, n_jobs=1) if r.ok}
+    assert serial == {r.entity: r.summary for r in pooled if r.ok}
+
+
+def test_entity_frame_versions(panel, results):
+    root, results = results
+    # Without a panel version each entity is hashed from its own rows
+    chad = entity_frame(panel, "country", "Chad")
+    assert chad.attrs["version"] == fingerprint(chad)
+    assert (bundle_path(chad.attrs["version"], CONFIG, root) / MANIFEST).exists()
+
+    versioned = panel.copy()
+    versioned.attrs["version"] = "panel-v1"
+    first = entity_frame(versioned, "country", "Chad").attrs["version"]
+    assert first == entity_frame(versioned, "country", "Chad").attrs["version"]
+    assert first != entity_frame(versioned, "country", "Niger").attrs["version"]
+    # Bundle directories keep a prefix of the version; entities must not share one
+    assert first[:16] != entity_frame(versioned, "country", "Niger").attrs["version"][:16]
+    versioned.attrs["version"] = "panel-v2"
+    assert entity_frame(versioned, "country", "Chad").attrs["version"] != first
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes import pipeline
+from mes.datastore import dataset_version
+from mes.pipeline import (BUNDLE_VERSION, MANIFEST, SYSTEM_SHEETS, PipelineConfig, ResultBundle, bundle_exists,
+                          bundle_path, ensure_bundle, load_bundle, save_bundle)
+
+from .conftest import WORKBOOK
+
+CONFIG = PipelineConfig(ardl_max_lag=1, granger_max_lag=2)
+
+
+@pytest.fixture(scope="module")
+def computed(tmp_path_factory):
+    root = tmp_path_factory.mktemp("bundles")
+    return root, ensure_bundle(WORKBOOK, CONFIG, root)
+
+
+def _bundle():
+    table = pd.DataFrame({"Variable": ["a", "b", "c"], "Coefficient": [0.1, -2.5, np.nan], "Lag": [0, 1, 2]})
+    return ResultBundle({"First": table, "Second": table.head(1)}, {"ardl_order": [1, 0], "nobs": 3})
+
+
+def test_save_load_round_trip(tmp_path):
+    bundle = _bundle()
+    path = save_bundle(bundle, tmp_path / "run")
+    loaded = load_bundle(path)
+    assert list(loaded.tables) == ["First", "Second"]
+    for name, table in bundle.tables.items():
+        pd.testing.assert_frame_equal(loaded.tables[name], table)
+    assert loaded.ardl_order == (1, 0)
+    assert loaded.meta == {**bundle.meta, "tables": ["First", "Second"]}
+
+
+def test_save_is_atomic(tmp_path):
+    path = save_bundle(_bundle(), tmp_path / "run")
+    manifest = (path / MANIFEST).read_text()
+    # A second writer of the same key leaves the first bundle untouched
+    other = ResultBundle({"Other": pd.DataFrame({"x": [1]})}, {"ardl_order": [2]})
+    assert save_bundle(other, path) == path
+    assert (path / MANIFEST).read_text() == manifest
+    # A writer that fails halfway leaves nothing behind
+    broken = ResultBundle({"Good": pd.DataFrame({"x": [1]}), "Bad": None}, {})
+    with pytest.raises(AttributeError):
+        save_bundle(broken, tmp_path / "broken")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run"]
+
+
+def test_manifest_contents(computed):
+    root, bundle = computed
+    version = dataset_version(WORKBOOK)
+    path = bundle_path(version, CONFIG, root)
+    assert bundle_exists(version, CONFIG, root)
+    manifest = json.loads((path / MANIFEST).read_text())
+    assert manifest["bundle_version"] == BUNDLE_VERSION
+    assert manifest["data_version"] == version and manifest["source"] == str(WORKBOOK)
+    assert manifest["config_key"] == CONFIG.key() and manifest["config"]["ardl_max_lag"] == 1
+    assert manifest["nobs"] == 28 and len(manifest["ardl_order"]) == 8
+    assert set(SYSTEM_SHEETS.values()) | {"ARDL_general", "Bounds_test", "Granger", "Unit_root"} <= set(
+        manifest["tables"])
+    assert set(manifest["timings"]) >= {"load", "ardl", "bounds", "3sls"}
+    assert sorted(p.name for p in path.iterdir()) == sorted([MANIFEST, *(f"{t}.csv" for t in manifest["tables"])])
+
+
+def test_existing_bundle_is_loaded_not_recomputed(computed, monkeypatch):
+    root, bundle = computed
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pipeline rerun")
+
+    monkeypatch.setattr(pipeline, "run_pipeline", fail)
+    again = ensure_bundle(WORKBOOK, CONFIG, root)
+    assert again.meta["data_version"] == bundle.meta["data_version"]
+    pd.testing.assert_frame_equal(again.tables["ARDL_general"], bundle.tables["ARDL_general"])
+    assert not bundle_exists(dataset_version(WORKBOOK), PipelineConfig(ardl_max_lag=2), root)
@@ -0,0 +1,89 @@
+import gc
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from mes import profiling
+from mes.profiling import Profiler, read_trace
+
+
+@pytest.fixture
+def trace(tmp_path):
+    assert not tracemalloc.is_tracing()
+    yield tmp_path / "profile.jsonl"
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_stops_with_the_last_profiler(trace):
+    a, b = Profiler("a", path=trace), Profiler("b", path=trace)
+    a.start()
+    b.start()
+    a.close()
+    assert tracemalloc.is_tracing()
+    b.close()
+    assert not tracemalloc.is_tracing()
+
+
+def test_dropped_profiler_releases_tracing(trace):
+    Profiler("gone", path=trace).start()
+    gc.collect()
+    assert not profiling._tracers
+
+
+def test_peak_is_only_reset_by_a_sole_profiler(trace, monkeypatch):
+    resets = []
+    monkeypatch.setattr(tracemalloc, "reset_peak", lambda: resets.append(1))
+    a, b = Profiler("a", path=trace), Profiler("b", path=trace)
+    a.start()
+    assert resets
+    resets.clear()
+    b.start()
+    with a.section("work"):
+        pass
+    assert not resets
+    a.close()
+    b.close()
+
+
+def test_sections_nest_and_are_traced(trace):
+    profiler = Profiler("s", path=trace)
+    profiler.start()
+    with profiler.section("outer"):
+        with profiler.section("inner"):
+            np.ones(10 ** 6).sum()
+    record = profiler.finish()
+    profiler.close()
+    assert [s["section"] for s in record["sections"]] == ["outer", "outer/inner"]
+    assert record["sections"][1]["peak_mb"] > 5
+    assert read_trace(trace) == [record]
+
+
+def test_stopped_run_is_closed(trace):
+    profiler = Profiler("s", memory=False, path=trace)
+    profiler.start()
+    with pytest.raises(RuntimeError):
+        with profiler.section("tab"):
+            profiler._enter("left_open")
+            raise RuntimeError("stop")
+    assert profiler.close_run()["kind"] == "rerun"
+    assert not profiler.running and profiler.close_run() is None
+    # A later fragment rerun gets a run of its own instead of nesting under the stopped one
+    with profiler.section("fragment_tab"):
+        pass
+    assert profiler.last["kind"] == "fragment"
+    assert [s["section"] for s in profiler.last["sections"]] == ["fragment_tab"]
+
+
+@pytest.mark.parametrize("value, expected", [(None, True), ("1", True), ("0", False), ("off", False)])
+def test_memory_tracing_switch(trace, monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("MES_PROFILE_MEMORY", raising=False)
+    else:
+        monkeypatch.setenv("MES_PROFILE_MEMORY", value)
+    assert profiling.memory_enabled() is expected
+    profiler = Profiler(memory=profiling.memory_enabled(), path=trace)
+    profiler.start()
+    assert tracemalloc.is_tracing() is expected
+    profiler.finish()
+    profiler.close()
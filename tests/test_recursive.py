@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from mes.recursive import cusum, cusumsq, recursive_ls, rolling_ls, stability_summary
+
+
+@pytest.fixture(scope="module")
+def regression():
+    rng = np.random.default_rng(5)
+    X = np.column_stack([np.ones(120), rng.standard_normal((120, 3))])
+    y = X @ np.array([1.0, 0.5, -2.0, 0.3]) + rng.standard_normal(120)
+    return X, y
+
+
+def _lstsq(X, y):
+    coef, ssr = np.linalg.lstsq(X, y, rcond=None)[:2]
+    se = np.sqrt(np.diag(np.linalg.inv(X.T @ X)) * ssr[0] / (len(y) - X.shape[1]))
+    return coef, se
+
+
+def test_recursive_matches_refits(regression):
+    X, y = regression
+    path, w = recursive_ls(X, y, start=10)
+    assert path.coef.shape == (111, 4) and len(w) == 110
+    for t in (10, 11, 57, 120):
+        coef, se = _lstsq(X[:t], y[:t])
+        np.testing.assert_allclose(path.coef[t - 10], coef, rtol=1e-10, atol=1e-13)
+        np.testing.assert_allclose(path.se[t - 10], se, rtol=1e-9)
+
+
+def test_recursive_residuals_are_standardized_forecast_errors(regression):
+    X, y = regression
+    _, w = recursive_ls(X, y, start=10)
+    for t in (10, 80):
+        coef = np.linalg.lstsq(X[:t], y[:t], rcond=None)[0]
+        scale = np.sqrt(1 + X[t] @ np.linalg.inv(X[:t].T @ X[:t]) @ X[t])
+        assert w[t - 10] == pytest.approx((y[t] - X[t] @ coef) / scale, rel=1e-10)
+
+
+@pytest.mark.parametrize("refresh", [500, 7])
+def test_rolling_matches_refits(regression, refresh):
+    X, y = regression
+    path = rolling_ls(X, y, 20, refresh=refresh)
+    assert path.coef.shape == (101, 4)
+    for s in (0, 1, 33, 100):
+        coef, se = _lstsq(X[s:s + 20], y[s:s + 20])
+        np.testing.assert_allclose(path.coef[s], coef, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(path.se[s], se, rtol=1e-8)
+
+
+def test_stable_model_stays_in_bands(regression):
+    X, y = regression
+    _, w = recursive_ls(X, y)
+    summary = stability_summary(cusum(w), cusumsq(w))
+    assert summary["Result"].str.contains("Stable").all()
+    assert cusumsq(w)["CUSUMSQ"].iloc[-1] == pytest.approx(1.0)
+
+
+def test_invalid_samples(regression):
+    X, y = regression
+    with pytest.raises(ValueError):
+        recursive_ls(X[:4], y[:4])
+    with pytest.raises(ValueError):
+        rolling_ls(X, y, 3)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from mes import scenarios
+from mes.scenarios import ESTIMATE_QUANTILE, MAX_CONDITION, build_engine, scenario_frame, scenario_summary
+from mes.sls import build_system, fit_3sls, structural_form
+
+
+@pytest.fixture(scope="module")
+def fit(data):
+    return fit_3sls(build_system(data))
+
+
+def test_responses_solve_the_structural_system(fit):
+    engine = build_engine(fit, n_draws=20)
+    shocks = {"OPEN": 10.0, "logREM": 0.1, "MIGSTOCK": 0.5}
+    endo, exo = engine.shock_vectors(shocks)
+    dy = engine.simulate(shocks)[0, 0]
+    B, Gamma = structural_form(fit)
+    np.testing.assert_allclose(dy, dy @ B + endo[0] + exo[0] @ Gamma, atol=1e-6 * np.abs(dy).max())
+
+
+def test_keeps_unstable_but_invertible_draws(fit):
+    engine = build_engine(fit, n_draws=400)
+    assert engine.n_draws + engine.dropped == 400
+    assert np.all(engine.condition[1:] < MAX_CONDITION)
+    # Draws are not restricted to a convergent feedback
+    assert 0 < engine.stable_share < 1
+    assert len(scenario_frame(engine, engine.simulate({"OPEN": 1.0})[0])) == engine.n_draws
+
+
+def test_ill_conditioned_draws_are_dropped(fit, monkeypatch):
+    full = build_engine(fit, n_draws=400)
+    limit = np.median(full.condition[1:])
+    monkeypatch.setattr(scenarios, "MAX_CONDITION", limit)
+    engine = build_engine(fit, n_draws=400)
+    assert engine.dropped == np.sum(full.condition[1:] >= limit)
+    assert np.all(engine.condition[1:] < limit)
+    # The point estimate is kept whatever its conditioning
+    assert engine.condition[0] == full.condition[0] > limit
+
+
+def test_summary_places_the_estimate_among_the_draws(fit):
+    engine = build_engine(fit, n_draws=400)
+    responses = engine.simulate({"OPEN": 10.0, "logREM": 0.1})[0]
+    summary = scenario_summary(engine, responses)
+    np.testing.assert_array_equal(summary["Estimation"], responses[0])
+    expected = (responses[1:] < responses[0]).mean(axis=0)
+    np.testing.assert_array_equal(summary[ESTIMATE_QUANTILE], expected)
+    np.testing.assert_allclose(summary["Q50%"], np.median(responses[1:], axis=0))
@@ -0,0 +1,52 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes.store import ResultStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(tmp_path / "db" / "results.sqlite", max_bytes=10 ** 6)
+
+
+def test_round_trip(store):
+    table = pd.DataFrame({"Variable": ["a", None], "Estimate": [1.5, np.nan], "n": [1, 2], "ok": [True, False]})
+    draws = np.random.default_rng(0).standard_normal((30, 4))
+    key = store.put("bundle", "v1", {"order": (1, 2), "lag": 3}, {"table": table, "draws": draws})
+    run = store.get("bundle", "v1", {"lag": 3, "order": [1, 2]})
+    assert run.key == key
+    assert run.items["table"]["Variable"].isna().tolist() == [False, True]
+    pd.testing.assert_frame_equal(run.items["table"].iloc[:, 1:], table.iloc[:, 1:], check_dtype=False)
+    np.testing.assert_array_equal(run.items["draws"], draws)
+    assert store.get("bundle", "v2", {"order": (1, 2), "lag": 3}) is None
+    assert store.load(key[:8]).spec == {"lag": 3, "order": [1, 2]}
+
+
+def test_cached_computes_once(store):
+    calls = []
+    compute = lambda: calls.append(1) or {"x": np.arange(3.0)}
+    for _ in range(3):
+        np.testing.assert_array_equal(store.cached("k", "v", {}, compute)["x"], np.arange(3.0))
+    assert len(calls) == 1 and store.runs()["Hits"].iloc[0] == 2
+
+
+def test_least_recently_used_are_evicted(store):
+    payload = {"x": np.zeros(20_000)}          # ~160 kB per entry
+    for i in range(4):
+        store.put("k", "v", {"i": i}, payload)
+    store.get("k", "v", {"i": 0})
+    store.max_bytes = 400_000
+    store.put("k", "v", {"i": 4}, payload)
+    kept = {store.load(key).spec["i"] for key in store.runs()["Key"]}
+    assert kept == {0, 4}
+
+
+def test_schema_is_recreated_after_the_directory_is_removed(store):
+    store.put("k", "v", {}, {"x": np.ones(2)})
+    shutil.rmtree(store.path.parent)
+    assert store.get("k", "v", {}) is None
+    store.put("k", "v", {}, {"x": np.ones(2)})
+    assert len(store.runs()) == 1
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes.streaming import RunningMoments, running_moments
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(9)
+    values = rng.standard_normal((400, 4)) * [1, 10, 0.1, 5] + [0, 1e6, -3, 20]
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return pd.DataFrame(values, columns=["a", "b", "c", "d"])
+
+
+def _check(moments, frame):
+    described = frame.describe().T
+    stats = moments.describe()
+    np.testing.assert_allclose(stats["count"], described["count"])
+    np.testing.assert_allclose(stats[["mean", "std", "min", "max"]], described[["mean", "std", "min", "max"]],
+                               rtol=1e-11)
+    # Column b sits at 1e6 with a standard deviation of 10: pandas itself is accurate to ~1e-10 there
+    np.testing.assert_allclose(moments.corr(), frame.corr(), rtol=0, atol=1e-9)
+
+
+def test_matches_pandas_with_missing_values(frame):
+    _check(RunningMoments(frame.columns).update(frame), frame)
+
+
+def test_blocks_and_merges_match_one_pass(frame):
+    blocks = [frame.iloc[:1], frame.iloc[1:150], frame.iloc[150:151], frame.iloc[151:]]
+    streamed = RunningMoments(frame.columns)
+    for block in blocks:
+        streamed.update(block)
+    _check(streamed, frame)
+    merged = RunningMoments(frame.columns).update(blocks[0])
+    for block in blocks[1:]:
+        merged.merge(RunningMoments(frame.columns).update(block))
+    _check(merged, frame)
+    with pytest.raises(ValueError):
+        merged.merge(RunningMoments(["a"]))
+
+
+def test_persisted_state_only_reads_appended_rows(frame, monkeypatch):
+    running_moments(frame.iloc[:300], "appended")
+    seen = []
+    update = RunningMoments.update
+    monkeypatch.setattr(RunningMoments, "update", lambda self, block: seen.append(len(block)) or update(self, block))
+    moments = running_moments(frame, "appended")
+    assert seen == [100]
+    _check(moments, frame)
+
+
+def test_edited_history_is_recomputed(frame):
+    running_moments(frame.iloc[:300], "edited")
+    edited = frame.copy()
+    edited.iloc[5, 0] = 123.0
+    _check(running_moments(edited, "edited"), edited)
@@ -0,0 +1,107 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mes.styling import PAGE_ROWS, page_count, page_slice, results_table_css, style_results_table
+
+
+def _old_coef_rule(val, df, coef_cols):
+    # The per-cell applymap rule the dashboard used before results_table_css
+    try:
+        v = float(val)
+        max_val = max(abs(df[coef_cols[0]]).max(), 1)
+        intensity = min(abs(v) / max_val, 0.4)
+        if v > 0:
+            return f'background-color: rgba(44, 160, 44, {intensity})'
+        else:
+            return f'background-color: rgba(214, 39, 40, {intensity})'
+    except (TypeError, ValueError):
+        return ''
+
+
+def _old_pval_rule(val):
+    try:
+        v = float(val)
+        if v < 0.01:
+            return 'background-color: rgba(214, 39, 40, 0.4); color: white; font-weight: bold'
+        elif v < 0.05:
+            return 'background-color: rgba(214, 39, 40, 0.3); font-weight: bold'
+        elif v < 0.1:
+            return 'background-color: rgba(255, 127, 14, 0.2)'
+        else:
+            return 'background-color: rgba(200, 200, 200, 0.1)'
+    except (TypeError, ValueError):
+        return ''
+
+
+def _split(css: str):
+    """Style text and the rgba alpha, which is now rounded to four decimals."""
+    match = re.search(r"rgba\((\d+), (\d+), (\d+), ([^)]+)\)", css)
+    if match is None:
+        return css, None
+    return css.replace(match.group(4), "a"), float(match.group(4))
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(1)
+    n = 200
+    coef = rng.normal(scale=3, size=n)
+    coef[:4] = [0.0, -0.4, 0.4, 12.0]
+    pvalue = rng.uniform(size=n) ** 3
+    pvalue[:6] = [0.0, 0.01, 0.05, 0.1, 0.0099999, np.nan]
+    return pd.DataFrame({"Variable": [f"x{i}" for i in range(n)], "Coefficient": coef,
+                         "Std.Error": rng.uniform(size=n), "p-value": pvalue, "Estimate (LR)": coef / 2})
+
+
+def test_css_matches_the_per_cell_rule(table):
+    css = results_table_css(table)
+    coef_cols = ["Coefficient", "Estimate (LR)"]
+    for column in coef_cols:
+        for new, val in zip(css[column], table[column]):
+            old_text, old_alpha = _split(_old_coef_rule(val, table, coef_cols))
+            new_text, new_alpha = _split(new)
+            assert new_text == old_text
+            assert new_alpha == pytest.approx(old_alpha, abs=5e-5)
+    assert css["p-value"].tolist() == [_old_pval_rule(v) for v in table["p-value"]]
+    assert (css[["Variable", "Std.Error"]] == "").all().all()
+
+
+def test_text_cells_stay_blank():
+    table = pd.DataFrame({"Coefficient": [1.5, "—", -0.5], "Pr(>|t|)": [0.2, "n.d.", 0.001]})
+    css = results_table_css(table)
+    assert css["Pr(>|t|)"].tolist() == [_old_pval_rule(v) for v in table["Pr(>|t|)"]]
+    assert css["Coefficient"].iloc[1] == "" and css["Coefficient"].iloc[0].startswith("background-color")
+
+
+def test_page_of_a_long_table_keeps_the_full_table_scale(table):
+    css = results_table_css(table)
+    page = page_slice(2, 64)
+    styled = style_results_table(table.iloc[page], css.iloc[page])
+    styled._compute()
+    # Row 3 of the full table holds the largest coefficient; page 2 does not
+    assert css["Coefficient"].iloc[page].tolist() != results_table_css(table.iloc[page])["Coefficient"].tolist()
+    assert styled.ctx[(0, 1)] == [tuple(p.strip().split(": ")) for p in css["Coefficient"].iloc[64].split(";")]
+
+
+@pytest.mark.parametrize("n_rows, pages", [(0, 1), (1, 1), (PAGE_ROWS, 1), (PAGE_ROWS + 1, 2), (3 * PAGE_ROWS, 3)])
+def test_page_count(n_rows, pages):
+    assert page_count(n_rows) == pages
+
+
+def test_pages_cover_every_row_once():
+    df = pd.DataFrame({"x": np.arange(2 * PAGE_ROWS + 17)})
+    rows = [df.iloc[page_slice(page)] for page in range(1, page_count(len(df)) + 1)]
+    assert [len(r) for r in rows] == [PAGE_ROWS, PAGE_ROWS, 17]
+    assert np.array_equal(np.concatenate([r["x"] for r in rows]), df["x"])
+
+
+def test_empty_frame_has_one_empty_page():
+    df = pd.DataFrame({"Coefficient": [], "p-value": []})
+    assert page_count(len(df)) == 1
+    page = df.iloc[page_slice(1)]
+    assert page.empty
+    assert results_table_css(page).shape == (0, 2)
+    style_results_table(page).to_html()
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from mes import unitroot
+from mes.unitroot import _adf_design, adf, integration_table, mackinnon_critical, unit_root_battery
+
+
+def _walks(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"walk": rng.standard_normal(n).cumsum(), "noise": rng.standard_normal(n)})
+
+
+def _aic(X, y):
+    resid = y - X @ np.linalg.lstsq(X, y, rcond=None)[0]
+    n = len(y)
+    return n * (np.log(2 * np.pi) + np.log(resid @ resid / n) + 1) + 2 * X.shape[1]
+
+
+def test_adf_lag_is_aic_minimum_on_common_sample():
+    x = _walks()["walk"].to_numpy()
+    result = adf(x, max_lag=6)
+    X, y = _adf_design(x, 6, "c")
+    # Candidate with l lags: the first 2 + l columns of the longest design
+    aic = [_aic(X[:, :2 + lags], y) for lags in range(7)]
+    assert result["lags"] == int(np.argmin(aic))
+
+    X, y = _adf_design(x, result["lags"], "c")
+    coef, ssr = np.linalg.lstsq(X, y, rcond=None)[:2]
+    se = np.sqrt(ssr[0] / (len(y) - X.shape[1]) * np.linalg.inv(X.T @ X)[1, 1])
+    np.testing.assert_allclose(result["stat"], coef[1] / se, rtol=1e-10)
+
+
+def test_mackinnon_asymptotic_critical_values():
+    crit = mackinnon_critical(10 ** 7)
+    np.testing.assert_allclose(list(crit.values()), [-3.43035, -2.86154, -2.56677], atol=1e-5)
+
+
+def test_integration_orders():
+    table = integration_table(unit_root_battery(_walks(), ["walk", "noise"], n_jobs=1)).set_index("Variable")
+    assert table.loc["walk", "Ordre"] == "I(1)"
+    assert table.loc["noise", "Ordre"] == "I(0)"
+
+
+def test_battery_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(unitroot, "_CACHE", unitroot.LRUCache(2))
+    for seed in range(4):
+        unit_root_battery(_walks(60, seed), ["walk", "noise"], n_jobs=1)
+    assert len(unitroot._CACHE) == 2